@@ -0,0 +1,51 @@
+"""
+Compares the ball prediction analysis with a Python predicate per slice and with the BallPredictionArray. Their
+agreement is checked in tests/test_ball_prediction_analysis.py.
+Run from the root directory: python -m benchmarks.ball_prediction_benchmark
+"""
+import timeit
+
+from src.utils.ball_prediction_analysis import BallPredictionArray, GOAL_THRESHOLD, find_matching_slice
+from src.utils.vec import Vec3
+from tests.legacy import first_goal_slice_with_predicate
+from tests.packets import make_ball_prediction
+
+
+def coarse_goal_slice(ball_prediction):
+    """predict_future_goal as it was before, skipping ahead 20 slices at a time and then backtracking."""
+    return find_matching_slice(ball_prediction, 0, lambda s: abs(s.physics.location.y) >= GOAL_THRESHOLD,
+                               search_increment=20)
+
+
+def main(number=2000, num_predictions=200):
+    predictions = [make_ball_prediction(seed=seed) for seed in range(num_predictions)]
+    prediction_array = BallPredictionArray()
+    goals = 0
+    coarse_misses = 0
+    for prediction in predictions:
+        coarse = coarse_goal_slice(prediction)
+        expected = first_goal_slice_with_predicate(prediction)
+        if expected is not None:
+            goals += 1
+            coarse_misses += coarse is None or coarse.game_seconds != expected.game_seconds
+    print(f'{goals} of {num_predictions} synthetic predictions enter a goal, the coarse search got {coarse_misses} '
+          f'of them wrong')
+
+    prediction = predictions[0]
+    car_location = Vec3(0, -4000, 17)
+
+    def compare(name, function):
+        print(f'{name:32s} {timeit.timeit(function, number=number) / number * 1e6:8.2f} us')
+
+    compare('goal, predicate per slice', lambda: first_goal_slice_with_predicate(prediction))
+    compare('update', lambda: prediction_array.update(prediction))
+    compare('goal with crossing time', lambda: prediction_array.find_goal())
+    compare('earliest intercept at 1400 uu/s', lambda: prediction_array.earliest_intercept(car_location, 1400))
+    compare('height windows above 300 uu', lambda: prediction_array.height_windows(300))
+    compare('update + all queries', lambda: (prediction_array.update(prediction), prediction_array.find_goal(),
+                                             prediction_array.earliest_intercept(car_location, 1400),
+                                             prediction_array.height_windows(300)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""
+Compares updating the BoostPadTracker and looking up pads with a Python loop over the BoostPad objects and with the
+vectorized queries of the tracker. Their results are compared in tests/test_boost_pad_tracker.py.
+Run from the root directory: python -m benchmarks.boost_pad_benchmark
+"""
+import timeit
+
+from src.utils.boost_pad_tracker import BoostPadTracker
+from src.utils.packet_snapshot import PacketSnapshot
+from src.utils.vec import Vec3
+from tests.legacy import nearest_active_per_pad, within_per_pad
+from tests.packets import make_packet, make_field_info, STANDARD_NUM_BOOSTS
+
+
+def update_per_pad(boost_pads, packet):
+    """update_boost_status as it was before, one pad after the other."""
+    for i in range(packet.num_boost):
+        our_pad = boost_pads[i]
+        packet_pad = packet.game_boosts[i]
+        our_pad.is_active = packet_pad.is_active
+        our_pad.timer = packet_pad.timer
+
+
+def main(number=20000):
+    tracker = BoostPadTracker()
+    snapshot = PacketSnapshot()
+    packet = make_packet(seed=0, num_boosts=STANDARD_NUM_BOOSTS)
+    tracker.initialize_boosts(make_field_info())
+    tracker.update_boost_status(snapshot.update(packet))
+    boost_pads = tracker.boost_pads
+    location = Vec3(100, 200, 17)
+
+    def compare(name, function):
+        print(f'{name:40s} {timeit.timeit(function, number=number) / number * 1e6:8.2f} us')
+
+    print(f'{STANDARD_NUM_BOOSTS} boost pads')
+    compare('update, per pad', lambda: update_per_pad(boost_pads, packet))
+    compare('update, vectorized', lambda: tracker.update_boost_status(snapshot))
+    compare('nearest active pad, per pad', lambda: nearest_active_per_pad(boost_pads, location))
+    compare('nearest active pad, vectorized', lambda: tracker.nearest_active_pad(location))
+    compare('pads within 2000 uu, per pad', lambda: within_per_pad(boost_pads, location, 2000))
+    compare('pads within 2000 uu, vectorized', lambda: tracker.pads_within(location, 2000))
+    compare('pads along a path, vectorized', lambda: tracker.pads_along(location, Vec3(0, 5000, 17), 500))
+
+
+if __name__ == '__main__':
+    main()
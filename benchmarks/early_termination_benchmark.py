@@ -0,0 +1,49 @@
+"""
+Replays a StateCorpus of the striker and goalie exercises on the headless Simulator twice, with the graders of the
+exercises and with early termination added, and measures how often both grade the same and how much game and wall
+time the early termination saves. That the early grades agree with the full-length ones is checked in
+tests/test_early_termination.py.
+Run from the root directory: python -m benchmarks.early_termination_benchmark
+"""
+from collections import Counter
+
+from src.graders.early_termination import PredictedPass, PredictedFail
+from src.scenarios.state_corpus import StateCorpus, make_replay_playlist
+from src.simulation.headless import HeadlessSession
+from tests.playlists import make_striker_playlist, make_striker_bots, make_goalie_playlist, make_goalie_bots, outcome
+
+
+def compare(name, make_playlist, make_bots, num_seeds):
+    corpus = StateCorpus.build(make_playlist(), range(num_seeds))
+    session = HeadlessSession(make_bots)
+    full = [session.run(exercise, 0) for exercise in make_replay_playlist(corpus, make_playlist)]
+    early = [session.run(exercise, 0) for exercise in make_replay_playlist(corpus, lambda: make_playlist(True))]
+
+    agreements = Counter()
+    predicted = 0
+    for full_result, early_result in zip(full, early):
+        if isinstance(early_result.grade, (PredictedPass, PredictedFail)):
+            predicted += 1
+            agreements[(outcome(full_result.grade), outcome(early_result.grade))] += 1
+    agreeing = sum(n for (full_outcome, early_outcome), n in agreements.items() if full_outcome == early_outcome)
+
+    full_ticks = sum(r.ticks for r in full)
+    early_ticks = sum(r.ticks for r in early)
+    full_wall = sum(r.wall_seconds for r in full)
+    early_wall = sum(r.wall_seconds for r in early)
+    print(f'{name}: {num_seeds} episodes, {predicted} ended early, {agreeing} of them with the full length grade')
+    print(f'  full length / predicted outcomes: {dict(agreements)}')
+    print(f'  game time: {full_ticks / 120:.1f} s -> {early_ticks / 120:.1f} s '
+          f'({1 - early_ticks / max(full_ticks, 1):.0%} saved)')
+    print(f'  wall time: {full_wall:.2f} s -> {early_wall:.2f} s ({1 - early_wall / max(full_wall, 1e-9):.0%} saved)')
+    return agreeing, predicted
+
+
+def main(num_seeds=300):
+    for name, make_playlist, make_bots in (('GoalStrikingExercise', make_striker_playlist, make_striker_bots),
+                                           ('BallRollingToGoalie', make_goalie_playlist, make_goalie_bots)):
+        compare(name, make_playlist, make_bots, num_seeds)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,28 @@
+"""
+Compares the time log() takes on the tick thread for the Logger and the FrameRecorder. That both give the same JSON
+file and that a failing writer does not block log() is checked in tests/test_logger.py.
+Run from the root directory: python -m benchmarks.frame_recorder_benchmark
+"""
+import os
+import tempfile
+import timeit
+
+from src.utils.logger import Logger, FrameRecorder
+from tests.packets import make_packet
+
+
+def main(number=5000):
+    directory = tempfile.mkdtemp()
+    packet = make_packet(num_cars=4)
+    logger = Logger(os.path.join(directory, 'timing.json'))
+    recorder = FrameRecorder(os.path.join(directory, 'timing.frames'))
+    logger_time = timeit.timeit(lambda: logger.log(packet), number=number)
+    recorder_time = timeit.timeit(lambda: recorder.log(packet), number=number)
+    recorder.dump()
+    recorder.join()
+    print(f'Logger.log:        {logger_time / number * 1e6:8.2f} us per tick')
+    print(f'FrameRecorder.log: {recorder_time / number * 1e6:8.2f} us per tick')
+
+
+if __name__ == '__main__':
+    main()
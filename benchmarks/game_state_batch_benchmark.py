@@ -0,0 +1,42 @@
+"""
+Compares generating the starting states of the striker and goalie exercises one GameState at a time with sampling
+them as a GameStateBatch. That both follow the same distributions is checked in tests/test_game_state_batch.py.
+Run from the root directory: python -m benchmarks.game_state_batch_benchmark
+"""
+import time
+from random import Random
+
+from rlbottraining.rng import SeededRandomNumberGenerator
+
+from src.scenarios.goalie.goalie_training import sample_goalie_game_states
+from src.scenarios.striker.striker_training import sample_striker_game_states
+from tests.legacy import striker_state, goalie_state
+
+
+def main(count=20000):
+    for name, make_state, sample in (('GoalStrikingExercise', striker_state, sample_striker_game_states),
+                                     ('BallRollingToGoalie', goalie_state, sample_goalie_game_states)):
+        start = time.perf_counter()
+        states = []
+        for seed in range(count):
+            rng = Random()
+            rng.seed(seed)
+            states.append(make_state(SeededRandomNumberGenerator(rng)))
+        per_state_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch = sample(count, seed=0)
+        batch_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        list(batch)
+        materialize_time = time.perf_counter() - start
+
+        print(f'{name}: {count} states')
+        print(f'  one GameState at a time: {per_state_time / count * 1e6:8.2f} us per state')
+        print(f'  GameStateBatch:          {batch_time / count * 1e6:8.2f} us per state, '
+              f'{materialize_time / count * 1e6:.2f} us more per GameState materialized')
+
+
+if __name__ == '__main__':
+    main()
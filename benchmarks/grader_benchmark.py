@@ -0,0 +1,31 @@
+"""
+Compares the speed of grading recorded trajectories with the live graders fed one packet after the other. That both
+give the same grades on the same ticks is checked in tests/test_grading_trajectory.py.
+Run from the root directory: python -m benchmarks.grader_benchmark
+"""
+import time
+
+from src.graders.trajectory import GradingTrajectory, grade_trajectory
+from src.scenarios.striker.striker_training import StrikerGrader
+from tests.legacy import grade_live
+from tests.packets import make_run
+
+
+def main(num_runs=300):
+    runs = [make_run(seed) for seed in range(num_runs)]
+    trajectories = [GradingTrajectory.from_packets(packets) for packets in runs]
+
+    start = time.perf_counter()
+    for packets in runs:
+        grade_live(StrikerGrader(), packets)
+    live_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for trajectory in trajectories:
+        grade_trajectory(StrikerGrader(), trajectory)
+    batch_time = time.perf_counter() - start
+    print(f'StrikerGrader, live:       {live_time / num_runs * 1e3:8.3f} ms per run')
+    print(f'StrikerGrader, trajectory: {batch_time / num_runs * 1e3:8.3f} ms per run')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""
+Runs the striker and goalie exercises with MyBot on the headless Simulator and reports the exercise throughput, the
+speed relative to real time and the per tick latency of the bot. That the runs are deterministic and graded the same
+from their recording is checked in tests/test_headless.py.
+Run from the root directory: python -m benchmarks.headless_benchmark
+"""
+import time
+from collections import Counter
+
+from src.bots.bot import MyBot
+from src.scenarios.goalie.goalie_training import BallRollingToGoalie
+from src.scenarios.striker.striker_training import GoalStrikingExercise
+from src.simulation.headless import HeadlessSession, ConstantBot
+
+
+def run_exercises(session, make_exercise, num_runs):
+    return [session.run(make_exercise(), seed) for seed in range(num_runs)]
+
+
+def report(name, results, wall_seconds):
+    ticks = sum(result.ticks for result in results)
+    game_seconds = sum(result.game_seconds for result in results)
+    grades = Counter(repr(result.grade) for result in results)
+    print(f'{name}: {len(results)} exercises, {len(results) / wall_seconds * 60:.0f} per minute, '
+          f'{game_seconds / wall_seconds:.1f}x real time')
+    print(f'  bot latency: {sum(r.bot_seconds for r in results) / max(ticks, 1) * 1e6:.1f} us per tick on average, '
+          f'{max(r.max_bot_tick_seconds for r in results) * 1e3:.2f} ms at most')
+    print(f'  grades: {dict(grades)}')
+
+
+def main(num_runs=50):
+    exercises = [
+        ('GoalStrikingExercise', lambda: GoalStrikingExercise('GoalStrikingExercise')),
+        ('BallRollingToGoalie', lambda: BallRollingToGoalie('BallRollingToGoalie')),
+    ]
+    for name, make_exercise in exercises:
+        for bot_class in (MyBot, ConstantBot):
+            session = HeadlessSession(lambda: [bot_class('PGBot_0', 0, 0)])
+            start = time.perf_counter()
+            results = run_exercises(session, make_exercise, num_runs)
+            report(f'{name}, {bot_class.__name__}', results, time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    main()
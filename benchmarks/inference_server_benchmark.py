@@ -0,0 +1,64 @@
+"""
+Runs several model bots on threads against one InferenceServer, like the bot processes of a match, and reports the
+time per tick for all bots with the server and with a model per bot. The batched actions and the fallback of the bots
+are checked in tests/test_inference_server.py.
+Run from the root directory: python -m benchmarks.inference_server_benchmark
+"""
+import threading
+import time
+from pathlib import Path
+
+from src.bots.model_bot import MyBot
+from src.models.inference_server import InferenceServer, InferenceClient
+from src.models.onnx_model import ONNXModel
+from tests.packets import make_packet
+
+MODEL_PATH = str(Path(__file__).absolute().parent.parent / 'models' / 'GoalKeeping05.onnx')
+
+
+def make_bots(num_bots: int, model_path: str, address=None):
+    bots = []
+    for index in range(num_bots):
+        bot = MyBot(f'PGBot_{index}', index % 2, index)
+        bot.model_path = model_path
+        bot.use_model(InferenceClient(model_path, address) if address is not None else ONNXModel(model_path))
+        bots.append(bot)
+    return bots
+
+
+def run_ticks(bots, num_ticks: int) -> float:
+    """Runs get_output of every bot on its own thread for num_ticks packets, returns the seconds per tick."""
+    packets = [make_packet(num_cars=len(bots), seed=tick) for tick in range(num_ticks)]
+    barrier = threading.Barrier(len(bots))
+
+    def run(bot):
+        for packet in packets:
+            barrier.wait()
+            bot.get_output(packet)
+
+    threads = [threading.Thread(target=run, args=(bot,)) for bot in bots]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return (time.perf_counter() - start) / num_ticks
+
+
+def main(num_ticks=500):
+    for num_bots in (4, 8):
+        server = InferenceServer(('localhost', 0)).start()
+        server.get_batcher(MODEL_PATH)
+        bots = make_bots(num_bots, MODEL_PATH, server.address)
+        server_seconds = run_ticks(bots, num_ticks)
+        batcher = server.batchers[MODEL_PATH]
+        for bot in bots:
+            bot.model.close()
+        server.close()
+        local_seconds = run_ticks(make_bots(num_bots, MODEL_PATH), num_ticks)
+        print(f'{num_bots} bots: {batcher.num_requests} requests in {batcher.num_batches} batches, '
+              f'server {server_seconds * 1e6:7.1f} us per tick, model per bot {local_seconds * 1e6:7.1f} us per tick')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Compares the vectorized search of the InterceptPlanner with its car model evaluated slice by slice in Python, and
+measures a full search against reusing the intercept of the last tick. The results of the planner are checked in
+tests/test_intercept.py.
+Run from the root directory: python -m benchmarks.intercept_benchmark
+"""
+import timeit
+
+from src.utils.ball_prediction_analysis import BallPredictionArray
+from src.utils.intercept import InterceptPlanner
+from src.utils.packet_snapshot import PacketSnapshot
+from tests.legacy import intercept_per_slice
+from tests.packets import make_packet, make_ball_prediction, shift_prediction
+
+
+def main(number=2000, num_predictions=200):
+    prediction_array = BallPredictionArray()
+    snapshot = PacketSnapshot()
+    found = 0
+    reused = 0
+    for seed in range(num_predictions):
+        ball_prediction = make_ball_prediction(seed=seed)
+        car = snapshot.update(make_packet(seed=seed)).car(0)
+        current_time = ball_prediction.slices[0].game_seconds
+        planner = InterceptPlanner()
+        if planner.plan(prediction_array.update(ball_prediction), car, current_time) is None:
+            continue
+        found += 1
+        planner.plan(prediction_array.update(shift_prediction(ball_prediction, 1)), car, current_time + 1 / 60)
+        reused += planner.num_searches == 1
+    print(f'{found} of {num_predictions} synthetic predictions can be intercepted, {reused} of them reused the '
+          f'intercept on the next tick')
+
+    def compare(name, function):
+        print(f'{name:40s} {timeit.timeit(function, number=number) / number * 1e6:8.2f} us')
+
+    car = snapshot.update(make_packet(seed=1)).car(0)
+    planner = InterceptPlanner()
+    for seed in (1, 0):
+        ball_prediction = make_ball_prediction(seed=seed)
+        current_time = ball_prediction.slices[0].game_seconds
+        prediction_array.update(ball_prediction)
+        intercept = planner.plan(prediction_array, car, current_time)
+
+        def search():
+            planner.invalidate()
+            return planner.plan(prediction_array, car, current_time)
+
+        print(f'intercept at slice {intercept.index}')
+        compare('  per slice', lambda: intercept_per_slice(planner, ball_prediction, car, current_time))
+        compare('  planner, full search', search)
+        compare('  planner, reused intercept', lambda: planner.plan(prediction_array, car, current_time))
+
+
+if __name__ == '__main__':
+    main()
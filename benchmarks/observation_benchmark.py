@@ -0,0 +1,24 @@
+"""
+Compares the observation building of the model bot before and after the ObservationBuilder. Their agreement is checked
+in tests/test_observation.py.
+Run from the root directory: python -m benchmarks.observation_benchmark
+"""
+import timeit
+
+from src.utils.observation import ObservationBuilder
+from tests.legacy import build_observation_with_vec
+from tests.packets import make_packet
+
+
+def main(number=20000):
+    packet = make_packet()
+    builder = ObservationBuilder()
+    vec_time = timeit.timeit(lambda: build_observation_with_vec(packet, 0), number=number)
+    builder_time = timeit.timeit(lambda: builder.build(packet, 0), number=number)
+    print(f'vec classes:         {vec_time / number * 1e6:8.2f} us per observation')
+    print(f'ObservationBuilder:  {builder_time / number * 1e6:8.2f} us per observation')
+    print(f'speedup:             {vec_time / builder_time:8.2f}x')
+
+
+if __name__ == '__main__':
+    main()
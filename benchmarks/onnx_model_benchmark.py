@@ -0,0 +1,36 @@
+"""
+Measures the per-call overhead of ONNXModel on the shipped models for the plain session call as it was done before,
+ONNXModel.run with the cached feed and ONNXModel.run_bound with the I/O binding. Their results are compared in
+tests/test_onnx_model.py.
+Run from the root directory: python -m benchmarks.onnx_model_benchmark
+"""
+import timeit
+from pathlib import Path
+
+import numpy as np
+
+from src.models.onnx_model import ONNXModel
+from tests.legacy import run_uncached
+
+MODELS_PATH = Path(__file__).absolute().parent.parent / 'models'
+
+
+def main(number=5000):
+    rng = np.random.default_rng(0)
+    for model_path in sorted(MODELS_PATH.glob('GoalKeeping*.onnx')):
+        model = ONNXModel(str(model_path))
+        input_buffer = model.bind()
+        data = rng.random(size=input_buffer.shape, dtype=np.float32)
+        input_buffer[:] = data
+
+        uncached_time = timeit.timeit(lambda: run_uncached(model, data), number=number)
+        run_time = timeit.timeit(lambda: model.run(data), number=number)
+        bound_time = timeit.timeit(model.run_bound, number=number)
+        print(f'{model_path.name}:')
+        print(f'    uncached:   {uncached_time / number * 1e6:8.2f} us per call')
+        print(f'    run:        {run_time / number * 1e6:8.2f} us per call')
+        print(f'    run_bound:  {bound_time / number * 1e6:8.2f} us per call')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Compares one tick of the helper work in MyBot (boost pads, spike watching, steering and the Vec3s of the main logic)
+with the raw packet and with a PacketSnapshot, in wall time and in memory allocated per tick. Their agreement is checked
+in tests/test_packet_snapshot.py.
+Run from the root directory: python -m benchmarks.packet_snapshot_benchmark
+"""
+import timeit
+import tracemalloc
+
+from src.utils.boost_pad_tracker import BoostPadTracker
+from src.utils.packet_snapshot import PacketSnapshot
+from src.utils.spikes import SpikeWatcher
+from tests.legacy import packet_tick, snapshot_tick
+from tests.packets import make_packet, make_field_info, STANDARD_NUM_BOOSTS
+
+
+def peak_allocation(tick, number=100) -> float:
+    """Average peak of the memory allocated during a tick in bytes."""
+    tick()
+    tracemalloc.start()
+    total = 0
+    for _ in range(number):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        tick()
+        total += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+    return total / number
+
+
+def main(number=20000, num_cars=6):
+    packet = make_packet(num_cars=num_cars, num_boosts=STANDARD_NUM_BOOSTS)
+    field_info = make_field_info()
+    trackers = [BoostPadTracker(), BoostPadTracker()]
+    for tracker in trackers:
+        tracker.initialize_boosts(field_info)
+    watchers = [SpikeWatcher(), SpikeWatcher()]
+    snapshot = PacketSnapshot()
+
+    def run_packet():
+        return packet_tick(packet, 0, trackers[0], watchers[0])
+
+    def run_snapshot():
+        return snapshot_tick(snapshot, packet, 0, trackers[1], watchers[1])
+
+    packet_time = timeit.timeit(run_packet, number=number)
+    snapshot_time = timeit.timeit(run_snapshot, number=number)
+    print(f'{num_cars} cars, {STANDARD_NUM_BOOSTS} boost pads')
+    print(f'packet:    {packet_time / number * 1e6:8.2f} us, {peak_allocation(run_packet):8.0f} bytes per tick')
+    print(f'snapshot:  {snapshot_time / number * 1e6:8.2f} us, {peak_allocation(run_snapshot):8.0f} bytes per tick')
+    print(f'speedup:   {packet_time / snapshot_time:8.2f}x')
+
+
+if __name__ == '__main__':
+    main()
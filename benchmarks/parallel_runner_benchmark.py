@@ -0,0 +1,38 @@
+"""
+Runs the striker and goalie exercises with MyBot one after another and on different numbers of headless workers, and
+once more with a bot that crashes its worker process once. Reports the throughput per number of workers, which only
+grows with the number of CPU cores. That the results do not depend on the workers is checked in tests/test_parallel.py.
+Run from the root directory: python -m benchmarks.parallel_runner_benchmark
+"""
+import os
+import tempfile
+import time
+
+from src.bots.bot import MyBot
+from src.evaluation.parallel import ParallelRunner, BotFactory
+from src.simulation.headless import HeadlessSession
+from tests.playlists import CrashOnceBotFactory, make_playlist
+
+
+def main(num_seeds=40):
+    seeds = range(num_seeds)
+    session = HeadlessSession(BotFactory(MyBot))
+    start = time.perf_counter()
+    for seed in seeds:
+        for exercise in make_playlist():
+            session.run(exercise, seed)
+    print(f'one after another: {num_seeds * len(make_playlist())} episodes in {time.perf_counter() - start:.1f} s')
+
+    for num_workers in (1, 2, 4):
+        runner = ParallelRunner(make_playlist, {'MyBot': BotFactory(MyBot)}, num_workers)
+        runner.run(seeds)
+        print(f'{num_workers} workers: {runner.stats.report()}')
+
+    marker_path = os.path.join(tempfile.mkdtemp(), 'crashed')
+    runner = ParallelRunner(make_playlist, {'MyBot': CrashOnceBotFactory(marker_path)}, 2)
+    runner.run(seeds)
+    print(f'crashing once: {runner.stats.report()}')
+
+
+if __name__ == '__main__':
+    main()
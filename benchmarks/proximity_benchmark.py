@@ -0,0 +1,35 @@
+"""
+Compares the car to ball and car to car distances computed with a Vec3 per car and with Proximity, from a few cars up
+to the 64 cars a match can have. Their agreement is checked in tests/test_proximity.py.
+Run from the root directory: python -m benchmarks.proximity_benchmark
+"""
+import timeit
+
+from src.utils.packet_snapshot import PacketSnapshot
+from src.utils.spikes import MAX_DISTANCE_WHEN_SPIKED
+from tests.legacy import spiked_car_per_car, car_distances_per_car
+from tests.packets import make_packet
+
+
+def main(number=2000):
+    snapshot = PacketSnapshot()
+
+    def compare(name, function):
+        print(f'{name:40s} {timeit.timeit(function, number=number) / number * 1e6:8.2f} us')
+
+    for num_cars in (2, 8, 64):
+        packet = make_packet(num_cars=num_cars)
+        # a quarter of the cars is supersonic
+        for i in range(0, num_cars, 4):
+            packet.game_cars[i].is_super_sonic = True
+        print(f'{num_cars} cars')
+        compare('  spiked car, per car', lambda: spiked_car_per_car(packet))
+        compare('  spiked car, Proximity', lambda: snapshot.update(packet).proximity.closest_car_to_ball(
+            MAX_DISTANCE_WHEN_SPIKED))
+        compare('  car distances, per car', lambda: car_distances_per_car(packet))
+        compare('  car distances, Proximity', lambda: snapshot.update(packet).proximity.car_distances)
+        compare('  demolition risks, Proximity', lambda: snapshot.update(packet).proximity.demolition_risks())
+
+
+if __name__ == '__main__':
+    main()
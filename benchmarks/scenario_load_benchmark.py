@@ -0,0 +1,72 @@
+"""
+Compares the scenario loading of a test bot before and after the scenario cache, for a large multi car scenario.
+Run from the root directory: python -m benchmarks.scenario_load_benchmark
+"""
+import json
+import os
+import random
+import tempfile
+import timeit
+
+from src.utils.scenario import cache_scenario, read_scenario_cache
+from src.utils.scenario_test_object import JSONObject
+
+INPUT_NAMES = ['throttle', 'steer', 'pitch', 'yaw', 'roll', 'jump', 'boost', 'handbrake']
+
+
+def make_scenario(num_cars=8, num_actions=2000, seed=0) -> dict:
+    rng = random.Random(seed)
+
+    def vector():
+        return {'x': rng.uniform(-10, 10), 'y': rng.uniform(0, 10), 'z': rng.uniform(-10, 10)}
+
+    def start_values():
+        return {'position': vector(), 'velocity': vector(), 'angularVelocity': vector(), 'rotation': vector()}
+
+    game_objects = [{'gameObject': 'ball', 'startValues': start_values()}]
+    for car_id in range(num_cars):
+        game_objects.append({
+            'gameObject': 'car',
+            'id': str(car_id),
+            'team': str(car_id % 2),
+            'lead': car_id == 0,
+            'startValues': start_values(),
+            'actions': [{'duration': 1 / 120, 'inputs': [{'name': name, 'value': rng.uniform(-1, 1)}
+                                                         for name in rng.sample(INPUT_NAMES, 3)]}
+                        for _ in range(num_actions)],
+        })
+    return {'name': 'benchmark', 'time': num_actions / 120, 'gameObjects': game_objects}
+
+
+def load_with_json_objects(scenario_path, car_id):
+    """The scenario loading as it was done in TestBot.load_config, without the settings files."""
+    with open(scenario_path) as scenario_file:
+        scenario = json.load(scenario_file, object_hook=JSONObject)
+    return list(filter(lambda go: go.id == car_id, filter(lambda go: go.gameObject == 'car', scenario.gameObjects)))[0]
+
+
+def load_from_cache(cache_path, car_id):
+    return read_scenario_cache(cache_path).car(car_id)
+
+
+def main(number=20, num_cars=8, num_actions=2000):
+    with tempfile.TemporaryDirectory() as directory:
+        scenario_path = os.path.join(directory, 'benchmark.json')
+        with open(scenario_path, 'w') as scenario_file:
+            json.dump(make_scenario(num_cars, num_actions), scenario_file)
+        parse_time = timeit.timeit(lambda: cache_scenario(scenario_path, os.path.join(directory, 'cache')), number=1)
+        _, cache_path = cache_scenario(scenario_path, os.path.join(directory, 'cache'))
+
+        json_time = timeit.timeit(lambda: load_with_json_objects(scenario_path, '3'), number=number)
+        cache_time = timeit.timeit(lambda: load_from_cache(cache_path, '3'), number=number)
+        print(f'{num_cars} cars, {num_actions} actions per car, {os.path.getsize(scenario_path) / 1e6:.1f} MB JSON')
+        print(f'runner parse + cache: {parse_time * 1e3:8.2f} ms once per scenario')
+        print(f'JSONObject per bot:   {json_time / number * 1e3:8.2f} ms')
+        print(f'cache per bot:        {cache_time / number * 1e3:8.2f} ms')
+        print(f'speedup:              {json_time / cache_time:8.2f}x')
+        print(f'per match of {num_cars} bots: {json_time / number * num_cars * 1e3:.1f} ms before, '
+              f'{(parse_time + cache_time / number * num_cars) * 1e3:.1f} ms after')
+
+
+if __name__ == '__main__':
+    main()
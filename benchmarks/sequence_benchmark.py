@@ -0,0 +1,43 @@
+"""
+Compares ticking the action sequence of a long test scenario as a Sequence of ControlSteps and as a CompiledSequence. Their
+agreement is checked in tests/test_sequence.py.
+Run from the root directory: python -m benchmarks.sequence_benchmark
+"""
+import time
+
+from rlbot.utils.structures.game_data_struct import GameTickPacket
+
+from src.utils.sequence import Sequence, CompiledSequence
+from tests.packets import make_steps, make_tick_times
+
+
+def run(sequence, packet, times):
+    controls = []
+    for seconds_elapsed in times:
+        packet.game_info.seconds_elapsed = seconds_elapsed
+        controls.append(sequence.tick(packet))
+    return controls
+
+
+def main(num_actions=5000):
+    steps = make_steps(num_actions)
+    times = make_tick_times(sum(step.duration for step in steps) * 1.5)
+    packet = GameTickPacket()
+
+    start = time.perf_counter()
+    run(Sequence(steps), packet, times)
+    sequence_time = time.perf_counter() - start
+
+    compiled = CompiledSequence.from_steps(steps)
+    start = time.perf_counter()
+    run(compiled, packet, times)
+    compiled_time = time.perf_counter() - start
+
+    print(f'{num_actions} actions, {len(times)} ticks')
+    print(f'Sequence:          {sequence_time / len(times) * 1e6:8.2f} us per tick')
+    print(f'CompiledSequence:  {compiled_time / len(times) * 1e6:8.2f} us per tick')
+    print(f'speedup:           {sequence_time / compiled_time:8.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Builds a StateCorpus of the striker and goalie playlists, writes and reads it, and replays it on the headless
+Simulator. Reports the size of the file and the time to generate a state live and to look it up in the corpus.
+That the stored states are the live ones and that replays repeat is checked in tests/test_state_corpus.py.
+Run from the root directory: python -m benchmarks.state_corpus_benchmark
+"""
+import os
+import tempfile
+import time
+from random import Random
+
+from rlbottraining.rng import SeededRandomNumberGenerator
+
+from src.scenarios.state_corpus import StateCorpus, make_replay_playlist
+from src.scenarios.striker.striker_training import make_default_playlist as make_striker_playlist
+from src.simulation.headless import HeadlessSession, ConstantBot
+from tests.playlists import make_playlist
+
+
+def main(num_seeds=5000, num_replays=20):
+    start = time.perf_counter()
+    corpus = StateCorpus.build(make_playlist(), range(num_seeds))
+    build_time = time.perf_counter() - start
+
+    path = os.path.join(tempfile.mkdtemp(), 'states.npz')
+    corpus.save(path)
+    start = time.perf_counter()
+    corpus = StateCorpus.load(path)
+    load_time = time.perf_counter() - start
+    num_states = num_seeds * len(corpus.exercise_names)
+    print(f'{num_states} states: built in {build_time:.2f} s, {os.path.getsize(path) / num_states:.0f} bytes per state '
+          f'on disk, loaded in {load_time * 1e3:.1f} ms')
+
+    # replaying the corpus, whatever seed the runner uses
+    session = HeadlessSession(lambda: [ConstantBot('ConstantBot', 0, 0)])
+    start = time.perf_counter()
+    replays = make_replay_playlist(corpus, make_playlist, range(num_replays))
+    runs = [session.run(exercise, seed=0) for exercise in replays]
+    print(f'{len(runs)} replayed runs in {time.perf_counter() - start:.2f} s')
+
+    exercise = make_striker_playlist()[0]
+    start = time.perf_counter()
+    for seed in range(num_seeds):
+        rng = Random()
+        rng.seed(seed)
+        exercise.make_game_state(SeededRandomNumberGenerator(rng))
+    live_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for seed in range(num_seeds):
+        corpus.game_state_for_seed(exercise.name, seed)
+    replay_time = time.perf_counter() - start
+    print(f'{exercise.name}, make_game_state: {live_time / num_seeds * 1e6:8.2f} us per state')
+    print(f'{exercise.name}, corpus lookup:   {replay_time / num_seeds * 1e6:8.2f} us per state')
+
+
+if __name__ == '__main__':
+    main()
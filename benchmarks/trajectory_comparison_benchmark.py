@@ -0,0 +1,91 @@
+"""
+Compares a pair of scenario logs with compare_logs and with a per tick loop, and reports how many scenario pairs per
+second compare_batch gets through with one process and with a process pool. The logs are random walks of 10 second
+scenarios with 4 cars, written as the columnar sidecars of open_log, so the timings do not include the one-time JSON
+conversion.
+Run from the root directory: python -m benchmarks.trajectory_comparison_benchmark
+"""
+import bisect
+import os
+import tempfile
+import time
+import timeit
+
+import numpy as np
+
+from src.utils.log_reader import ScenarioLog, PHYSICS_COLUMNS, write_columns, open_log, COLUMNS_SUFFIX
+from src.utils.trajectory_comparison import compare_logs, compare_batch, common_time_base
+
+CAR_IDS = ['0', '1', '2', '3']
+
+
+def make_log(num_frames: int, seed: int) -> ScenarioLog:
+    rng = np.random.default_rng(seed)
+    num_cars = len(CAR_IDS)
+    columns = dict(
+        car_ids=CAR_IDS,
+        time=np.arange(num_frames) / 120 + rng.uniform(0, 0.004, num_frames),
+        car_boost=rng.integers(0, 100, (num_frames, num_cars)).astype(np.int32),
+        car_has_wheel_contact=np.ones((num_frames, num_cars), dtype=bool),
+        car_jumped=np.zeros((num_frames, num_cars), dtype=bool),
+    )
+    for name in PHYSICS_COLUMNS:
+        columns['car_' + name] = np.cumsum(rng.normal(0, 0.1, (num_frames, num_cars, 3)), axis=0)
+        columns['ball_' + name] = np.cumsum(rng.normal(0, 0.1, (num_frames, 3)), axis=0)
+    return ScenarioLog(**columns)
+
+
+def write_log(log: ScenarioLog, path: str):
+    with open(path, 'w') as log_file:
+        log_file.write('{}')
+    write_columns(log, path + COLUMNS_SUFFIX, path)
+
+
+def _interpolate(time_list, values, t):
+    right = min(max(bisect.bisect_right(time_list, t), 1), len(time_list) - 1)
+    left = right - 1
+    weight = (t - time_list[left]) / (time_list[right] - time_list[left])
+    return values[left] * (1 - weight) + values[right] * weight
+
+
+def compare_per_tick(log_a: ScenarioLog, log_b: ScenarioLog):
+    """Location, velocity and angular velocity errors with one interpolation per tick and object."""
+    time_base = common_time_base(log_a.time, log_b.time)
+    time_a, time_b = log_a.time.tolist(), log_b.time.tolist()
+    errors = {}
+    for quantity in ('location', 'velocity', 'angular_velocity'):
+        objects = [(getattr(log_a, 'ball_' + quantity), getattr(log_b, 'ball_' + quantity))]
+        objects += [(getattr(log_a, 'car_' + quantity)[:, i], getattr(log_b, 'car_' + quantity)[:, i])
+                    for i in range(len(CAR_IDS))]
+        errors[quantity] = [[float(np.linalg.norm(_interpolate(time_a, a, t) - _interpolate(time_b, b, t)))
+                             for t in time_base] for a, b in objects]
+    return errors
+
+
+def main(num_frames=1200, num_pairs=200, number=20):
+    log_a, log_b = make_log(num_frames, 0), make_log(num_frames, 1)
+    vectorized = timeit.timeit(lambda: compare_logs(log_a, log_b), number=number) / number
+    per_tick = timeit.timeit(lambda: compare_per_tick(log_a, log_b), number=1)
+    print(f'one pair of {num_frames} frames, {len(CAR_IDS)} cars')
+    print(f'  per tick loop (3 quantities):      {per_tick * 1e3:8.1f} ms')
+    print(f'  compare_logs (all 4 quantities):   {vectorized * 1e3:8.1f} ms')
+
+    directory = tempfile.mkdtemp()
+    pairs = []
+    for i in range(num_pairs):
+        path_a = os.path.join(directory, f'rlbot_{i}.json')
+        path_b = os.path.join(directory, f'roboleague_{i}.json')
+        write_log(make_log(num_frames, 2 * i), path_a)
+        write_log(make_log(num_frames, 2 * i + 1), path_b)
+        pairs.append((path_a, path_b))
+    open_log(pairs[0][0])
+    for processes in sorted({1, os.cpu_count() or 1}):
+        start = time.perf_counter()
+        for _ in compare_batch(pairs, processes=processes):
+            pass
+        seconds = time.perf_counter() - start
+        print(f'compare_batch, {processes:2d} processes: {num_pairs / seconds:8.1f} scenario pairs per second')
+
+
+if __name__ == '__main__':
+    main()
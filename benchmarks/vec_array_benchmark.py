@@ -0,0 +1,37 @@
+"""
+Compares the speed of the array backed vector types with the scalar vec classes. Their element-wise agreement is checked
+in tests/test_vec_array.py.
+Run from the root directory: python -m benchmarks.vec_array_benchmark
+"""
+import time
+
+import numpy as np
+
+from src.utils.vec import Vec3, Location, LocationArray
+
+
+def main(n=10000):
+    rng = np.random.default_rng(1)
+    locations = rng.uniform(-5000, 5000, (n, 3))
+    target = Vec3(1000, 2000, 17)
+
+    start = time.perf_counter()
+    vecs = [Location(*v) for v in locations]
+    [v.to_unity_units().obs_normalized() for v in vecs]
+    [v.dist(target) for v in vecs]
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    array = LocationArray(locations)
+    array.to_unity_units().obs_normalized()
+    array.dist(target)
+    array_time = time.perf_counter() - start
+
+    print(f'{n} locations: unit conversion, normalization and distance to a target')
+    print(f'Location:       {scalar_time * 1e3:8.2f} ms')
+    print(f'LocationArray:  {array_time * 1e3:8.2f} ms')
+    print(f'speedup:        {scalar_time / array_time:8.2f}x')
+
+
+if __name__ == '__main__':
+    main()
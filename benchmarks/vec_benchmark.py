@@ -0,0 +1,43 @@
+"""
+Compares the Vec3 hot paths before and after the fast constructors: relative_location, steer_toward_target,
+Quaternion(rotator) and converting a Unity location to a game state vector. The results are compared with the old code
+paths in tests/test_vec.py.
+Run from the root directory: python -m benchmarks.vec_benchmark
+"""
+import timeit
+
+from src.utils.drive import steer_toward_target
+from src.utils.orientation import Orientation, relative_location
+from src.utils.vec import Vec3, Quaternion, Location, UnitSystem
+from tests.legacy import legacy_relative_location, legacy_steer_toward_target, legacy_quaternion, \
+    legacy_game_state_vector
+from tests.packets import make_packet
+
+
+def compare(name, legacy, fast, number):
+    legacy_time = timeit.timeit(legacy, number=number)
+    fast_time = timeit.timeit(fast, number=number)
+    print(f'{name:30s} {legacy_time / number * 1e6:8.2f} us -> {fast_time / number * 1e6:8.2f} us '
+          f'({legacy_time / fast_time:.2f}x)')
+
+
+def main(number=50000):
+    packet = make_packet(seed=0)
+    car = packet.game_cars[0]
+    target = Vec3(packet.game_ball.physics.location)
+    center = Vec3(car.physics.location)
+    rotation = car.physics.rotation
+    ori = Orientation(rotation)
+    unity_location = Location(12.5, 0.17, -30.0, UnitSystem.UNITY)
+
+    compare('relative_location', lambda: legacy_relative_location(center, ori, target),
+            lambda: relative_location(center, ori, target), number)
+    compare('steer_toward_target', lambda: legacy_steer_toward_target(car, target),
+            lambda: steer_toward_target(car, target), number)
+    compare('Quaternion(rotator)', lambda: legacy_quaternion(rotation), lambda: Quaternion(rotation), number)
+    compare('Location.to_game_state_vector', lambda: legacy_game_state_vector(unity_location),
+            lambda: unity_location.to_game_state_vector(), number)
+
+
+if __name__ == '__main__':
+    main()
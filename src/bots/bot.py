@@ -6,11 +6,12 @@ from rlbot.messages.flat.QuickChatSelection import QuickChatSelection
 from rlbot.parsing.custom_config import ConfigObject
 from rlbot.utils.structures.game_data_struct import GameTickPacket
 
-from src.utils.ball_prediction_analysis import find_slice_at_time
+from src.utils.ball_prediction_analysis import BallPredictionArray
 from src.utils.boost_pad_tracker import BoostPadTracker
 from src.utils.drive import steer_toward_target
+from src.utils.intercept import InterceptPlanner
+from src.utils.packet_snapshot import PacketSnapshot
 from src.utils.sequence import Sequence, ControlStep
-from src.utils.vec import Vec3
 
 class MyBot(BaseAgent):
 
@@ -18,6 +19,10 @@ class MyBot(BaseAgent):
         super().__init__(name, team, index)
         self.active_sequence: Sequence = None
         self.boost_pad_tracker = BoostPadTracker()
+        self.snapshot = PacketSnapshot()
+        self.ball_prediction = BallPredictionArray()
+        # This bot never boosts, so it should not plan with boost
+        self.intercept_planner = InterceptPlanner(use_boost=False)
 
     def initialize_agent(self):
         # Set up information about the boost pads now that the game is active and the info is available
@@ -29,8 +34,11 @@ class MyBot(BaseAgent):
         see the motion of the ball, etc. and return controls to drive your car.
         """
 
+        # Converted values of the packet are cached in the snapshot and shared with the helpers for this tick
+        snapshot = self.snapshot.update(packet)
+
         # Keep our boost pad info updated with which pads are currently active
-        self.boost_pad_tracker.update_boost_status(packet)
+        self.boost_pad_tracker.update_boost_status(snapshot)
 
         # This is good to keep at the beginning of get_output. It will allow you to continue
         # any sequences that you may have started during a previous call to get_output.
@@ -40,23 +48,24 @@ class MyBot(BaseAgent):
                 return controls
 
         # Gather some information about our car and the ball
-        my_car = packet.game_cars[self.index]
-        car_location = Vec3(my_car.physics.location)
-        car_velocity = Vec3(my_car.physics.velocity)
-        ball_location = Vec3(packet.game_ball.physics.location)
+        my_car = snapshot.car(self.index)
+        car_location = my_car.location
+        car_velocity = my_car.velocity
+        ball_location = snapshot.ball.location
 
         # By default we will chase the ball, but target_location can be changed later
         target_location = ball_location
 
         if car_location.dist(ball_location) > 1500:
-            # We're far away from the ball, let's try to lead it a little bit
-            ball_prediction = self.get_ball_prediction_struct()  # This can predict bounces, etc
-            ball_in_future = find_slice_at_time(ball_prediction, packet.game_info.seconds_elapsed + 2)
-
-            # ball_in_future might be None if we don't have an adequate ball prediction right now, like during
-            # replays, so check it to avoid errors.
-            if ball_in_future is not None:
-                target_location = Vec3(ball_in_future.physics.location)
+            # We're far away from the ball, let's drive to the earliest point where we can meet it
+            # The ball prediction can predict bounces, etc
+            ball_prediction = self.ball_prediction.update(self.get_ball_prediction_struct())
+            intercept = self.intercept_planner.plan(ball_prediction, my_car, snapshot.time)
+
+            # intercept might be None if we don't have an adequate ball prediction right now, like during
+            # replays, or if we cannot reach the ball within the prediction, so check it to avoid errors.
+            if intercept is not None:
+                target_location = intercept.location
                 self.renderer.draw_line_3d(ball_location, target_location, self.renderer.cyan())
 
         # Draw some things to help understand what the bot is thinking
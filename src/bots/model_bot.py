@@ -1,17 +1,19 @@
 from pathlib import Path
+from queue import Empty
 
-import numpy as np
 from rlbot.agents.base_agent import BaseAgent, SimpleControllerState, BOT_CONFIG_AGENT_HEADER
+from rlbot.matchcomms.common_uses.common_keys import TARGET_PLAYER_INDEX
+from rlbot.matchcomms.common_uses.reply import reply_to
+from rlbot.matchcomms.common_uses.set_attributes_message import MESSAGE_KEY as SET_ATTRIBUTES_KEY
 from rlbot.messages.flat.QuickChatSelection import QuickChatSelection
 from rlbot.parsing.custom_config import ConfigObject
 from rlbot.utils.structures.game_data_struct import GameTickPacket
 
 from src.utils.drive import steer_toward_target
-from src.utils.vec import Vec3, Location, Velocity, Quaternion, AngularVelocity
+from src.utils.observation import ObservationBuilder
 
 from src.models.onnx_model import ONNXModel
-
-from math import sin, cos
+from src.models.inference_server import InferenceClient, parse_address
 
 DISCRETE_ACTIONS = [-1, -0.5, 0, 0.5, 1]
 
@@ -19,57 +21,33 @@ class MyBot(BaseAgent):
 
     def __init__(self, name, team, index):
         super().__init__(name, team, index)
+        self.observation_builder = ObservationBuilder()
+        self.model = None
+        self.model_path = None
+        # models by path, loaded once and kept for switching back, see switch_model
+        self.loaded_models = dict()
 
     def get_output(self, packet: GameTickPacket) -> SimpleControllerState:
         """
         This function will be called by the framework many times per second. This is where you can
         see the motion of the ball, etc. and return controls to drive your car.
         """
-
-        car_physics = packet.game_cars[self.index].physics
-        ball_physics = packet.game_ball.physics
-
-        car_location = Location(car_physics.location)
-        car_location.to_unity_units()
-        car_location = car_location.obs_normalized()
-
-        car_velocity = Velocity(car_physics.velocity)
-        car_velocity.to_unity_units()
-        car_velocity = car_velocity.obs_normalized()
-
-        car_rotation = Quaternion(car_physics.rotation)
-        car_rotation.to_unity_units()
-        car_rotation = car_rotation.obs_normalized()
-
-        car_angular_velocity = AngularVelocity(car_physics.angular_velocity)
-        car_angular_velocity.to_unity_units()
-        car_angular_velocity = car_angular_velocity.obs_normalized()
-
-        ball_location = Location(ball_physics.location)
-        ball_location.to_unity_units()
-        ball_location = ball_location.obs_normalized()
-
-        ball_velocity = Velocity(ball_physics.velocity)
-        ball_velocity.to_unity_units()
-        ball_velocity = ball_velocity.obs_normalized(is_ball=True)
-
-        boost = packet.game_cars[self.index].boost / 100
-
-        # get input shape of model and set batch size to one
-        input_shape = self.model.get_input_shape()
-        input_shape[0] = 1
-
-        data = np.zeros(shape=input_shape, dtype=np.float32)
-        data[0, 0:3] = list(car_location)
-        data[0, 3:7] = list(car_rotation)
-        data[0, 7:10] = list(car_velocity)
-        data[0, 10:13] = list(car_angular_velocity)
-        data[0, 13:16] = list(ball_location)
-        data[0, 16:19] = list(ball_velocity)
-        data[0, 19] = boost
-
-        output = self.model.run(data)
-        output = output[0].tolist()[0]
+        if self.matchcomms_root is not None:
+            self.receive_model_switch()
+
+        self.observation_builder.build(packet, self.index)
+
+        try:
+            output = self.model.run_bound()
+        except (EOFError, OSError):
+            # The inference server went away, continue with a model of our own
+            self.logger.warning('Lost connection to the inference server, loading the model locally')
+            if isinstance(self.model, InferenceClient):
+                self.model.close()
+            self.use_model(ONNXModel(self.model_path))
+            self.observation_builder.build(packet, self.index)
+            output = self.model.run_bound()
+        output = output[0].tolist()
 
         controls = SimpleControllerState()
         if self.model.is_multi_discrete:
@@ -113,14 +91,61 @@ class MyBot(BaseAgent):
 
         return controls
 
+    def use_model(self, model):
+        """
+        Sets the model (an ONNXModel or an InferenceClient) and lets the observation builder write straight into its
+        bound input.
+        """
+        self.model = model
+        self.observation_builder = ObservationBuilder(self.model.bind())
+
+    def switch_model(self, model_path: str, model=None):
+        """
+        Uses the model at model_path from now on, or the given model which was loaded from there. The evaluation
+        harness switches the models of one bot between exercises, so every model is loaded only once.
+        """
+        if model is None:
+            model = self.loaded_models.get(model_path)
+        if model is None:
+            model = ONNXModel(model_path)
+        self.loaded_models[model_path] = model
+        self.model_path = model_path
+        self.use_model(model)
+
+    def receive_model_switch(self):
+        """
+        Switches the model when a set attributes message with a model_path was broadcast over matchcomms for this bot,
+        and replies once the model is in use.
+        """
+        try:
+            message = self.matchcomms.incoming_broadcast.get_nowait()
+        except Empty:
+            return
+        attributes = message.get(SET_ATTRIBUTES_KEY) if isinstance(message, dict) else None
+        if not isinstance(attributes, dict) or message.get(TARGET_PLAYER_INDEX) != self.index \
+                or 'model_path' not in attributes:
+            return
+        if attributes['model_path'] != self.model_path:
+            self.switch_model(attributes['model_path'])
+        reply_to(self.matchcomms, message)
+
     def load_config(self, config_object_header):
         model_path = config_object_header['model_path'].value
         if model_path is not None:
-            absolute_model_path = Path(__file__).absolute().parent / model_path
-            self.model = ONNXModel(absolute_model_path.__str__())
+            self.model_path = (Path(__file__).absolute().parent / model_path).__str__()
+            inference_server = config_object_header['inference_server'].value
+            if inference_server is not None:
+                try:
+                    self.use_model(InferenceClient(self.model_path, parse_address(inference_server)))
+                    return
+                except OSError:
+                    self.logger.warning(f'No inference server at {inference_server}, loading the model locally')
+            self.use_model(ONNXModel(self.model_path))
 
     @staticmethod
     def create_agent_configurations(config: ConfigObject):
         params = config.get_header(BOT_CONFIG_AGENT_HEADER)
         params.add_value('model_path', str, default=None,
                          description='Port to use for websocket communication')
+        params.add_value('inference_server', str, default=None,
+                         description='host:port of an inference server that runs the model batched for all bots')
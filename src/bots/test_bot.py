@@ -1,14 +1,16 @@
 import json
 
 from rlbot.agents.base_agent import BaseAgent, SimpleControllerState, BOT_CONFIG_AGENT_HEADER, BOT_NAME_KEY
+from rlbot.matchcomms.common_uses.reply import reply_to, get_reply_id
 from rlbot.messages.flat.QuickChatSelection import QuickChatSelection
 from rlbot.parsing.custom_config import ConfigObject
 from rlbot.utils.game_state_util import GameState, BallState, CarState, Physics
 from rlbot.utils.structures.game_data_struct import GameTickPacket
 
-from src.utils.sequence import Sequence, ControlStep
+from src.utils.sequence import CompiledSequence
+from src.utils.scenario import Scenario, load_scenario, read_scenario_cache
 from src.utils.scenario_test_object import JSONObject
-from src.utils.logger import Logger
+from src.utils.logger import FrameRecorder
 from src.utils.vec import Location, Velocity, AngularVelocity, EulerAngles, UnitSystem
 import os
 
@@ -18,11 +20,15 @@ class TestBot(BaseAgent):
     def __init__(self, name, team, index):
         super().__init__(name, team, index)
         self.active_sequence = None
-        self.scenario = None
+        self.scenario: Scenario = None
         self.logger = None
         self.log_path = None
         self.game_object = None
         self.lead = None
+        # reply id of the last briefing, the briefing is resent until every bot replied
+        self.briefing_id = None
+        # private directory of the run with the scenario caches, briefings with caches elsewhere are ignored
+        self.scenario_cache_directory = None
 
     def get_output(self, packet: GameTickPacket) -> SimpleControllerState:
         """
@@ -30,6 +36,8 @@ class TestBot(BaseAgent):
         see the motion of the ball, etc. and return controls to drive your car.
         """
 
+        self.check_briefing()
+
         if self.active_sequence is None:
             self.setup()
             return SimpleControllerState()
@@ -56,21 +64,29 @@ class TestBot(BaseAgent):
         """
         self.send_quick_chat(team_only=False, quick_chat=QuickChatSelection.Information_IGotIt)
         if self.lead:
-            self.logger = Logger(self.log_path)
+            # Frames are streamed to a binary file while running and converted to the JSON log afterwards
+            record_path = os.path.splitext(self.log_path)[0] + '.frames'
+            self.logger = FrameRecorder(record_path, json_path=self.log_path)
 
         acc_durations = 0.0
 
-        control_step_list = []
-        for action in self.game_object.actions:
-            control_step_list.append(
-                ControlStep(duration=action.duration, controls=self.get_action_controls(action.inputs)))
-            acc_durations += action.duration
+        durations = []
+        controls = []
+        # Actions with the same inputs share one controller state
+        control_states = dict()
+        for duration, inputs in self.game_object.actions:
+            key = tuple(sorted(dict(inputs).items()))
+            if key not in control_states:
+                control_states[key] = self.get_action_controls(key)
+            durations.append(duration)
+            controls.append(control_states[key])
+            acc_durations += duration
 
         if self.scenario.time > acc_durations:
-            control_step_list.append(ControlStep(duration=self.scenario.time - acc_durations,
-                                                 controls=SimpleControllerState()))
+            durations.append(self.scenario.time - acc_durations)
+            controls.append(SimpleControllerState())
 
-        self.active_sequence = Sequence(control_step_list)
+        self.active_sequence = CompiledSequence(durations, controls)
 
     @staticmethod
     def get_physics(values) -> 'Physics':
@@ -80,8 +96,8 @@ class TestBot(BaseAgent):
         """
         position = Location(values.position.x, values.position.y, values.position.z, UnitSystem.UNITY)
         velocity = Velocity(values.velocity.x, values.velocity.y, values.velocity.z, UnitSystem.UNITY)
-        angular_velocity = AngularVelocity(values.angularVelocity.x, values.angularVelocity.y, values.angularVelocity.z,
-                                           UnitSystem.UNITY)
+        angular_velocity = AngularVelocity(values.angular_velocity.x, values.angular_velocity.y,
+                                           values.angular_velocity.z, UnitSystem.UNITY)
         rotation = EulerAngles(values.rotation.x, values.rotation.y, -values.rotation.z, UnitSystem.UNITY)
         return Physics(
             location=position.to_unreal_units().to_game_state_vector(),
@@ -99,11 +115,11 @@ class TestBot(BaseAgent):
             return
         gs = GameState()
         gs.cars = dict()
-        for go in self.scenario.gameObjects:
-            if go.gameObject == 'car':
-                gs.cars[len(gs.cars)] = CarState(physics=self.get_physics(go.startValues))
-            elif go.gameObject == 'ball':
-                gs.ball = BallState(physics=self.get_physics(go.startValues))
+        for go in self.scenario.game_objects:
+            if go.game_object == 'car':
+                gs.cars[len(gs.cars)] = CarState(physics=self.get_physics(go.start_values))
+            elif go.game_object == 'ball':
+                gs.ball = BallState(physics=self.get_physics(go.start_values))
 
         self.set_game_state(gs)
 
@@ -111,31 +127,85 @@ class TestBot(BaseAgent):
     def get_action_controls(inputs):
         """
         Returns a SimpleControllerState with the given inputs set to given values of the inputs object.
-        The object should have a name attribute corresponding to the input name in the ControllerState and a specified
-        value.
+        The inputs are (name, value) pairs with the name of the input in the ControllerState.
         """
         control = SimpleControllerState()
-        for i in inputs:
-            setattr(control, i.name, i.value)
+        for name, value in inputs:
+            setattr(control, name, value)
 
         return control
 
+    def check_briefing(self):
+        """
+        In batch mode the runner broadcasts the next scenario via matchcomms before each exercise, one message per car.
+        The bot then loads that scenario, starts over instead of being restarted and replies, so the exercise only
+        starts once all bots are ready.
+        """
+        if self.matchcomms_root is None:
+            return
+        incoming = self.matchcomms.incoming_broadcast
+        while not incoming.empty():
+            message = incoming.get_nowait()
+            if not isinstance(message, dict) or message.get('scenario_cache') is None \
+                    or message.get('car_id') != self.car_id:
+                continue
+            # the cache is unpickled, so it has to come from the private directory of the runner
+            if os.path.dirname(os.path.abspath(message['scenario_cache'])) != self.scenario_cache_directory:
+                continue
+            # a resent briefing is only answered again
+            if get_reply_id(message) != self.briefing_id:
+                self.finish_log()
+                self.use_scenario(read_scenario_cache(message['scenario_cache']), message['results_path'])
+                self.active_sequence = None
+                self.briefing_id = get_reply_id(message)
+            reply_to(self.matchcomms, message)
+
+    def finish_log(self):
+        """
+        Dumps the log of the current scenario and waits until the writer thread of the recorder has written and
+        converted it. The writer is a daemon thread, it would die with the bot and leave the log incomplete.
+        """
+        if self.logger is None:
+            return
+        if not self.logger.was_dumped:
+            self.logger.dump()
+        self.logger.join()
+
+    def retire(self):
+        self.finish_log()
+
+    @property
+    def car_id(self) -> str:
+        return self.name.split('_')[1]
+
+    def use_scenario(self, scenario: Scenario, results_path):
+        self.scenario = scenario
+        self.game_object = scenario.car(self.car_id)
+        self.log_path = os.path.join(results_path, self.scenario.name + '.json')
+
     def load_config(self, config_object_header):
-        settings_path = config_object_header['settings'].value
-        with open(settings_path) as settings_file:
-            settings = json.load(settings_file, object_hook=JSONObject)
-            with open(settings.path_to_settings) as scenario_settings_file:
-                scenario_settings = json.load(scenario_settings_file, object_hook=JSONObject)
-                with open(os.path.join(scenario_settings.szenario_path, scenario_settings.file_name)) as scenario_file:
-                    self.scenario = json.load(scenario_file, object_hook=JSONObject)
-                    car_id = self.name.split('_')[1]
-                    self.game_object = list(filter(lambda go: go.id == car_id, self.scenario.gameObjects))[0]
-                    self.log_path = os.path.join(scenario_settings.results_path_rl_bot, self.scenario.name + '.json')
+        scenario_cache = config_object_header['scenario_cache'].value
+        if scenario_cache:
+            # The runner already parsed the scenario
+            self.scenario_cache_directory = os.path.dirname(os.path.abspath(scenario_cache))
+            self.use_scenario(read_scenario_cache(scenario_cache), config_object_header['results_path'].value)
+        else:
+            settings_path = config_object_header['settings'].value
+            with open(settings_path) as settings_file:
+                settings = json.load(settings_file, object_hook=JSONObject)
+                with open(settings.path_to_settings) as scenario_settings_file:
+                    scenario_settings = json.load(scenario_settings_file, object_hook=JSONObject)
+                    scenario_path = os.path.join(scenario_settings.szenario_path, scenario_settings.file_name)
+                    self.use_scenario(load_scenario(scenario_path), scenario_settings.results_path_rl_bot)
         self.lead = config_object_header['lead'].value
 
     @staticmethod
     def create_agent_configurations(config: ConfigObject):
         params = config.get_header(BOT_CONFIG_AGENT_HEADER)
         params.add_value('settings', str, default=None, description='Settings file that points to scenario settings')
+        params.add_value('scenario_cache', str, default=None,
+                         description='Scenario cache file written by the test runner, replaces the settings')
+        params.add_value('results_path', str, default=None,
+                         description='Directory for the log if the scenario cache is used')
         params.add_value('lead', bool, default=True, description='Determines if the bot is the leading bot in the '
                                                                  'test scenario responsible for logging')
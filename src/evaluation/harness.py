@@ -0,0 +1,227 @@
+import argparse
+import os
+import time
+import traceback
+from dataclasses import dataclass
+from pathlib import Path
+from random import Random
+from typing import Callable, Iterator, List, Optional, Sequence
+
+import rlbottraining.exercise_runner as er
+from rlbot.matchcomms.common_uses.reply import send_and_wait_for_replies
+from rlbot.matchcomms.common_uses.set_attributes_message import make_set_attributes_message
+from rlbot.matchconfig.conversions import read_match_config_from_file
+from rlbot.matchconfig.match_config import Team, PlayerConfig
+from rlbot.utils.game_state_util import GameState
+from rlbot.utils.rendering.rendering_manager import RenderingManager
+from rlbottraining.rng import SeededRandomNumberGenerator
+from rlbottraining.training_exercise import Playlist, TrainingExercise
+
+from src.bots.model_bot import MyBot
+from src.evaluation.results import EpisodeResult, ResultsTable, ERROR, MODEL_SEED, grader_metrics, outcome_of, \
+    grade_string, format_summaries
+from src.models.onnx_model import ONNXModel
+from src.scenarios.goalie import goalie_training
+from src.scenarios.state_corpus import StateCorpus, make_replay_playlist
+from src.scenarios.striker import striker_training
+from src.simulation.headless import HeadlessSession
+
+# Seconds the briefing of an episode waits for the bot to switch its model, per try
+MODEL_SWITCH_TIMEOUT = 2.0
+
+SCENARIOS_DIRECTORY = Path(__file__).absolute().parent.parent / 'scenarios'
+
+# playlist factory, match config and bot config of the exercises that can be evaluated
+PLAYLISTS = {
+    'goalie': (goalie_training.make_default_playlist, SCENARIOS_DIRECTORY / 'goalie' / 'goalie_match.cfg',
+               SCENARIOS_DIRECTORY / 'goalie' / 'goalie_bot.cfg'),
+    'striker': (striker_training.make_default_playlist, SCENARIOS_DIRECTORY / 'striker' / 'striker_match.cfg',
+                SCENARIOS_DIRECTORY / 'striker' / 'striker_bot.cfg'),
+}
+
+
+def model_name(model_path: str) -> str:
+    return Path(model_path).stem
+
+
+@dataclass
+class EvaluationExercise(TrainingExercise):
+    """
+    One episode of a model evaluation: runs the wrapped exercise with the model at model_path and the starting state
+    of seed, whatever seed the runner uses, so the episodes of one playlist run can have different seeds.
+    In the game the model bot is told to switch to the model over matchcomms in the briefing.
+    """
+    exercise: Optional[TrainingExercise] = None
+    model_path: str = None
+    episode: int = 0
+    seed: int = 0
+
+    def on_briefing(self):
+        # blocks until the bot uses the model, loading it for the first time takes a moment
+        message = make_set_attributes_message(0, {'model_path': self.model_path})
+        send_and_wait_for_replies(self.get_matchcomms(), [message], timeout_seconds=MODEL_SWITCH_TIMEOUT)
+        # the runner only gives the factory to the exercise it runs
+        self.exercise.matchcomms_factory = self.matchcomms_factory
+        return self.exercise.on_briefing()
+
+    def render(self, renderer: RenderingManager):
+        self.exercise.render(renderer)
+
+    def make_game_state(self, rng: SeededRandomNumberGenerator) -> GameState:
+        # seeded like rlbottraining seeds the exercises of a playlist
+        rng = Random()
+        rng.seed(self.seed)
+        return self.exercise.make_game_state(SeededRandomNumberGenerator(rng))
+
+
+class ModelEvaluation:
+    """
+    Evaluates ONNX models on the exercises of a playlist, episodes_per_model times each. The episodes of the models
+    are interleaved: episode i of every model runs before episode i + 1 of any model, all on the same starting states,
+    so one session serves all models and stopping early still leaves comparable results.
+    Episode i uses seed first_seed + i, or row i of the corpus if one is given, see StateCorpus.
+    """
+
+    def __init__(self, model_paths: Sequence[str], make_playlist: Callable[[], Playlist], episodes_per_model: int,
+                 corpus: StateCorpus = None, first_seed: int = 0):
+        self.model_paths = [os.path.abspath(path) for path in model_paths]
+        self.make_playlist = make_playlist
+        self.episodes_per_model = episodes_per_model
+        self.corpus = corpus
+        self.first_seed = first_seed
+
+    def _exercises(self, episode: int) -> Playlist:
+        if self.corpus is None:
+            return self.make_playlist()
+        return make_replay_playlist(self.corpus, self.make_playlist, [episode])
+
+    def _seed(self, episode: int) -> int:
+        return int(self.corpus.seeds[episode]) if self.corpus is not None else self.first_seed + episode
+
+    def playlist(self, match_config=None) -> Iterator[EvaluationExercise]:
+        """Yields the episodes in the order they run, with fresh exercises and graders."""
+        for episode in range(self.episodes_per_model):
+            for model_path in self.model_paths:
+                for exercise in self._exercises(episode):
+                    yield EvaluationExercise(
+                        name=exercise.name,
+                        grader=exercise.grader,
+                        match_config=match_config or exercise.match_config,
+                        exercise=exercise,
+                        model_path=model_path,
+                        episode=episode,
+                        seed=self._seed(episode),
+                    )
+
+    def run_headless(self, table: ResultsTable = None, tick_rate: float = 120,
+                     max_game_seconds: float = 60) -> ResultsTable:
+        """
+        Runs all episodes on the headless Simulator with a model bot, see HeadlessSession. The fresh bot of each
+        episode loads its model with MODEL_SEED, so the random state of a model that samples its actions does not
+        carry over from the episodes before. Exceptions of a model are recorded as errors.
+        """
+        table = table if table is not None else ResultsTable()
+        current = [None]
+
+        def make_bots():
+            bot = MyBot('PGBot', 0, 0)
+            bot.switch_model(current[0], ONNXModel(current[0], MODEL_SEED))
+            return [bot]
+
+        session = HeadlessSession(make_bots, tick_rate, max_game_seconds)
+        for exercise in self.playlist():
+            current[0] = exercise.model_path
+            start = time.perf_counter()
+            try:
+                result = session.run(exercise, exercise.seed)
+            except Exception:
+                table.add(_error_result(exercise, traceback.format_exc(), time.perf_counter() - start))
+                continue
+            table.add(EpisodeResult(
+                model=model_name(exercise.model_path),
+                exercise=exercise.name,
+                episode=exercise.episode,
+                seed=exercise.seed,
+                outcome=outcome_of(result.grade),
+                grade=grade_string(result.grade),
+                ticks=result.ticks,
+                seconds_to_result=result.game_seconds if result.grade is not None else None,
+                wall_seconds=result.wall_seconds,
+                metrics=grader_metrics(exercise.grader),
+            ))
+        return table
+
+    def run_in_game(self, match_config_path: Path, bot_config_path: Path, table: ResultsTable = None) -> ResultsTable:
+        """
+        Runs all episodes in one match of the game. The bot of bot_config_path has to be the model bot, it switches
+        its model when it receives the briefing of an episode. It is not reloaded between the episodes, so it loads
+        every model only once. The time to the result is the duration the timeout graders measured.
+        """
+        table = table if table is not None else ResultsTable()
+        match_config = read_match_config_from_file(match_config_path)
+        match_config.player_configs = [PlayerConfig.bot_config(bot_config_path, Team.BLUE)]
+        with er.setup_manager_context() as setup_manager:
+            er.apply_render_policy(er.RenderPolicy.DEFAULT, setup_manager)
+            exercises = [er.TrainingExerciseAdapter(exercise) for exercise in self.playlist(match_config)]
+            start = time.perf_counter()
+            # the episodes pick their own starting states, the seed of the runner is not used
+            for result in er.rlbot_run_exercises(setup_manager, exercises, 0, reload_agent=False):
+                # unwrap the TrainingExerciseAdapter
+                exercise: EvaluationExercise = result.exercise.exercise
+                metrics = grader_metrics(exercise.grader)
+                timeout = metrics.get('TimeoutMetric')
+                table.add(EpisodeResult(
+                    model=model_name(exercise.model_path),
+                    exercise=exercise.name,
+                    episode=exercise.episode,
+                    seed=exercise.seed,
+                    outcome=outcome_of(result.grade),
+                    grade=grade_string(result.grade),
+                    ticks=None,
+                    seconds_to_result=timeout['measured_duration_seconds'] if timeout else None,
+                    wall_seconds=time.perf_counter() - start,
+                    metrics=metrics,
+                ))
+                start = time.perf_counter()
+        return table
+
+
+def _error_result(exercise: EvaluationExercise, traceback_string: str, wall_seconds: float) -> EpisodeResult:
+    return EpisodeResult(
+        model=model_name(exercise.model_path),
+        exercise=exercise.name,
+        episode=exercise.episode,
+        seed=exercise.seed,
+        outcome=ERROR,
+        grade=traceback_string.strip().splitlines()[-1],
+        ticks=None,
+        seconds_to_result=None,
+        wall_seconds=wall_seconds,
+    )
+
+
+def main(args: List[str] = None):
+    parser = argparse.ArgumentParser(description='Evaluates ONNX models on the goalie or striker exercises.')
+    parser.add_argument('models', nargs='+', help='paths of the ONNX models')
+    parser.add_argument('--playlist', choices=sorted(PLAYLISTS), default='goalie')
+    parser.add_argument('--episodes', type=int, default=50, help='episodes per model')
+    parser.add_argument('--first-seed', type=int, default=0)
+    parser.add_argument('--corpus', help='StateCorpus file to take the starting states from instead of the seeds')
+    parser.add_argument('--csv', help='file to stream the results into')
+    parser.add_argument('--game', action='store_true', help='run in the game instead of the headless simulator')
+    parser.add_argument('--by-exercise', action='store_true', help='summarize per exercise too')
+    args = parser.parse_args(args)
+
+    make_playlist, match_config_path, bot_config_path = PLAYLISTS[args.playlist]
+    corpus = StateCorpus.load(args.corpus) if args.corpus else None
+    evaluation = ModelEvaluation(args.models, make_playlist, args.episodes, corpus, args.first_seed)
+    with ResultsTable(args.csv) as table:
+        if args.game:
+            evaluation.run_in_game(match_config_path, bot_config_path, table)
+        else:
+            evaluation.run_headless(table)
+    print(format_summaries(table.summaries(args.by_exercise)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,288 @@
+import argparse
+import multiprocessing
+import os
+import time
+import traceback
+from dataclasses import dataclass, field
+from multiprocessing.connection import Connection, wait
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Type
+
+from rlbot.agents.base_agent import BaseAgent
+from rlbottraining.training_exercise import Playlist
+
+from src.evaluation.results import EpisodeResult, ResultsTable, ERROR, MODEL_SEED, grader_metrics, outcome_of, \
+    grade_string, format_summaries
+from src.models.onnx_model import ONNXModel
+from src.simulation.headless import HeadlessSession
+
+# Seconds the coordinator waits for a result before it checks that its workers are alive
+POLL_SECONDS = 0.1
+
+
+@dataclass
+class BotFactory:
+    """
+    Creates the bot of an episode in a worker process, for HeadlessSession. Unlike a lambda it can be sent to the
+    workers. Model bots load the model at model_path with MODEL_SEED for every episode: the models sample their
+    actions and the random state of a shared model would make the results depend on the episodes run before.
+    """
+    bot_class: Type[BaseAgent]
+    model_path: Optional[str] = None
+    name: str = 'PGBot'
+
+    def __call__(self) -> List[BaseAgent]:
+        bot = self.bot_class(self.name, 0, 0)
+        if self.model_path is not None:
+            bot.switch_model(self.model_path, ONNXModel(self.model_path, MODEL_SEED))
+        return [bot]
+
+
+class Task(NamedTuple):
+    # position of the episode in the deterministic order of the results
+    index: int
+    label: str
+    exercise_index: int
+    episode: int
+    seed: int
+    attempt: int
+
+
+@dataclass
+class RunStats:
+    episodes: int = 0
+    # episodes that were run again because their worker crashed or timed out
+    retries: int = 0
+    crashed_workers: int = 0
+    wall_seconds: float = 0.0
+    game_seconds: float = 0.0
+    episodes_per_worker: Dict[int, int] = field(default_factory=dict)
+
+    @property
+    def episodes_per_minute(self) -> float:
+        return self.episodes / self.wall_seconds * 60 if self.wall_seconds > 0 else 0.0
+
+    @property
+    def real_time_factor(self) -> float:
+        return self.game_seconds / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    def report(self) -> str:
+        workers = ', '.join(f'{n}' for _, n in sorted(self.episodes_per_worker.items()))
+        return (f'{self.episodes} episodes in {self.wall_seconds:.1f} s: {self.episodes_per_minute:.0f} per minute, '
+                f'{self.real_time_factor:.1f}x real time, {self.retries} retries, {self.crashed_workers} crashed '
+                f'workers, episodes per worker: {workers}')
+
+
+class ParallelRunner:
+    """
+    Runs the exercises of a playlist for a range of seeds on num_workers processes with a HeadlessSession each. The
+    coordinator hands out one episode at a time to idle workers and collects the results centrally. An episode runs
+    on a fresh simulator with fresh bots (see HeadlessSession), so its result only depends on the exercise, the seed
+    and the bots, never on the worker or on the number of workers.
+    A worker that dies or does not finish an episode within episode_timeout seconds is replaced, its episode is run
+    again up to max_retries times and then recorded as an error. A worker that dies between episodes is replaced
+    before it gets the next one, without a retry. Exceptions raised by an episode are recorded as errors right away,
+    running it again would raise them again.
+    make_playlist and the bot factories are sent to the workers, so they have to be picklable: module level
+    functions or classes like BotFactory, not lambdas.
+    """
+
+    def __init__(self, make_playlist: Callable[[], Playlist], bots: Dict[str, Callable[[], List[BaseAgent]]],
+                 num_workers: int = None, tick_rate: float = 120, max_game_seconds: float = 60,
+                 max_retries: int = 2, episode_timeout: float = 600, start_method: str = 'spawn'):
+        self.make_playlist = make_playlist
+        self.bots = bots
+        self.num_workers = num_workers or os.cpu_count()
+        self.session_options = dict(tick_rate=tick_rate, max_game_seconds=max_game_seconds)
+        self.max_retries = max_retries
+        self.episode_timeout = episode_timeout
+        self.context = multiprocessing.get_context(start_method)
+        self.stats = RunStats()
+
+    def tasks(self, seeds: Sequence[int]) -> List[Task]:
+        """The episodes in the order of the results: by seed, then by bots, then by exercise."""
+        num_exercises = len(list(self.make_playlist()))
+        tasks = []
+        for episode, seed in enumerate(seeds):
+            for label in self.bots:
+                for exercise_index in range(num_exercises):
+                    tasks.append(Task(len(tasks), label, exercise_index, episode, seed, 0))
+        return tasks
+
+    def run(self, seeds: Sequence[int], table: ResultsTable = None) -> ResultsTable:
+        """
+        Runs all episodes and adds their results to the table in the order of tasks(), each as soon as all results
+        before it have arrived.
+        """
+        table = table if table is not None else ResultsTable()
+        exercise_names = [exercise.name for exercise in self.make_playlist()]
+        pending = self.tasks(seeds)
+        pending.reverse()
+        results: Dict[int, EpisodeResult] = {}
+        next_index = 0
+        num_tasks = len(pending)
+        self.stats = stats = RunStats()
+        workers: Dict[int, _Worker] = {}
+        start = time.perf_counter()
+        try:
+            for worker_id in range(min(self.num_workers, num_tasks)):
+                workers[worker_id] = self._start_worker(worker_id)
+            while next_index < num_tasks:
+                for worker_id, worker in list(workers.items()):
+                    if worker.task is None and pending:
+                        if not worker.process.is_alive():
+                            # the worker died between episodes, none of them is retried for it
+                            stats.crashed_workers += 1
+                            worker.stop()
+                            worker = workers[worker_id] = self._start_worker(worker_id)
+                        worker.assign(pending.pop())
+                for connection in wait([w.results for w in workers.values() if not w.results.closed], POLL_SECONDS):
+                    try:
+                        worker_id, index, result = connection.recv()
+                    except (EOFError, OSError):
+                        # the worker died, maybe in the middle of a result, it is replaced below
+                        connection.close()
+                        continue
+                    worker = workers[worker_id]
+                    if worker.task is not None and worker.task.index == index:
+                        worker.task = None
+                        results[index] = result
+                        stats.episodes += 1
+                        stats.episodes_per_worker[worker_id] = stats.episodes_per_worker.get(worker_id, 0) + 1
+                        if result.outcome != ERROR and result.ticks is not None:
+                            stats.game_seconds += result.ticks / self.session_options['tick_rate']
+                for worker_id, worker in list(workers.items()):
+                    if worker.task is not None and not worker.is_healthy(self.episode_timeout):
+                        stats.crashed_workers += 1
+                        task = worker.task
+                        reason = 'timed out' if worker.process.is_alive() else \
+                            f'crashed with exit code {worker.process.exitcode}'
+                        worker.stop()
+                        if task.attempt < self.max_retries:
+                            stats.retries += 1
+                            pending.append(task._replace(attempt=task.attempt + 1))
+                        else:
+                            results[task.index] = _error_result(
+                                task, exercise_names[task.exercise_index],
+                                f'the worker {reason} in all {task.attempt + 1} attempts', 0.0)
+                            stats.episodes += 1
+                        workers[worker_id] = self._start_worker(worker_id)
+                while next_index in results:
+                    table.add(results.pop(next_index))
+                    next_index += 1
+        finally:
+            for worker in workers.values():
+                worker.stop()
+            stats.wall_seconds = time.perf_counter() - start
+        return table
+
+    def _start_worker(self, worker_id: int) -> '_Worker':
+        tasks = self.context.Queue()
+        results, worker_results = self.context.Pipe(duplex=False)
+        process = self.context.Process(
+            target=_work, daemon=True,
+            args=(worker_id, self.make_playlist, self.bots, self.session_options, tasks, worker_results))
+        process.start()
+        # only the worker writes, so the coordinator reads the end of the pipe when the worker dies
+        worker_results.close()
+        return _Worker(process, tasks, results)
+
+
+class _Worker:
+    """
+    A worker process of the ParallelRunner and the episode it is running. Every worker sends its results through a
+    pipe of its own: terminating a worker in the middle of a result only breaks its own pipe, which is dropped with it,
+    while a shared queue would be left corrupted for all other workers.
+    """
+
+    def __init__(self, process, tasks, results: Connection):
+        self.process = process
+        self.tasks = tasks
+        self.results = results
+        self.task: Optional[Task] = None
+        self.task_start = 0.0
+
+    def assign(self, task: Task):
+        self.task = task
+        self.task_start = time.perf_counter()
+        self.tasks.put(task)
+
+    def is_healthy(self, timeout: float) -> bool:
+        return self.process.is_alive() and time.perf_counter() - self.task_start < timeout
+
+    def stop(self):
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join()
+        self.results.close()
+
+
+def _work(worker_id: int, make_playlist, bots, session_options, tasks, results: Connection):
+    sessions = {label: HeadlessSession(make_bots, **session_options) for label, make_bots in bots.items()}
+    while True:
+        task: Task = tasks.get()
+        exercise = list(make_playlist())[task.exercise_index]
+        start = time.perf_counter()
+        try:
+            result = sessions[task.label].run(exercise, task.seed)
+        except Exception:
+            results.send((worker_id, task.index, _error_result(task, exercise.name, traceback.format_exc(),
+                                                              time.perf_counter() - start)))
+            continue
+        results.send((worker_id, task.index, EpisodeResult(
+            model=task.label,
+            exercise=exercise.name,
+            episode=task.episode,
+            seed=task.seed,
+            outcome=outcome_of(result.grade),
+            grade=grade_string(result.grade),
+            ticks=result.ticks,
+            seconds_to_result=result.game_seconds if result.grade is not None else None,
+            wall_seconds=result.wall_seconds,
+            metrics=grader_metrics(exercise.grader),
+        )))
+
+
+def _error_result(task: Task, exercise_name: str, error: str, wall_seconds: float) -> EpisodeResult:
+    return EpisodeResult(
+        model=task.label,
+        exercise=exercise_name,
+        episode=task.episode,
+        seed=task.seed,
+        outcome=ERROR,
+        grade=error.strip().splitlines()[-1],
+        ticks=None,
+        seconds_to_result=None,
+        wall_seconds=wall_seconds,
+    )
+
+
+def main(args: List[str] = None):
+    # imported here, the harness imports the runner of the game which the workers do not need
+    from src.bots import bot, model_bot
+    from src.evaluation.harness import PLAYLISTS, model_name
+
+    parser = argparse.ArgumentParser(description='Runs the goalie or striker exercises for a range of seeds on '
+                                                 'several headless workers.')
+    parser.add_argument('--playlist', choices=sorted(PLAYLISTS), default='goalie')
+    parser.add_argument('--seeds', type=int, default=1000, help='number of seeds, starting at --first-seed')
+    parser.add_argument('--first-seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--model', action='append', default=[],
+                        help='ONNX model of a model bot, can be given more than once, the scripted bot without')
+    parser.add_argument('--max-game-seconds', type=float, default=60)
+    parser.add_argument('--csv', help='file to stream the results into')
+    args = parser.parse_args(args)
+
+    if args.model:
+        bots = {model_name(path): BotFactory(model_bot.MyBot, os.path.abspath(path)) for path in args.model}
+    else:
+        bots = {'MyBot': BotFactory(bot.MyBot)}
+    runner = ParallelRunner(PLAYLISTS[args.playlist][0], bots, args.workers, max_game_seconds=args.max_game_seconds)
+    with ResultsTable(args.csv) as table:
+        runner.run(range(args.first_seed, args.first_seed + args.seeds), table)
+    print(format_summaries(table.summaries()))
+    print(runner.stats.report())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+import csv
+import json
+import math
+from dataclasses import dataclass, field, fields, astuple
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from rlbot.training.training import Grade, Pass, FailDueToExerciseException
+from rlbottraining.common_graders.compound_grader import CompoundGrader
+from rlbottraining.grading.grader import Grader
+
+PASS = 'pass'
+FAIL = 'fail'
+# the grader did not decide within the time limit of the run
+UNDECIDED = 'undecided'
+# the bot or the exercise raised an exception, these episodes do not count towards the pass rate
+ERROR = 'error'
+
+# z of the two sided 95% confidence interval
+Z_95 = 1.959964
+
+TIME_QUANTILES = (0.1, 0.5, 0.9)
+
+# seed of the models that sample their actions, loaded anew for every episode so the results are reproducible
+MODEL_SEED = 0
+
+
+@dataclass
+class EpisodeResult:
+    model: str
+    exercise: str
+    episode: int
+    seed: int
+    outcome: str
+    grade: str
+    # ticks and game seconds until the grader decided, None if unknown
+    ticks: Optional[int]
+    seconds_to_result: Optional[float]
+    wall_seconds: float
+    # the metrics of the graders by class name, see grader_metrics
+    metrics: Dict[str, Any] = field(default_factory=dict)
+
+
+def outcome_of(grade: Optional[Grade]) -> str:
+    if grade is None:
+        return UNDECIDED
+    # the runner of the game reports exceptions of the exercise as a Fail, they are not the model's
+    if isinstance(grade, FailDueToExerciseException):
+        return ERROR
+    return PASS if isinstance(grade, Pass) else FAIL
+
+
+def grade_string(grade: Optional[Grade]) -> str:
+    """The repr of the grade, for exceptions of the exercise only the last line of the traceback, like for errors."""
+    if isinstance(grade, FailDueToExerciseException):
+        return grade.traceback_string.strip().splitlines()[-1]
+    return repr(grade)
+
+
+def grader_metrics(grader: Grader) -> Dict[str, Any]:
+    """
+    Collects the metrics of a grader and of the graders in a CompoundGrader, e.g. FailOnTimeout.TimeoutMetric, as
+    JSON-like dicts by the class name of the metric.
+    """
+    metrics = {}
+    graders = [grader]
+    while graders:
+        grader = graders.pop(0)
+        if isinstance(grader, CompoundGrader):
+            graders.extend(grader.graders)
+        elif hasattr(grader, 'get_metric'):
+            metric = grader.get_metric()
+            if metric is not None:
+                metrics[type(metric).__name__] = metric.to_json()
+    return metrics
+
+
+def wilson_interval(successes: int, trials: int, z: float = Z_95) -> Tuple[float, float]:
+    """
+    Wilson score interval of a success rate, which stays inside [0, 1] and is sensible for few trials and for rates
+    close to 0 or 1, unlike the normal approximation.
+    """
+    if trials == 0:
+        return 0.0, 1.0
+    rate = successes / trials
+    denominator = 1 + z * z / trials
+    center = (rate + z * z / (2 * trials)) / denominator
+    half_width = z * math.sqrt(rate * (1 - rate) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(0.0, center - half_width), min(1.0, center + half_width)
+
+
+@dataclass
+class ModelSummary:
+    model: str
+    # None for the summary over all exercises
+    exercise: Optional[str]
+    episodes: int
+    passes: int
+    fails: int
+    undecided: int
+    errors: int
+    pass_rate: float
+    pass_rate_low: float
+    pass_rate_high: float
+    # game seconds until the result at the TIME_QUANTILES, per outcome, None without results of that outcome
+    pass_seconds: Optional[Tuple[float, ...]]
+    fail_seconds: Optional[Tuple[float, ...]]
+
+    @staticmethod
+    def of(model: str, exercise: Optional[str], results: List[EpisodeResult]) -> 'ModelSummary':
+        outcomes = [result.outcome for result in results]
+        passes = outcomes.count(PASS)
+        errors = outcomes.count(ERROR)
+        graded = len(results) - errors
+        low, high = wilson_interval(passes, graded)
+        return ModelSummary(
+            model=model,
+            exercise=exercise,
+            episodes=len(results),
+            passes=passes,
+            fails=outcomes.count(FAIL),
+            undecided=outcomes.count(UNDECIDED),
+            errors=errors,
+            pass_rate=passes / graded if graded else float('nan'),
+            pass_rate_low=low,
+            pass_rate_high=high,
+            pass_seconds=_time_quantiles(results, PASS),
+            fail_seconds=_time_quantiles(results, FAIL),
+        )
+
+
+def _time_quantiles(results: List[EpisodeResult], outcome: str) -> Optional[Tuple[float, ...]]:
+    seconds = [r.seconds_to_result for r in results if r.outcome == outcome and r.seconds_to_result is not None]
+    if not seconds:
+        return None
+    return tuple(np.quantile(seconds, TIME_QUANTILES).tolist())
+
+
+class ResultsTable:
+    """
+    The results of an evaluation, one row per episode. Rows are also streamed into a CSV file if a path is given,
+    the file is flushed after every row so it can be followed while the evaluation runs.
+    """
+
+    COLUMNS = [f.name for f in fields(EpisodeResult)]
+
+    def __init__(self, csv_path: str = None):
+        self.rows: List[EpisodeResult] = []
+        self._csv_file = None
+        self._csv_writer = None
+        if csv_path is not None:
+            self._csv_file = open(csv_path, 'w', newline='')
+            self._csv_writer = csv.writer(self._csv_file)
+            self._csv_writer.writerow(self.COLUMNS)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def add(self, result: EpisodeResult):
+        self.rows.append(result)
+        if self._csv_writer is not None:
+            row = list(astuple(result))
+            row[-1] = json.dumps(result.metrics, sort_keys=True)
+            self._csv_writer.writerow(row)
+            self._csv_file.flush()
+
+    def close(self):
+        if self._csv_file is not None:
+            self._csv_file.close()
+            self._csv_file = self._csv_writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def summaries(self, by_exercise: bool = False) -> List[ModelSummary]:
+        """Summaries per model, in the order the models first appear, and optionally per exercise too."""
+        groups: Dict[Tuple[str, Optional[str]], List[EpisodeResult]] = {}
+        for result in self.rows:
+            groups.setdefault((result.model, result.exercise if by_exercise else None), []).append(result)
+        return [ModelSummary.of(model, exercise, results) for (model, exercise), results in groups.items()]
+
+
+def format_summaries(summaries: List[ModelSummary]) -> str:
+    def seconds(quantiles):
+        return ' / '.join(f'{s:5.2f}' for s in quantiles) if quantiles is not None else '-'
+
+    def rate(s: ModelSummary):
+        if s.passes + s.fails + s.undecided == 0:
+            return '-'
+        return f'{s.pass_rate:5.1%} [{s.pass_rate_low:5.1%}, {s.pass_rate_high:5.1%}]'
+
+    quantile_names = ' / '.join(f'p{q * 100:.0f}' for q in TIME_QUANTILES)
+    lines = [f'{"model":<24} {"exercise":<22} {"n":>5} {"pass":>5} {"fail":>5} {"undec.":>6} {"err":>4} '
+             f'{"pass rate [95% CI]":<22} {"s to pass (" + quantile_names + ")":<28} s to fail']
+    for s in summaries:
+        lines.append(f'{s.model:<24} {s.exercise or "all":<22} {s.episodes:>5} {s.passes:>5} {s.fails:>5} '
+                     f'{s.undecided:>6} {s.errors:>4} {rate(s):<22} {seconds(s.pass_seconds):<28} '
+                     f'{seconds(s.fail_seconds)}')
+    return '\n'.join(lines)
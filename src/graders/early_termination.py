@@ -0,0 +1,180 @@
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import numpy as np
+from rlbot.training.training import Pass, Fail, Grade
+from rlbot.utils.structures.ball_prediction_struct import BallPrediction
+from rlbottraining.common_graders.compound_grader import CompoundGrader
+from rlbottraining.grading.grader import Grader, TrainingTickPacket
+from rlbottraining.history.metric import Metric
+
+from src.utils.ball_prediction_analysis import BallPredictionArray
+from src.utils.intercept import MAX_CAR_SPEED, HIT_RADIUS
+
+# Seconds between two checks at least, each check predicts the ball
+DEFAULT_CHECK_INTERVAL = 4 / 120
+# Change of the ball velocity in uu/s from one tick to the next above which the ball was touched (or bounced)
+TOUCH_SPEED_CHANGE = 100.0
+
+
+class PredictedPass(Pass):
+    def __init__(self, reason: str):
+        self.reason = reason
+
+    def __repr__(self):
+        return f'{super().__repr__()}: Predicted: {self.reason}'
+
+
+class PredictedFail(Fail):
+    def __init__(self, reason: str):
+        self.reason = reason
+
+    def __repr__(self):
+        return f'{super().__repr__()}: Predicted: {self.reason}'
+
+
+class EarlyTerminationGrader(Grader):
+    """
+    Ends an exercise as soon as its outcome is certain, instead of waiting for the goal or the timeout. The outcome is
+    certain when no car can touch the ball anymore before it decides: the ball prediction enters a goal before the
+    timeout, which passes a goal for ally_team and fails the other one, or the prediction covers the time until the
+    timeout without a goal, which gives the timeout grade (a Pass if timeout_passes).
+    A car can touch the ball if it gets within reach_radius of a slice by the slice's time, driving straight at
+    reach_speed. The defaults are the top speed of a car and the reach of a hit, so the check errs on the side of
+    letting the exercise run.
+    Predicting the ball costs more than a tick of the simulator, so a check is skipped while the previous one still
+    holds: a car with a margin of m seconds to the ball cannot lose it within m / 2 seconds, and without a goal in the
+    prediction nothing is decided before the prediction covers the timeout. Both only hold as long as the ball follows
+    the prediction, so a tick on which the velocity of the ball jumps is checked. Skipped checks can only delay a
+    decision.
+    Meant to be combined with the graders of an exercise (see StrikerGrader and GoalieGrader), whose own decisions
+    come first. Only the ball is predicted, so if one of them can still fail the exercise without a touch, e.g.
+    FailOnBallPassingStriker which watches the car, predicted passes are left to the graders with decide_passes=False.
+    It needs a ball prediction source, the HeadlessSession sets the one of the simulator, in the game call
+    use_ball_prediction with game_ball_prediction(game_interface). Without one it never decides.
+    """
+
+    def __init__(self, ally_team: int, timeout_seconds: float, timeout_passes: bool,
+                 reach_speed: float = MAX_CAR_SPEED, reach_radius: float = HIT_RADIUS,
+                 check_interval: float = DEFAULT_CHECK_INTERVAL, decide_passes: bool = True):
+        self.ally_team = ally_team
+        self.timeout_seconds = timeout_seconds
+        self.timeout_passes = timeout_passes
+        self.decide_passes = decide_passes
+        self.reach_speed = reach_speed
+        self.reach_radius = reach_radius
+        self.check_interval = check_interval
+        self.ball_prediction_source: Callable[[], BallPrediction] = None
+        self.prediction = BallPredictionArray()
+        self.initial_seconds_elapsed: float = None
+        self.next_check_seconds: float = None
+        self.num_checks = 0
+        self._ball_velocity = (0.0, 0.0, 0.0)
+        # seconds after the start at which the grader decided and at which the predicted outcome happens
+        self.decided_seconds: float = None
+        self.predicted_result_seconds: float = None
+
+    def use_ball_prediction(self, source: Callable[[], BallPrediction]):
+        self.ball_prediction_source = source
+
+    def on_tick(self, tick: TrainingTickPacket) -> Optional[Grade]:
+        packet = tick.game_tick_packet
+        now = packet.game_info.seconds_elapsed
+        if self.initial_seconds_elapsed is None:
+            self.initial_seconds_elapsed = self.next_check_seconds = now
+        touched = self._ball_velocity_jumped(packet)
+        if self.ball_prediction_source is None or (now < self.next_check_seconds and not touched):
+            return None
+        self.next_check_seconds = now + self.check_interval
+        self.num_checks += 1
+        prediction = self.prediction.update(self.ball_prediction_source())
+        if prediction.num_slices == 0:
+            return None
+        deadline = self.initial_seconds_elapsed + self.timeout_seconds
+
+        goal = prediction.find_goal()
+        scores = goal is not None and goal.time <= deadline
+        # without a goal the prediction has to cover the time until the timeout to be sure there is none
+        if not scores and prediction.time[-1] < deadline:
+            horizon = prediction.time[-1] - prediction.time[0]
+            self.next_check_seconds = max(self.next_check_seconds, deadline - horizon)
+            return None
+        decided_by = goal.time if scores else deadline
+        margin = self._touch_margin(packet, now, decided_by)
+        if margin >= 0:
+            self.next_check_seconds = max(self.next_check_seconds, now + margin / 2)
+            return None
+        passes = goal.team != self.ally_team if scores else self.timeout_passes
+        if passes and not self.decide_passes:
+            # nothing changes until the predicted outcome, unless the ball leaves the prediction
+            self.next_check_seconds = decided_by
+            return None
+
+        self.decided_seconds = now - self.initial_seconds_elapsed
+        self.predicted_result_seconds = decided_by - self.initial_seconds_elapsed
+        if scores:
+            # the ball enters the goal of goal.team
+            if passes:
+                return PredictedPass('Goal for the ally team without a touch.')
+            return PredictedFail('Goal for the other team without a touch.')
+        if passes:
+            return PredictedPass('No goal and no touch until the timeout.')
+        return PredictedFail('No goal and no touch until the timeout.')
+
+    def _ball_velocity_jumped(self, packet) -> bool:
+        velocity = packet.game_ball.physics.velocity
+        last_x, last_y, last_z = self._ball_velocity
+        self._ball_velocity = velocity.x, velocity.y, velocity.z
+        return (velocity.x - last_x) ** 2 + (velocity.y - last_y) ** 2 + (velocity.z - last_z) ** 2 > \
+            TOUCH_SPEED_CHANGE ** 2
+
+    def _touch_margin(self, packet, now: float, until: float) -> float:
+        """
+        Returns the most seconds a car has to spare to touch the ball by until, negative if no car can touch it.
+        """
+        prediction = self.prediction
+        in_time = prediction.time <= until
+        if not np.any(in_time):
+            return -np.inf
+        margin = -np.inf
+        for car in packet.game_cars[:packet.num_cars]:
+            if car.is_demolished:
+                continue
+            location = car.physics.location
+            offset = prediction.location[in_time] - (location.x, location.y, location.z)
+            distance = np.sqrt(np.einsum('ij,ij->i', offset, offset)) - self.reach_radius
+            margin = max(margin, float(np.max(prediction.time[in_time] - now - distance / self.reach_speed)))
+        return margin
+
+    @dataclass(frozen=True)
+    class EarlyTerminationMetric(Metric):
+        decided_seconds: Optional[float]
+        predicted_result_seconds: Optional[float]
+        # game seconds the exercise would have run longer to the predicted outcome, 0 if it was not ended early
+        saved_seconds: float
+        # ball predictions the grader looked at
+        num_checks: int
+
+    def get_metric(self) -> Optional[Metric]:
+        saved = self.predicted_result_seconds - self.decided_seconds if self.decided_seconds is not None else 0.0
+        return EarlyTerminationGrader.EarlyTerminationMetric(self.decided_seconds, self.predicted_result_seconds,
+                                                             saved, self.num_checks)
+
+
+def game_ball_prediction(game_interface) -> Callable[[], BallPrediction]:
+    """A ball prediction source for use_ball_prediction in the game, which reads the prediction of a GameInterface."""
+    prediction = BallPrediction()
+
+    def source() -> BallPrediction:
+        game_interface.update_ball_prediction(prediction)
+        return prediction
+    return source
+
+
+def use_ball_prediction(grader: Grader, source: Callable[[], BallPrediction]):
+    """Gives the ball prediction source to all graders of grader, including those inside CompoundGraders."""
+    if isinstance(grader, CompoundGrader):
+        for child in grader.graders:
+            use_ball_prediction(child, source)
+    elif hasattr(grader, 'use_ball_prediction'):
+        grader.use_ball_prediction(source)
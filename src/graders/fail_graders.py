@@ -4,6 +4,8 @@ from typing import Optional, Union
 from dataclasses import dataclass
 from rlbottraining.history.metric import Metric
 
+from .trajectory import GradingTrajectory, TrajectoryGrade, first_run_end, first_true
+
 
 class WrongGoalFail(Fail):
     def __repr__(self):
@@ -38,6 +40,13 @@ class FailOnTimeout(Grader):
         if self.measured_duration_seconds > self.max_duration_seconds:
             return self.FailDueToTimeout(self.max_duration_seconds)
 
+    def grade_trajectory(self, trajectory: GradingTrajectory) -> Optional[TrajectoryGrade]:
+        if len(trajectory) == 0:
+            return None
+        tick = first_true(trajectory.time - trajectory.time[0] > self.max_duration_seconds)
+        if tick is not None:
+            return TrajectoryGrade(tick, self.FailDueToTimeout(self.max_duration_seconds))
+
     @dataclass(frozen=True)
     class TimeoutMetric(Metric):
         max_duration_seconds: float
@@ -71,3 +80,9 @@ class FailOnBallPassingStriker(Grader):
 
         if self.consecutive_bad_ticks >= self.REQUIRED_CONSECUTIVE_TICKS:
             return BallPassingStrikerFail()
+
+    def grade_trajectory(self, trajectory: GradingTrajectory) -> Optional[TrajectoryGrade]:
+        bad_ticks = trajectory.ball_location[:, 1] + 500 < trajectory.car_location[:, 0, 1]
+        tick = first_run_end(bad_ticks, self.REQUIRED_CONSECUTIVE_TICKS)
+        if tick is not None:
+            return TrajectoryGrade(tick, BallPassingStrikerFail())
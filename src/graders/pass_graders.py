@@ -2,7 +2,10 @@ from rlbot.training.training import Pass, Grade
 from rlbottraining.grading.grader import Grader, TrainingTickPacket
 from typing import Optional, Union
 
+import numpy as np
+
 from .fail_graders import WrongGoalFail, FailOnTimeout
+from .trajectory import GradingTrajectory, TrajectoryGrade, first_run_end, first_true
 
 
 class PassOnGoalForAllyTeam(Grader):
@@ -44,6 +47,18 @@ class PassOnGoalForAllyTeam(Grader):
         if scoring_team_id is not None:
             return Pass() if scoring_team_id == self.ally_team else WrongGoalFail()
 
+    def grade_trajectory(self, trajectory: GradingTrajectory) -> Optional[TrajectoryGrade]:
+        # The live grader re-initializes whenever a score decreases, so until it decides, the score it compares to
+        # is always the one of the previous tick. It decides on the first increase without a decrease.
+        delta = np.diff(trajectory.team_scores, axis=0)
+        tick = first_true(np.all(delta >= 0, axis=1) & np.any(delta > 0, axis=1))
+        if tick is None:
+            return None
+        scoring_teams = np.flatnonzero(delta[tick] > 0)
+        assert len(scoring_teams) == 1, "Only one team should score per tick."
+        grade = Pass() if scoring_teams[0] == self.ally_team else WrongGoalFail()
+        return TrajectoryGrade(tick + 1, grade)
+
 
 class PassOnBallGoingAwayFromGoal(Grader):
     """
@@ -72,6 +87,12 @@ class PassOnBallGoingAwayFromGoal(Grader):
         if self.consequtive_good_ticks >= self.REQUIRED_CONSECUTIVE_TICKS:
             return Pass()
 
+    def grade_trajectory(self, trajectory: GradingTrajectory) -> Optional[TrajectoryGrade]:
+        to_own_goal = 1 if self.ally_team == 0 else -1
+        tick = first_run_end(trajectory.ball_velocity[:, 1] * to_own_goal > 0, self.REQUIRED_CONSECUTIVE_TICKS)
+        if tick is not None:
+            return TrajectoryGrade(tick, Pass())
+
 
 class PassOnTimeout(FailOnTimeout):
     """Passes the exercise if we manage not to fail until here."""
@@ -87,4 +108,10 @@ class PassOnTimeout(FailOnTimeout):
         grade_maybe = super().on_tick(tick)
         if isinstance(grade_maybe, FailOnTimeout.FailDueToTimeout):
             grade_maybe = self.PassDueToTimeout(self.max_duration_seconds)
-        return grade_maybe
\ No newline at end of file
+        return grade_maybe
+
+    def grade_trajectory(self, trajectory: GradingTrajectory) -> Optional[TrajectoryGrade]:
+        result = super().grade_trajectory(trajectory)
+        if result is not None:
+            result = TrajectoryGrade(result.tick, self.PassDueToTimeout(self.max_duration_seconds))
+        return result
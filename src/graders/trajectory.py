@@ -0,0 +1,113 @@
+from dataclasses import dataclass
+from typing import Iterable, NamedTuple, Optional
+
+import numpy as np
+from rlbot.training.training import Grade
+from rlbot.utils.structures.game_data_struct import GameTickPacket
+from rlbottraining.common_graders.compound_grader import CompoundGrader, pick_more_significant_grade
+from rlbottraining.grading.grader import Grader
+
+NUM_TEAMS = 2
+
+
+@dataclass
+class GradingTrajectory:
+    """
+    The values of a run of an exercise the graders look at, one row per tick, in the Unreal units of the packet.
+    Vectors have the shape (ticks, 3), car locations (ticks, cars, 3) and team scores (ticks, NUM_TEAMS) indexed by
+    the team index.
+    """
+    time: np.ndarray
+    ball_location: np.ndarray
+    ball_velocity: np.ndarray
+    car_location: np.ndarray
+    team_scores: np.ndarray
+
+    def __len__(self):
+        return len(self.time)
+
+    @staticmethod
+    def from_packets(packets: Iterable[GameTickPacket]) -> 'GradingTrajectory':
+        time, ball_location, ball_velocity, car_location, team_scores = [], [], [], [], []
+        for packet in packets:
+            time.append(packet.game_info.seconds_elapsed)
+            ball = packet.game_ball.physics
+            ball_location.append((ball.location.x, ball.location.y, ball.location.z))
+            ball_velocity.append((ball.velocity.x, ball.velocity.y, ball.velocity.z))
+            car_location.append([(car.physics.location.x, car.physics.location.y, car.physics.location.z)
+                                 for car in packet.game_cars[:packet.num_cars]])
+            scores = [0] * NUM_TEAMS
+            for team in packet.teams[:packet.num_teams]:
+                scores[team.team_index] = team.score
+            team_scores.append(scores)
+        num_ticks = len(time)
+        return GradingTrajectory(
+            time=np.array(time, dtype=np.float64),
+            ball_location=np.array(ball_location, dtype=np.float64).reshape(num_ticks, 3),
+            ball_velocity=np.array(ball_velocity, dtype=np.float64).reshape(num_ticks, 3),
+            car_location=np.array(car_location, dtype=np.float64).reshape(num_ticks, -1, 3),
+            team_scores=np.array(team_scores, dtype=np.int64).reshape(num_ticks, NUM_TEAMS),
+        )
+
+    @staticmethod
+    def from_scenario_log(log) -> 'GradingTrajectory':
+        """
+        Creates the trajectory of a ScenarioLog (see log_reader.py). The logs are in Unity units and have no scores,
+        so goals cannot be graded from them, and their time is the wall clock time since the logger started.
+        """
+        def to_unreal(vectors: np.ndarray) -> np.ndarray:
+            # Unity (x, y, z) is Unreal (y, z, x) / 100
+            return vectors[..., [2, 0, 1]] * 100
+
+        return GradingTrajectory(
+            time=np.asarray(log.time, dtype=np.float64),
+            ball_location=to_unreal(log.ball_location),
+            ball_velocity=to_unreal(log.ball_velocity),
+            car_location=to_unreal(log.car_location),
+            team_scores=np.zeros((len(log.time), NUM_TEAMS), dtype=np.int64),
+        )
+
+
+class TrajectoryGrade(NamedTuple):
+    # index of the tick on which the grader decided
+    tick: int
+    grade: Grade
+
+
+def first_run_end(condition: np.ndarray, length: int) -> Optional[int]:
+    """
+    Returns the first index at which condition has been True for length consecutive ticks, or None. This is the tick
+    on which a live grader counting consecutive ticks reaches length.
+    """
+    index = np.arange(len(condition))
+    last_false = np.maximum.accumulate(np.where(condition, -1, index))
+    reached = np.flatnonzero(index - last_false >= length)
+    return int(reached[0]) if len(reached) else None
+
+
+def first_true(condition: np.ndarray) -> Optional[int]:
+    indices = np.flatnonzero(condition)
+    return int(indices[0]) if len(indices) else None
+
+
+def grade_trajectory(grader: Grader, trajectory: GradingTrajectory) -> Optional[TrajectoryGrade]:
+    """
+    Grades a recorded trajectory without the game. Returns the grade the grader would have returned when fed the
+    ticks one after another, and the tick it was returned on, or None if the grader did not decide. The graders of
+    this repository implement grade_trajectory with array operations, a CompoundGrader decides on the earliest tick any
+    of its graders decides on, with the most significant of their grades on that tick.
+    """
+    if isinstance(grader, CompoundGrader):
+        results = [grade_trajectory(g, trajectory) for g in grader.graders]
+        decided = [result for result in results if result is not None]
+        if not decided:
+            return None
+        tick = min(result.tick for result in decided)
+        grade = None
+        for result in decided:
+            if result.tick == tick:
+                grade = pick_more_significant_grade(grade, result.grade)
+        return TrajectoryGrade(tick, grade)
+    if not hasattr(grader, 'grade_trajectory'):
+        raise TypeError(f'{type(grader).__name__} cannot grade recorded trajectories')
+    return grader.grade_trajectory(trajectory)
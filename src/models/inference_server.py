@@ -0,0 +1,256 @@
+import argparse
+import threading
+import time
+from multiprocessing.connection import Listener, Client, Connection
+from typing import Dict, Tuple
+
+import numpy as np
+
+from src.models.onnx_model import ONNXModel
+
+DEFAULT_ADDRESS = ('localhost', 50007)
+DEFAULT_AUTHKEY = b'rlbot-inference'
+
+# Seconds a batch waits for the observations of the remaining bots before it is run with what has arrived so far.
+# At 120 ticks per second all bots of a tick should have sent their observation well within this time.
+DEFAULT_BATCH_TIMEOUT = 0.002
+
+
+def parse_address(address: str) -> Tuple[str, int]:
+    """
+    Parses an address of the form host:port as used in the bot config.
+    """
+    host, port = address.rsplit(':', 1)
+    return host, int(port)
+
+
+class InferenceError(RuntimeError):
+    """The server could not run the model on an observation, e.g. because its shape does not fit the model."""
+
+
+class _Request:
+    __slots__ = ['observation', 'result', 'error']
+
+    def __init__(self, observation: np.ndarray):
+        self.observation = observation
+        self.result: np.ndarray = None
+        self.error: Exception = None
+
+
+class ModelBatcher:
+    """
+    Gathers the observations of all bots that use the same model and runs them as one batch. A batch is run as soon
+    as every registered bot has sent its observation or when the batch timeout runs out.
+    """
+
+    def __init__(self, model: ONNXModel, batch_timeout: float = DEFAULT_BATCH_TIMEOUT):
+        self.model = model
+        self.batch_timeout = batch_timeout
+        self.num_clients = 0
+        self.num_batches = 0
+        self.num_requests = 0
+        self._pending = []
+        self._condition = threading.Condition()
+
+    def register(self):
+        with self._condition:
+            self.num_clients += 1
+
+    def unregister(self):
+        with self._condition:
+            self.num_clients -= 1
+            # the remaining bots should not wait for the one that left
+            if self._pending and len(self._pending) >= self.num_clients:
+                self._run_batch()
+
+    def run(self, observation: np.ndarray) -> np.ndarray:
+        """
+        Blocks until the batch containing the observation rows (shape (rows, observation size)) was run and returns
+        their action rows with shape (rows, action size). Raises the error of the model if the batch failed.
+        """
+        with self._condition:
+            request = _Request(observation)
+            self._pending.append(request)
+            if len(self._pending) >= self.num_clients:
+                self._run_batch()
+            deadline = time.monotonic() + self.batch_timeout
+            while request.result is None and request.error is None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._run_batch()
+                    break
+                self._condition.wait(remaining)
+            if request.error is not None:
+                raise request.error
+            return request.result
+
+    def _run_batch(self):
+        requests = self._pending
+        if not requests:
+            # another thread already ran the batch of the request
+            return
+        self._pending = []
+        try:
+            data = np.concatenate([request.observation for request in requests])
+            output = self.model.run(data)[0]
+        except Exception as error:
+            # every request of the batch gets the error, the waiting threads must not wait for a result forever
+            for request in requests:
+                request.error = error
+            self._condition.notify_all()
+            return
+        start = 0
+        for request in requests:
+            end = start + len(request.observation)
+            request.result = output[start:end]
+            start = end
+        self.num_batches += 1
+        self.num_requests += len(requests)
+        self._condition.notify_all()
+
+
+class InferenceServer:
+    """
+    Local inference service for model bots. Every bot connects with an InferenceClient and registers the model it uses.
+    Each model is loaded once and the observations of all bots using it are run as one batch per tick, instead of
+    every bot process loading its own session and running batches of size one.
+    """
+
+    def __init__(self, address=DEFAULT_ADDRESS, authkey: bytes = DEFAULT_AUTHKEY,
+                 batch_timeout: float = DEFAULT_BATCH_TIMEOUT):
+        self.listener = Listener(address, authkey=authkey)
+        self.address = self.listener.address
+        self.batch_timeout = batch_timeout
+        self.batchers: Dict[str, ModelBatcher] = dict()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread = None
+        self._closed = False
+
+    def serve_forever(self):
+        while not self._closed:
+            try:
+                connection = self.listener.accept()
+            except OSError:
+                if self._closed:
+                    return
+                raise
+            threading.Thread(target=self._serve_client, args=(connection,), daemon=True).start()
+
+    def start(self) -> 'InferenceServer':
+        """
+        Runs the server in a background thread, e.g. to use it from the same process in offline tests.
+        """
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        self._closed = True
+        self.listener.close()
+
+    def get_batcher(self, model_path: str) -> ModelBatcher:
+        with self._lock:
+            batcher = self.batchers.get(model_path)
+            if batcher is None:
+                batcher = ModelBatcher(ONNXModel(model_path), self.batch_timeout)
+                self.batchers[model_path] = batcher
+            return batcher
+
+    def _serve_client(self, connection: Connection):
+        with connection:
+            model_path = connection.recv()
+            batcher = self.get_batcher(model_path)
+            model = batcher.model
+            connection.send((model.is_continuous, model.is_multi_discrete, model.input_shape[1],
+                             model.output_shape[1], np.dtype(model.output_type).str))
+            batcher.register()
+            input_size = model.input_shape[1]
+            try:
+                while True:
+                    # a request holds one or more observation rows, a new buffer per request because the batch keeps
+                    # a reference to it
+                    observation = np.frombuffer(connection.recv_bytes(), dtype=np.float32).reshape(-1, input_size)
+                    try:
+                        output = batcher.run(observation)
+                    except Exception as error:
+                        # an empty message announces the error, the output of a request has at least one row
+                        connection.send_bytes(b'')
+                        connection.send(f'{type(error).__name__}: {error}')
+                        continue
+                    connection.send_bytes(output)
+            except (EOFError, OSError):
+                pass
+            finally:
+                batcher.unregister()
+
+
+class InferenceClient:
+    """
+    Connects a bot to an InferenceServer. It can be used in place of an ONNXModel: run() takes and returns the same
+    data and bind() / run_bound() offer the same buffer based fast path. If the server cannot run the model on an
+    observation they raise an InferenceError and the connection stays usable.
+    """
+
+    def __init__(self, model_path: str, address=DEFAULT_ADDRESS, authkey: bytes = DEFAULT_AUTHKEY):
+        self.model_path = model_path
+        self.connection = Client(address, authkey=authkey)
+        self.connection.send(model_path)
+        self.is_continuous, self.is_multi_discrete, input_size, output_size, output_type = self.connection.recv()
+        self.input_shape = ['batch', input_size]
+        self.output_shape = ['batch', output_size]
+        self.output_type = np.dtype(output_type)
+        self.bind()
+
+    def run(self, data):
+        self.connection.send_bytes(np.ascontiguousarray(data, dtype=np.float32))
+        message = self.connection.recv_bytes()
+        if not message:
+            self._raise_error()
+        output = np.frombuffer(message, dtype=self.output_type)
+        return [output.reshape(-1, self.output_shape[1]).copy()]
+
+    def bind(self, batch_size=1) -> np.ndarray:
+        """
+        Allocates the input and output buffers for batch_size observations and returns the input buffer, like
+        ONNXModel.bind. The server runs all rows of a request in the batch of the current tick.
+        """
+        if batch_size < 1:
+            raise ValueError(f'batch_size must be at least 1, got {batch_size}')
+        self.input_buffer = np.zeros(shape=(batch_size, self.input_shape[1]), dtype=np.float32)
+        self.output_buffer = np.zeros(shape=(batch_size, self.output_shape[1]), dtype=self.output_type)
+        # recv_bytes_into sizes the buffer by its first dimension, so it gets a flat view
+        self._output_rows = self.output_buffer.reshape(-1)
+        return self.input_buffer
+
+    def run_bound(self) -> np.ndarray:
+        self.connection.send_bytes(self.input_buffer)
+        if self.connection.recv_bytes_into(self._output_rows) == 0:
+            self._raise_error()
+        return self.output_buffer
+
+    def _raise_error(self):
+        raise InferenceError(self.connection.recv())
+
+    def get_input_shape(self):
+        return list(self.input_shape)
+
+    def get_output_shape(self):
+        return list(self.output_shape)
+
+    def close(self):
+        self.connection.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Runs the batched inference server for model bots.')
+    parser.add_argument('--address', default='%s:%d' % DEFAULT_ADDRESS, help='host:port to listen on')
+    parser.add_argument('--batch-timeout', type=float, default=DEFAULT_BATCH_TIMEOUT,
+                        help='seconds to wait for the remaining bots of a batch')
+    args = parser.parse_args()
+
+    server = InferenceServer(parse_address(args.address), batch_timeout=args.batch_timeout)
+    print(f'inference server listening on {args.address}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.close()
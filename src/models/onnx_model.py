@@ -2,25 +2,99 @@ import onnx
 import onnxruntime
 import numpy as np
 
+# numpy types of the onnx tensor types used by the exported models
+TENSOR_TYPES = {
+    'tensor(float)': np.float32,
+    'tensor(double)': np.float64,
+    'tensor(int32)': np.int32,
+    'tensor(int64)': np.int64,
+}
+
+
 class ONNXModel():
-    def __init__(self, model_path):
+    def __init__(self, model_path, seed: int = None):
+        """
+        :param seed: seed of the random numbers of models that sample their actions, random for every process if None.
+        onnxruntime only has a global seed, it is set before the session is created.
+        """
         self.model_path = model_path
         self.model = onnx.load(model_path)
+        if seed is not None:
+            onnxruntime.set_seed(seed)
         self.session = onnxruntime.InferenceSession(model_path, None)
 
-        self.input_name = self.session.get_inputs()[0].name
-        self.output_name = self.session.get_outputs()[2].name
+        # Resolve all session metadata once, the session is not asked again per call
+        inputs = self.session.get_inputs()
+        outputs = self.session.get_outputs()
+        self.input_name = inputs[0].name
+        self.input_shape = inputs[0].shape
+        self.output_name = outputs[2].name
+        self.output_shape = outputs[2].shape
+        self.output_type = TENSOR_TYPES[outputs[2].type]
 
         self.is_continuous = self.output_name == 'continuous_actions'
         self.is_multi_discrete = self.output_name == 'discrete_actions'
 
+        if self.is_multi_discrete:
+            self.action_mask_name = inputs[1].name
+            self.action_mask_size = inputs[1].shape[1]
+        self._action_masks = dict()
+        self._output_names = [self.output_name]
+        self._feed = dict()
+
+        self._io_binding = None
+        self.input_buffer: np.ndarray = None
+        self.output_buffer: np.ndarray = None
+
     def run(self, data):
-        if self.is_continuous:
-            return self.session.run([self.output_name], {self.input_name: data})
-        elif self.is_multi_discrete:
-            return self.session.run([self.output_name], {self.input_name: data, 'action_masks': np.array([[1] * 26], dtype=np.float32)})
-        else:
+        if not self.is_continuous and not self.is_multi_discrete:
             raise NotImplementedError
+        self._feed[self.input_name] = data
+        if self.is_multi_discrete:
+            self._feed[self.action_mask_name] = self.get_action_masks(data.shape[0])
+        return self.session.run(self._output_names, self._feed)
+
+    def bind(self, batch_size=1) -> np.ndarray:
+        """
+        Sets up the I/O binding fast path. Input and output buffers are allocated once and bound to the session, so
+        run_bound() neither copies the feed nor allocates the output. Returns the input buffer which has to be filled
+        with the observations before each call of run_bound().
+        """
+        if not self.is_continuous and not self.is_multi_discrete:
+            raise NotImplementedError
+        input_shape = [batch_size, self.input_shape[1]]
+        output_shape = [batch_size, self.output_shape[1]]
+        self.input_buffer = np.zeros(shape=input_shape, dtype=np.float32)
+        self.output_buffer = np.zeros(shape=output_shape, dtype=self.output_type)
+
+        binding = self.session.io_binding()
+        binding.bind_input(self.input_name, 'cpu', 0, np.float32, input_shape, self.input_buffer.ctypes.data)
+        if self.is_multi_discrete:
+            action_masks = self.get_action_masks(batch_size)
+            binding.bind_input(self.action_mask_name, 'cpu', 0, np.float32, list(action_masks.shape),
+                               action_masks.ctypes.data)
+        binding.bind_output(self.output_name, 'cpu', 0, self.output_type, output_shape,
+                            self.output_buffer.ctypes.data)
+        self._io_binding = binding
+        return self.input_buffer
+
+    def run_bound(self) -> np.ndarray:
+        """
+        Runs the model on the current content of the input buffer returned by bind(). The result is written into and
+        returned as the preallocated output buffer, so it is overwritten by the next call.
+        """
+        self.session.run_with_iobinding(self._io_binding)
+        return self.output_buffer
+
+    def get_action_masks(self, batch_size):
+        """
+        Returns the constant action masks (nothing masked) for the given batch size. They are only created once.
+        """
+        action_masks = self._action_masks.get(batch_size)
+        if action_masks is None:
+            action_masks = np.ones(shape=(batch_size, self.action_mask_size), dtype=np.float32)
+            self._action_masks[batch_size] = action_masks
+        return action_masks
 
     def check(self):
         try:
@@ -31,7 +105,7 @@ class ONNXModel():
             print('The model is valid!')
 
     def get_input_shape(self):
-        return self.session.get_inputs()[0].shape
+        return list(self.input_shape)
 
     def get_output_shape(self):
-        return self.session.get_outputs()[2].shape
+        return list(self.output_shape)
@@ -1,82 +1,180 @@
+import argparse
 import configparser
+import glob
 import json
+import shutil
+import tempfile
+import time
 from pathlib import Path
+from typing import List, Dict, Tuple
 
 import rlbottraining.exercise_runner as er
 from rlbot.matchconfig.conversions import read_match_config_from_file
 from rlbot.matchconfig.match_config import Team, PlayerConfig
 from rlbottraining.training_exercise import Playlist
 
+from src.utils.scenario import Scenario, cache_scenario
 from src.utils.scenario_test_object import JSONObject
 from test_training import TestExercise
 
 import os
 
 
-cleanup = []
+TEST_BOT_TEMPLATE = Path(__file__).absolute().parent / 'test_bot.cfg'
 
 
-def create_bot_config(car) -> PlayerConfig:
-    team = Team.BLUE if car.team == "0" else Team.ORANGE
-    cfg_file_name = './test_bot_' + car.id + '.cfg'
-    with open('./test_bot.cfg') as bot_cfg_file:
-        with open(cfg_file_name, 'w') as real_cfg_file:
-            lines = bot_cfg_file.readlines()
-            for line in lines:
-                if line.find('name') > -1:
-                    line = 'name = PGBot_' + car.id
-                if line.find('lead') > -1 and not car.lead:
-                    line = 'lead = False'
-                real_cfg_file.write(line)
-    cleanup.append(cfg_file_name)
-    return PlayerConfig.bot_config(Path(__file__).absolute().parent / cfg_file_name, team)
-
-
-def make_match_config(cars):
+class BotConfigs:
     """
-    Creates a match config supplied with a player config that loads a bot that is configured by test_bot.cfg
+    Creates the bot configs of the scenario cars from the test_bot.cfg template. The template is parsed once and the
+    configs are written to a temporary directory of their own, so several runners can work in the same checkout at the
+    same time. The scenario caches the bots load are kept in the same directory, mkdtemp makes it private to the user.
+    The directory is removed again by cleanup().
     """
-    result_match_config = read_match_config_from_file(Path('test_match.cfg'))
-    player_configs = []
-    for go in cars:
-        player_configs.append(create_bot_config(go))
-    result_match_config.player_configs = player_configs
-    return result_match_config
-
 
-def make_default_playlist() -> Playlist:
-    # Load scenario file from settings to build the playlist
+    def __init__(self, template_path: Path = TEST_BOT_TEMPLATE):
+        self.template = configparser.ConfigParser()
+        with open(template_path) as template_file:
+            self.template.read_file(template_file)
+        # the configs do not live next to the template, so its relative locations have to be made absolute
+        for key in ('looks_config', 'python_file'):
+            location = Path(self.template['Locations'][key])
+            if not location.is_absolute():
+                self.template['Locations'][key] = str((template_path.parent / location).resolve())
+        self.directory = Path(tempfile.mkdtemp(prefix='test_bots_'))
+
+    def create_bot_config(self, scenario_name: str, car, scenario_cache: str, results_path: str) -> PlayerConfig:
+        team = Team.BLUE if car.team == "0" else Team.ORANGE
+        config = configparser.ConfigParser()
+        config.read_dict(self.template)
+        config['Locations']['name'] = 'PGBot_' + car.id
+        config['Bot Parameters']['lead'] = str(car.lead)
+        config['Bot Parameters']['scenario_cache'] = scenario_cache
+        config['Bot Parameters']['results_path'] = os.path.abspath(results_path)
+        # every roster gets configs of its own, a later roster with the same car must not overwrite them
+        fd, cfg_path = tempfile.mkstemp(dir=self.directory, prefix=f'{scenario_name}_{car.id}_', suffix='.cfg')
+        with os.fdopen(fd, 'w') as cfg_file:
+            config.write(cfg_file)
+        return PlayerConfig.bot_config(Path(cfg_path), team)
+
+    def make_match_config(self, scenario: Scenario, scenario_cache: str, results_path: str):
+        """
+        Creates a match config supplied with a player config that loads a bot that is configured by test_bot.cfg
+        """
+        result_match_config = read_match_config_from_file(Path('test_match.cfg'))
+        result_match_config.player_configs = [self.create_bot_config(scenario.name, go, scenario_cache, results_path)
+                                              for go in scenario.cars]
+        return result_match_config
+
+    def cleanup(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def __enter__(self) -> 'BotConfigs':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.cleanup()
+
+
+def load_scenario_settings():
+    """
+    Loads the scenario settings that the settings.json in this directory points to.
+    """
     with open('./settings.json') as settings_file:
         settings = json.load(settings_file, object_hook=JSONObject)
         with open(settings.path_to_settings) as scenario_settings_file:
-            scenario_settings = json.load(scenario_settings_file, object_hook=JSONObject)
-            with open(os.path.join(scenario_settings.szenario_path, scenario_settings.file_name)) as scenario_file:
-                scenario = json.load(scenario_file, object_hook=JSONObject)
+            return json.load(scenario_settings_file, object_hook=JSONObject)
+
+
+def make_default_playlist(bot_configs: BotConfigs) -> Playlist:
+    # Load scenario file from settings to build the playlist
+    scenario_settings = load_scenario_settings()
+    scenario, scenario_cache = cache_scenario(os.path.join(scenario_settings.szenario_path,
+                                                           scenario_settings.file_name), str(bot_configs.directory))
 
     # Build up the actual playlist with the previously created match config
     exercises = [
         TestExercise(name=scenario.name, scenario=scenario)
     ]
 
-    match_config = make_match_config(filter(lambda go: go.gameObject == 'car', scenario.gameObjects))
+    match_config = bot_configs.make_match_config(scenario, scenario_cache, scenario_settings.results_path_rl_bot)
 
     for e in exercises:
         e.match_config = match_config
     return exercises
 
 
-if __name__ == "__main__":
+def find_scenarios(scenarios: str) -> List[str]:
+    """
+    Returns the scenario files of a directory or matching a glob pattern.
+    """
+    if os.path.isdir(scenarios):
+        scenarios = os.path.join(scenarios, '*.json')
+    return sorted(os.path.abspath(path) for path in glob.glob(scenarios))
+
+
+def roster_key(cars) -> Tuple:
+    """
+    Scenarios with the same key can run with the same match config and bots.
+    """
+    return tuple((car.id, car.team, car.lead) for car in cars)
+
+
+def make_batch_playlist(bot_configs: BotConfigs, scenario_paths: List[str], results_path: str) -> Playlist:
+    """
+    Builds one playlist for many scenarios. Scenarios with the same car roster share one match config and are run
+    one after another, so the match and the bots are only started once per roster. The bots are told which scenario
+    to run via matchcomms.
+    """
+    groups: Dict[Tuple, List[TestExercise]] = dict()
+    match_configs = dict()
+    for scenario_path in scenario_paths:
+        scenario, scenario_cache = cache_scenario(scenario_path, str(bot_configs.directory))
+        key = roster_key(scenario.cars)
+        if key not in groups:
+            groups[key] = []
+            match_configs[key] = bot_configs.make_match_config(scenario, scenario_cache, results_path)
+        groups[key].append(TestExercise(name=scenario.name, scenario=scenario, scenario_cache=scenario_cache,
+                                        results_path=os.path.abspath(results_path),
+                                        match_config=match_configs[key]))
+    return [exercise for exercises in groups.values() for exercise in exercises]
+
+
+def run_batch(bot_configs: BotConfigs, scenarios: str, results_path: str):
+    playlist = make_batch_playlist(bot_configs, find_scenarios(scenarios), results_path)
+    print(f'running {len(playlist)} scenarios with {len({id(e.match_config) for e in playlist})} car rosters')
     with er.setup_manager_context() as setup_manager:
         er.apply_render_policy(er.RenderPolicy.DEFAULT, setup_manager)
-        seed = er.infinite_seed_generator()
-        playlist = make_default_playlist()
+        exercises = [er.TrainingExerciseAdapter(ex) for ex in playlist]
+        # The bots are briefed on every scenario, there is no need to restart them
+        result_iter = er.rlbot_run_exercises(setup_manager, exercises, next(er.infinite_seed_generator()),
+                                             reload_agent=False)
+        start_time = time.time()
+        for i, result in enumerate(result_iter):
+            scenarios_per_minute = (i + 1) / (time.time() - start_time) * 60
+            print(f'{i + 1}/{len(playlist)} {result.exercise.get_name()}: {result.grade} '
+                  f'({scenarios_per_minute:.1f} scenarios per minute)')
 
-        exercise = [er.TrainingExerciseAdapter(ex) for ex in playlist]
-        result_iter = er.rlbot_run_exercises(setup_manager, exercise, seed)
 
-        for _ in result_iter:
-            pass
-    print('cleaning up bot configs')
-    for filename in cleanup:
-        os.remove(filename)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Runs the test scenario of the scenario settings or a batch of '
+                                                 'scenarios in one match session.')
+    parser.add_argument('--batch', help='directory or glob pattern of scenario files to run in one session')
+    parser.add_argument('--results', help='directory for the logs in batch mode, defaults to results_path_rl_bot '
+                                          'of the scenario settings')
+    args = parser.parse_args()
+
+    with BotConfigs() as bot_configs:
+        if args.batch is not None:
+            run_batch(bot_configs, args.batch, args.results or load_scenario_settings().results_path_rl_bot)
+        else:
+            with er.setup_manager_context() as setup_manager:
+                er.apply_render_policy(er.RenderPolicy.DEFAULT, setup_manager)
+                seed = er.infinite_seed_generator()
+                playlist = make_default_playlist(bot_configs)
+
+                exercise = [er.TrainingExerciseAdapter(ex) for ex in playlist]
+                result_iter = er.rlbot_run_exercises(setup_manager, exercise, seed)
+
+                for _ in result_iter:
+                    pass
     print('exercise finished')
@@ -1,5 +1,8 @@
 from dataclasses import dataclass, field
+from typing import Optional
 
+from rlbot.matchcomms.common_uses.reply import send_and_wait_for_replies
+from rlbot.training.training import Grade
 from rlbot.utils.game_state_util import GameState
 from rlbottraining.common_graders.compound_grader import CompoundGrader
 from rlbottraining.grading.grader import Grader
@@ -8,7 +11,12 @@ from rlbottraining.training_exercise import Playlist
 from rlbottraining.training_exercise import TrainingExercise
 
 from src.graders.pass_graders import PassOnTimeout
-from src.utils.scenario_test_object import JSONObject
+from src.utils.scenario import Scenario
+
+# Seconds the briefing waits for the replies of the bots per try, and the number of retries. Bots that are still
+# starting up only see the scenario once they are connected to matchcomms, so the briefing is resent until they are.
+BRIEFING_TIMEOUT = 1.0
+BRIEFING_RETRIES = 30
 
 
 class TestGrader(CompoundGrader):
@@ -20,11 +28,27 @@ class TestGrader(CompoundGrader):
 
 @dataclass
 class TestExercise(TrainingExercise):
-    scenario: JSONObject = field(default_factory=JSONObject)
+    scenario: Scenario = None
     grader: Grader = field(default_factory=TestGrader)
+    # Set in batch mode: the bots are told via matchcomms which scenario cache to load instead of using their config
+    scenario_cache: str = None
+    results_path: str = None
 
     def __post_init__(self):
-        self.grader = TestGrader(self.scenario.time + 1)
+        if self.scenario is not None:
+            self.grader = TestGrader(self.scenario.time + 1)
+
+    def on_briefing(self) -> Optional[Grade]:
+        if self.scenario_cache is None:
+            return
+        # one message per car, so the exercise only starts when every bot has loaded the scenario
+        messages = [{
+            'scenario_cache': self.scenario_cache,
+            'results_path': self.results_path,
+            'car_id': car.id,
+        } for car in self.scenario.cars]
+        send_and_wait_for_replies(self.get_matchcomms(), messages, timeout_seconds=BRIEFING_TIMEOUT,
+                                  num_retries=BRIEFING_RETRIES)
 
     def make_game_state(self, rng: SeededRandomNumberGenerator) -> GameState:
         return GameState()
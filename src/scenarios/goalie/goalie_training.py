@@ -1,6 +1,8 @@
 from math import pi
 from dataclasses import dataclass, field
 
+import numpy as np
+
 from rlbottraining.training_exercise import TrainingExercise
 from rlbottraining.grading.grader import Grader
 from rlbottraining.rng import SeededRandomNumberGenerator
@@ -8,17 +10,22 @@ from rlbottraining.training_exercise import Playlist
 from rlbot.utils.game_state_util import GameState, BallState, CarState, Physics, Vector3, Rotator
 from rlbottraining.common_graders.compound_grader import CompoundGrader
 
+from src.graders.early_termination import EarlyTerminationGrader
 from src.graders.pass_graders import PassOnBallGoingAwayFromGoal, PassOnGoalForAllyTeam, PassOnTimeout
+from src.utils.game_state_batch import GameStateBatch, unity_locations, velocities_towards
 from src.utils.vec import Vec3, Location, UnitSystem
 
 
 class GoalieGrader(CompoundGrader):
-    def __init__(self, timeout_seconds=10.0, ally_team=0):
-        super().__init__([
+    def __init__(self, timeout_seconds=10.0, ally_team=0, early_termination=False):
+        graders = [
             PassOnBallGoingAwayFromGoal(ally_team),
             PassOnGoalForAllyTeam(ally_team),
             PassOnTimeout(timeout_seconds),
-        ])
+        ]
+        if early_termination:
+            graders.append(EarlyTerminationGrader(ally_team, timeout_seconds, timeout_passes=True))
+        super().__init__(graders)
 
 
 @dataclass
@@ -50,6 +57,26 @@ class BallRollingToGoalie(TrainingExercise):
         )
 
 
+def sample_goalie_game_states(count: int, seed: int = None) -> GameStateBatch:
+    """
+    Samples count starting states of BallRollingToGoalie at once, from the same distributions as make_game_state:
+    the ball is shot from a random location towards a random point of the goal line. The same seed gives the same
+    batch.
+    """
+    rng = np.random.default_rng(seed)
+    ball_location = unity_locations(rng.uniform(-10, 0, count), rng.uniform(0, 20, count),
+                                    rng.uniform(-30, 30, count))
+    target = unity_locations(-51.0, 3.0, rng.uniform(-7, 7, count))
+    return GameStateBatch(
+        ball_location=ball_location,
+        ball_velocity=velocities_towards(ball_location, target, rng.uniform(2000, 4000, count)),
+        car_location=np.tile((0.0, -5300.0, 0.0), (count, 1)),
+        car_yaw=np.full(count, pi / 2),
+        car_boost=np.full(count, 32.0),
+        tier=np.zeros(count, dtype=np.int64),
+    )
+
+
 def make_default_playlist() -> Playlist:
     return [
         BallRollingToGoalie('BallRollingToGoalie'),
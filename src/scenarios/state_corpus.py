@@ -0,0 +1,160 @@
+import os
+import tempfile
+from dataclasses import dataclass
+from random import Random
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+from rlbot.training.training import Grade
+from rlbot.utils.game_state_util import GameState
+from rlbot.utils.rendering.rendering_manager import RenderingManager
+from rlbottraining.rng import SeededRandomNumberGenerator
+from rlbottraining.training_exercise import Playlist, TrainingExercise
+
+from src.utils.game_state_batch import GameStateBatch
+
+# Bump when the file layout or the exercises change, so old corpus files are not read anymore
+STATE_CORPUS_VERSION = 1
+
+_FLOAT_COLUMNS = ('ball_location', 'ball_velocity', 'car_location', 'car_yaw', 'car_boost')
+
+
+class StateCorpusError(ValueError):
+    pass
+
+
+class StateCorpus:
+    """
+    The starting states of the exercises of a playlist for a range of seeds, generated once and stored in one binary
+    file. Rows are the seeds in the order they were built, per exercise name the states are a GameStateBatch, so a
+    state is found by exercise name and row, or by exercise name and seed, in constant time.
+    A state is the one the exercise's make_game_state returns for the seed in rlbottraining, which seeds a new random
+    number generator for every exercise of a playlist.
+    """
+
+    def __init__(self, seeds: np.ndarray, batches: Dict[str, GameStateBatch]):
+        self.seeds = np.asarray(seeds, dtype=np.int64)
+        self.batches = batches
+        self._rows = {seed: row for row, seed in enumerate(self.seeds.tolist())}
+        if len(self._rows) != len(self.seeds):
+            raise StateCorpusError('the seeds of a corpus must be unique')
+
+    @staticmethod
+    def build(playlist: Playlist, seeds: Iterable[int]) -> 'StateCorpus':
+        seeds = list(seeds)
+        batches = {}
+        for exercise in playlist:
+            if exercise.name in batches:
+                raise StateCorpusError(f'the playlist contains more than one exercise named {exercise.name}')
+            states = []
+            for seed in seeds:
+                rng = Random()
+                rng.seed(seed)
+                states.append(exercise.make_game_state(SeededRandomNumberGenerator(rng)))
+            try:
+                batches[exercise.name] = GameStateBatch.from_game_states(states)
+            except ValueError as e:
+                raise StateCorpusError(f'the states of {exercise.name} cannot be stored: {e}') from e
+        return StateCorpus(np.array(seeds, dtype=np.int64), batches)
+
+    @property
+    def exercise_names(self) -> List[str]:
+        return list(self.batches)
+
+    def __len__(self):
+        return len(self.seeds)
+
+    def row(self, seed: int) -> int:
+        try:
+            return self._rows[seed]
+        except KeyError:
+            raise StateCorpusError(f'the corpus has no states for seed {seed}') from None
+
+    def batch(self, exercise_name: str) -> GameStateBatch:
+        try:
+            return self.batches[exercise_name]
+        except KeyError:
+            raise StateCorpusError(f'the corpus has no states for the exercise {exercise_name}') from None
+
+    def game_state(self, exercise_name: str, row: int) -> GameState:
+        return self.batch(exercise_name).game_state(row)
+
+    def game_state_for_seed(self, exercise_name: str, seed: int) -> GameState:
+        return self.batch(exercise_name).game_state(self.row(seed))
+
+    def save(self, path: str):
+        arrays = {'version': np.array(STATE_CORPUS_VERSION), 'seeds': self.seeds,
+                  'names': np.array(self.exercise_names, dtype=np.str_)}
+        for i, batch in enumerate(self.batches.values()):
+            # the game keeps states as 32 bit floats, more precision would not change what it simulates
+            for column in _FLOAT_COLUMNS:
+                arrays[f'{i}_{column}'] = getattr(batch, column).astype(np.float32)
+            arrays[f'{i}_tier'] = batch.tier.astype(np.int8)
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        # written to a temporary file first, concurrent runners must never read a partial corpus
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as corpus_file:
+                np.savez(corpus_file, **arrays)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    @staticmethod
+    def load(path: str) -> 'StateCorpus':
+        with np.load(path) as data:
+            if int(data['version']) != STATE_CORPUS_VERSION:
+                raise StateCorpusError(f'{path} was written by another version of the corpus')
+            batches = {}
+            for i, name in enumerate(data['names'].tolist()):
+                columns = {column: data[f'{i}_{column}'].astype(np.float64) for column in _FLOAT_COLUMNS}
+                batches[name] = GameStateBatch(tier=data[f'{i}_tier'].astype(np.int64), **columns)
+            return StateCorpus(data['seeds'], batches)
+
+
+@dataclass
+class ReplayExercise(TrainingExercise):
+    """
+    Replays a stored starting state instead of sampling one, the random number generator of the runner is ignored.
+    Name, grader and match config are the ones of the replayed exercise, briefing, rendering and any other attribute
+    are delegated to it.
+    """
+    exercise: Optional[TrainingExercise] = None
+    corpus: Optional[StateCorpus] = None
+    row: int = 0
+
+    def make_game_state(self, rng: SeededRandomNumberGenerator) -> GameState:
+        return self.corpus.game_state(self.name, self.row)
+
+    def on_briefing(self) -> Optional[Grade]:
+        # the runner only gives the factory to the exercise it runs
+        self.exercise.matchcomms_factory = self.matchcomms_factory
+        return self.exercise.on_briefing()
+
+    def render(self, renderer: RenderingManager):
+        self.exercise.render(renderer)
+
+    def __getattr__(self, name):
+        # only called for attributes the replay does not have, dunder lookups of pickle and copy must not recurse
+        exercise = self.__dict__.get('exercise')
+        if exercise is None or name.startswith('__'):
+            raise AttributeError(name)
+        return getattr(exercise, name)
+
+
+def make_replay_playlist(corpus: StateCorpus, make_playlist: Callable[[], Playlist],
+                         rows: Iterable[int] = None) -> List[ReplayExercise]:
+    """
+    Returns a playlist replaying the given rows of the corpus, all of them by default, for every exercise of
+    make_playlist, which has to return the playlist the corpus was built from. It is called once per row, as every
+    exercise needs a fresh grader.
+    """
+    rows = range(len(corpus)) if rows is None else rows
+    replays = []
+    for row in rows:
+        for exercise in make_playlist():
+            replays.append(ReplayExercise(name=exercise.name, grader=exercise.grader, match_config=exercise.match_config,
+                                          exercise=exercise, corpus=corpus, row=row))
+    return replays
@@ -2,6 +2,8 @@ import math
 from math import pi
 from dataclasses import dataclass, field
 
+import numpy as np
+
 from rlbot.matchconfig.match_config import Team
 from rlbottraining.training_exercise import TrainingExercise
 from rlbottraining.grading.grader import Grader
@@ -10,18 +12,27 @@ from rlbottraining.training_exercise import Playlist
 from rlbot.utils.game_state_util import GameState, BallState, CarState, Physics, Vector3, Rotator
 from rlbottraining.common_graders.compound_grader import CompoundGrader
 
+from src.graders.early_termination import EarlyTerminationGrader
 from src.graders.fail_graders import FailOnTimeout, FailOnBallPassingStriker
 from src.graders.pass_graders import PassOnBallGoingAwayFromGoal, PassOnGoalForAllyTeam, PassOnTimeout
+from src.utils.game_state_batch import GameStateBatch, unity_locations, velocities_towards
 from src.utils.vec import Vec3, Location, UnitSystem
 
+NUM_DIFFICULTIES = 4
+
 
 class StrikerGrader(CompoundGrader):
-    def __init__(self, timeout_seconds=10.0, ally_team=0):
-        super().__init__([
+    def __init__(self, timeout_seconds=10.0, ally_team=0, early_termination=False):
+        graders = [
             PassOnGoalForAllyTeam(ally_team),
             FailOnTimeout(timeout_seconds),
             FailOnBallPassingStriker()
-        ])
+        ]
+        if early_termination:
+            # FailOnBallPassingStriker can still fail a ball that is on its way into the goal
+            graders.append(EarlyTerminationGrader(ally_team, timeout_seconds, timeout_passes=False,
+                                                  decide_passes=False))
+        super().__init__(graders)
 
 
 def make_game_state_diff0(rng: SeededRandomNumberGenerator) -> GameState:
@@ -137,7 +148,7 @@ class GoalStrikingExercise(TrainingExercise):
     grader: Grader = field(default_factory=StrikerGrader)
 
     def make_game_state(self, rng: SeededRandomNumberGenerator) -> GameState:
-        difficulty = math.floor(rng.uniform(0, 4))
+        difficulty = math.floor(rng.uniform(0, NUM_DIFFICULTIES))
         if difficulty == 0:
             return make_game_state_diff0(rng)
         if difficulty == 1:
@@ -147,6 +158,60 @@ class GoalStrikingExercise(TrainingExercise):
         return make_game_state_diff3(rng)
 
 
+def sample_striker_game_states(count: int, seed: int = None) -> GameStateBatch:
+    """
+    Samples count starting states of GoalStrikingExercise at once, from the same distributions as make_game_state:
+    a uniform difficulty tier and the distributions of make_game_state_diff0..3 for it. The same seed gives the same
+    batch. The conditions in the ball locations of diff1 and diff2 are booleans that are almost never true, so the
+    ball starts at z 0 in diff1 and at z uniform(-1, 1) in diff2, in Unity units.
+    """
+    rng = np.random.default_rng(seed)
+    tier = np.floor(rng.uniform(0, NUM_DIFFICULTIES, count)).astype(np.int64)
+    ball_location = np.empty((count, 3))
+    ball_velocity = np.empty((count, 3))
+    car_location = np.empty((count, 3))
+    car_yaw = np.full(count, pi / 2)
+
+    diff0 = np.flatnonzero(tier == 0)
+    n = len(diff0)
+    ball_location[diff0] = unity_locations(45.0, 0.9315, rng.uniform(-5.0, 5.0, n))
+    ball_velocity[diff0] = (0.0001, 0.0, 0.0)
+    car_location[diff0] = unity_locations(30.0, 0.17, np.zeros(n))
+
+    # diff1 and diff2 shoot the ball towards the same target
+    diff1 = np.flatnonzero(tier == 1)
+    n = len(diff1)
+    ball_location[diff1] = unity_locations(45.0, 0.93, np.zeros(n))
+    car_location[diff1] = unity_locations(25.0, 0.17, rng.uniform(-5.0, 5.0, n))
+    ball_velocity[diff1] = velocities_towards(ball_location[diff1], unity_locations(45.0, 0.0, np.zeros(n)),
+                                              rng.uniform(500, 1000, n))
+
+    diff2 = np.flatnonzero(tier == 2)
+    n = len(diff2)
+    ball_location[diff2] = unity_locations(45.0, rng.uniform(2.0, 5.0, n), rng.uniform(-1.0, 1.0, n))
+    car_location[diff2] = unity_locations(25.0, 0.17, rng.uniform(-15.0, 15.0, n))
+    ball_velocity[diff2] = velocities_towards(ball_location[diff2], unity_locations(45.0, 0.0, np.zeros(n)),
+                                              rng.uniform(500, 1000, n))
+
+    diff3 = np.flatnonzero(tier == 3)
+    n = len(diff3)
+    ball_location[diff3] = unity_locations(rng.uniform(30, 50, n), rng.uniform(0, 10, n), rng.uniform(-20, 20, n))
+    car_z = rng.uniform(-15, 15, n)
+    car_location[diff3] = unity_locations(0.0, 0.17, car_z)
+    car_yaw[diff3] += rng.uniform(-pi / 9, pi / 9, n)
+    target = unity_locations(rng.uniform(10, 30, n), rng.uniform(0, 7, n), car_z)
+    ball_velocity[diff3] = velocities_towards(ball_location[diff3], target, rng.uniform(500, 1000, n))
+
+    return GameStateBatch(
+        ball_location=ball_location,
+        ball_velocity=ball_velocity,
+        car_location=car_location,
+        car_yaw=car_yaw,
+        car_boost=np.full(count, 32.0),
+        tier=tier,
+    )
+
+
 def make_default_playlist() -> Playlist:
     return [
         GoalStrikingExercise('GoalStrikingExercise'),
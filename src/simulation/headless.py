@@ -0,0 +1,175 @@
+import time
+from dataclasses import dataclass
+from random import Random
+from typing import Callable, Iterable, List, Optional
+
+from rlbot.agents.base_agent import BaseAgent, SimpleControllerState
+from rlbot.training.training import Grade
+from rlbottraining.grading.training_tick_packet import TrainingTickPacket
+from rlbottraining.rng import SeededRandomNumberGenerator
+from rlbottraining.training_exercise import TrainingExercise
+
+from src.graders.early_termination import use_ball_prediction
+
+from .matchcomms import LocalMatchcomms, LocalMatchcommsClient, LOCAL_ROOT_URL
+from .simulator import Simulator
+
+
+class NullRenderer:
+    """Accepts every call of the RLBot RenderingManager and draws nothing."""
+
+    def __getattr__(self, name):
+        return _ignore
+
+
+def _ignore(*args, **kwargs):
+    return None
+
+
+@dataclass
+class HeadlessResult:
+    exercise: str
+    seed: int
+    # None if the grader did not decide within max_game_seconds
+    grade: Optional[Grade]
+    ticks: int
+    game_seconds: float
+    wall_seconds: float
+    # time spent in get_output of all bots, in total and in the slowest tick
+    bot_seconds: float
+    max_bot_tick_seconds: float
+
+    @property
+    def real_time_factor(self) -> float:
+        return self.game_seconds / self.wall_seconds if self.wall_seconds > 0 else float('inf')
+
+
+class HeadlessSession:
+    """
+    Runs exercises with bots on the Simulator instead of the game: the state of the exercise is set, then every tick
+    the bots get the packet, their controls are simulated and the grader judges the new packet, until it returns a
+    grade.
+
+    make_bots creates the bots, indexed like the cars. With reload_bots every run gets new bots and a new simulator
+    starting at time 0, so a run only depends on its exercise and seed. Without it the bots and the simulator live as
+    long as the session, like bots that are not reloaded between the exercises of a match.
+
+    Exercises must be fresh like in rlbottraining, their graders keep state. on_briefing is called before the state
+    is set, with matchcomms clients of a LocalMatchcomms the bots are connected to as well. After every broadcast of
+    the exercise the bots are ticked once on the current packet, their controls ignored, so they can reply before the
+    exercise waits for the replies. A grade returned by on_briefing ends the run without a tick. Graders that look at
+    the ball prediction, like EarlyTerminationGrader, get the one of the simulator.
+    """
+
+    def __init__(self, make_bots: Callable[[], List[BaseAgent]], tick_rate: float = 120,
+                 max_game_seconds: float = 60, reload_bots: bool = True):
+        self.make_bots = make_bots
+        self.tick_rate = tick_rate
+        self.max_game_seconds = max_game_seconds
+        self.reload_bots = reload_bots
+        self.bots: List[BaseAgent] = None
+        self.simulator: Simulator = None
+        self.matchcomms: LocalMatchcomms = None
+
+    def _start(self):
+        self.bots = self.make_bots()
+        self.simulator = Simulator(len(self.bots), self.tick_rate, teams=[bot.team for bot in self.bots],
+                                   names=[bot.name for bot in self.bots])
+        self.matchcomms = LocalMatchcomms()
+        for bot in self.bots:
+            attach_bot(bot, self.simulator, self.matchcomms)
+
+    def _tick_bots(self):
+        for bot in self.bots:
+            bot.get_output(self.simulator.packet)
+
+    def _brief(self, exercise: TrainingExercise) -> Optional[Grade]:
+        clients = []
+
+        def matchcomms_factory() -> LocalMatchcommsClient:
+            client = self.matchcomms.connect(on_broadcast=self._tick_bots)
+            clients.append(client)
+            return client
+
+        exercise.matchcomms_factory = matchcomms_factory
+        try:
+            return exercise.on_briefing()
+        finally:
+            # like rlbot, the clients of the exercise only live for its briefing and run
+            for client in clients:
+                client.close()
+
+    def run(self, exercise: TrainingExercise, seed: int) -> HeadlessResult:
+        if self.reload_bots or self.simulator is None:
+            self._start()
+        simulator = self.simulator
+        # the same random numbers as rlbot's training runner uses for a seed
+        rng = Random()
+        rng.seed(seed)
+        simulator.reset()
+        start_time = simulator.time
+        wall_start = time.perf_counter()
+        grade = self._brief(exercise)
+        if grade is not None:
+            return HeadlessResult(exercise=exercise.name, seed=seed, grade=grade, ticks=0, game_seconds=0.0,
+                                  wall_seconds=time.perf_counter() - wall_start, bot_seconds=0.0,
+                                  max_bot_tick_seconds=0.0)
+        simulator.set_game_state(exercise.make_game_state(SeededRandomNumberGenerator(rng)))
+        tick = TrainingTickPacket()
+        grader = exercise.grader
+        use_ball_prediction(grader, simulator.get_ball_prediction_struct)
+        bot_seconds = max_bot_tick_seconds = 0.0
+        max_ticks = int(self.max_game_seconds * simulator.tick_rate)
+        ticks = 0
+        while ticks < max_ticks:
+            tick.update(simulator.packet)
+            grade = grader.on_tick(tick)
+            if grade is not None:
+                break
+            bot_start = time.perf_counter()
+            controls = {bot.index: bot.get_output(simulator.packet) for bot in self.bots}
+            bot_tick_seconds = time.perf_counter() - bot_start
+            bot_seconds += bot_tick_seconds
+            max_bot_tick_seconds = max(max_bot_tick_seconds, bot_tick_seconds)
+            simulator.step(controls)
+            ticks += 1
+        return HeadlessResult(
+            exercise=exercise.name,
+            seed=seed,
+            grade=grade,
+            ticks=ticks,
+            game_seconds=simulator.time - start_time,
+            wall_seconds=time.perf_counter() - wall_start,
+            bot_seconds=bot_seconds,
+            max_bot_tick_seconds=max_bot_tick_seconds,
+        )
+
+    def run_playlist(self, playlist: Iterable[TrainingExercise], seed: int) -> List[HeadlessResult]:
+        return [self.run(exercise, seed) for exercise in playlist]
+
+
+def attach_bot(bot: BaseAgent, simulator: Simulator, matchcomms: LocalMatchcomms = None):
+    """
+    Connects a bot to the simulator instead of the game (field info, ball prediction, game state setting, rendering,
+    quick chat and optionally matchcomms) and initializes it.
+    """
+    if matchcomms is not None:
+        bot.matchcomms_root = LOCAL_ROOT_URL
+        bot._matchcomms = matchcomms.connect()
+    bot._register_field_info(lambda: simulator.field_info)
+    bot._register_ball_prediction_struct(simulator.get_ball_prediction_struct)
+    bot._register_set_game_state(simulator.set_game_state)
+    bot._register_quick_chat(_ignore)
+    bot._set_renderer(NullRenderer())
+    bot.initialize_agent()
+
+
+class ConstantBot(BaseAgent):
+    """A bot that always returns the same controls, for measuring the simulator alone."""
+
+    def __init__(self, name, team, index, controls: SimpleControllerState = None):
+        super().__init__(name, team, index)
+        self.controls = controls if controls is not None else SimpleControllerState(throttle=1.0)
+
+    def get_output(self, packet) -> SimpleControllerState:
+        return self.controls
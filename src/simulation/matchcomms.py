@@ -0,0 +1,62 @@
+import json
+import threading
+from queue import Queue
+from typing import Callable, List
+from urllib.parse import urlparse
+
+from rlbot.matchcomms.shared import JSON
+
+# matchcomms_root of the bots attached to a LocalMatchcomms, BaseAgent.matchcomms refuses to work without one
+LOCAL_ROOT_URL = urlparse('local://headless')
+
+
+class LocalMatchcomms:
+    """
+    Stands in for the matchcomms server when there is no game: every broadcast of a client is delivered to all other
+    connected clients, as JSON copies like the server sends them.
+    """
+
+    def __init__(self):
+        self.clients: List[LocalMatchcommsClient] = []
+
+    def connect(self, on_broadcast: Callable[[], None] = None) -> 'LocalMatchcommsClient':
+        """
+        Connects a new client. on_broadcast is called after each broadcast of this client has been delivered,
+        HeadlessSession ticks the bots there so they can answer a briefing before the exercise polls for the replies.
+        """
+        client = LocalMatchcommsClient(self, on_broadcast)
+        self.clients.append(client)
+        return client
+
+    def broadcast(self, sender: 'LocalMatchcommsClient', message: JSON):
+        text = json.dumps(message)
+        for client in self.clients:
+            if client is not sender:
+                client.incoming_broadcast.put_nowait(json.loads(text))
+        if sender.on_broadcast is not None:
+            sender.on_broadcast()
+
+
+class LocalMatchcommsClient:
+    """
+    Has the parts of MatchcommsClient that bots and exercises use: the incoming_broadcast queue to read from and the
+    outgoing_broadcast to put messages on, which delivers them right away instead of from a websocket thread.
+    """
+
+    def __init__(self, hub: LocalMatchcomms, on_broadcast: Callable[[], None] = None):
+        self.hub = hub
+        self.on_broadcast = on_broadcast
+        self.incoming_broadcast = Queue()
+        self.outgoing_broadcast = self
+        # TrainingExercise.get_matchcomms replaces clients whose thread died
+        self.thread = threading.main_thread()
+
+    def put_nowait(self, message: JSON):
+        self.hub.broadcast(self, message)
+
+    def put(self, message: JSON, block=True, timeout=None):
+        self.hub.broadcast(self, message)
+
+    def close(self):
+        if self in self.hub.clients:
+            self.hub.clients.remove(self)
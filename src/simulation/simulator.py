@@ -0,0 +1,358 @@
+import math
+from typing import Dict, List, Optional
+
+from rlbot.agents.base_agent import SimpleControllerState
+from rlbot.utils.game_state_util import GameState
+from rlbot.utils.structures.ball_prediction_struct import BallPrediction
+from rlbot.utils.structures.game_data_struct import GameTickPacket, FieldInfoPacket
+
+# Arena of the standard soccar map in Unreal units, see https://github.com/RLBot/RLBot/wiki/Useful-Game-Values
+FIELD_HALF_WIDTH = 4096
+FIELD_HALF_LENGTH = 5120
+CEILING_HEIGHT = 2044
+GOAL_HALF_WIDTH = 892.755
+GOAL_HEIGHT = 642.775
+GRAVITY = -650
+BALL_RADIUS = 92.75
+BALL_RESTITUTION = 0.6
+BALL_MAX_SPEED = 6000
+
+CAR_HEIGHT = 17.01  # z of a resting octane
+CAR_HIT_RADIUS = 150  # distance between the centers of a car and the ball when they touch
+CAR_MAX_SPEED = 2300
+MAX_THROTTLE_SPEED = 1410
+BOOST_ACCELERATION = 991.667
+BOOST_CONSUMPTION = 33.3
+BRAKE_ACCELERATION = 3500
+COAST_ACCELERATION = 525
+SUPERSONIC_SPEED = 2200
+JUMP_SPEED = 300
+# speed the ball gets along the hit direction on top of the car's speed when a car hits it
+HIT_SPEED = 500
+
+# (speed, turn curvature) of a car at full steer, interpolated in between
+CURVATURES = ((0, 0.0069), (500, 0.00398), (1000, 0.00235), (1500, 0.001375), (1750, 0.0011), (2300, 0.00088))
+
+# (x, y, is_full_boost) of the boost pads of the standard soccar map, in the order of the field info
+STANDARD_BOOST_PADS = (
+    (0.0, -4240.0, False), (-1792.0, -4184.0, False), (1792.0, -4184.0, False), (-3072.0, -4096.0, True),
+    (3072.0, -4096.0, True), (-940.0, -3308.0, False), (940.0, -3308.0, False), (0.0, -2816.0, False),
+    (-3584.0, -2484.0, False), (3584.0, -2484.0, False), (-1788.0, -2300.0, False), (1788.0, -2300.0, False),
+    (-2048.0, -1036.0, False), (0.0, -1024.0, False), (2048.0, -1036.0, False), (-3584.0, 0.0, True),
+    (-1024.0, 0.0, False), (1024.0, 0.0, False), (3584.0, 0.0, True), (-2048.0, 1036.0, False), (0.0, 1024.0, False),
+    (2048.0, 1036.0, False), (-1788.0, 2300.0, False), (1788.0, 2300.0, False), (-3584.0, 2484.0, False),
+    (3584.0, 2484.0, False), (0.0, 2816.0, False), (-940.0, 3310.0, False), (940.0, 3308.0, False),
+    (-3072.0, 4096.0, True), (3072.0, 4096.0, True), (-1792.0, 4184.0, False), (1792.0, 4184.0, False),
+    (0.0, 4240.0, False),
+)
+FULL_BOOST_PICKUP_RADIUS = 208
+SMALL_BOOST_PICKUP_RADIUS = 144
+FULL_BOOST_RESPAWN_TIME = 10.0
+SMALL_BOOST_RESPAWN_TIME = 4.0
+
+BALL_PREDICTION_SLICES = 360
+BALL_PREDICTION_RATE = 60
+
+
+def turn_curvature(speed: float) -> float:
+    speed = min(abs(speed), CURVATURES[-1][0])
+    for (speed0, curvature0), (speed1, curvature1) in zip(CURVATURES, CURVATURES[1:]):
+        if speed <= speed1:
+            return curvature0 + (curvature1 - curvature0) * (speed - speed0) / (speed1 - speed0)
+    return CURVATURES[-1][1]
+
+
+def throttle_acceleration(speed: float) -> float:
+    """Acceleration of full throttle at the given forward speed, falling from 1600 at rest to 0 at 1410."""
+    if speed >= MAX_THROTTLE_SPEED:
+        return 0.0
+    if speed < 1400:
+        return 1600 - speed * (1600 - 160) / 1400
+    return 160 - (speed - 1400) * 16
+
+
+class SimBall:
+    __slots__ = ['x', 'y', 'z', 'vx', 'vy', 'vz']
+
+    def __init__(self):
+        self.x, self.y, self.z = 0.0, 0.0, BALL_RADIUS
+        self.vx, self.vy, self.vz = 0.0, 0.0, 0.0
+
+    def step(self, dt: float):
+        """Moves the ball ballistically and bounces it off the floor, the ceiling and the walls."""
+        self.vz += GRAVITY * dt
+        self.x += self.vx * dt
+        self.y += self.vy * dt
+        self.z += self.vz * dt
+        if self.z < BALL_RADIUS:
+            self.z = BALL_RADIUS
+            self.vz = -self.vz * BALL_RESTITUTION if self.vz < -1 else 0.0
+        elif self.z > CEILING_HEIGHT - BALL_RADIUS:
+            self.z = CEILING_HEIGHT - BALL_RADIUS
+            self.vz = -abs(self.vz) * BALL_RESTITUTION
+        if abs(self.x) > FIELD_HALF_WIDTH - BALL_RADIUS:
+            self.x = math.copysign(FIELD_HALF_WIDTH - BALL_RADIUS, self.x)
+            self.vx = -self.vx * BALL_RESTITUTION
+        # the back walls, except for the goal mouths
+        if abs(self.y) > FIELD_HALF_LENGTH - BALL_RADIUS and not self.in_goal_mouth():
+            self.y = math.copysign(FIELD_HALF_LENGTH - BALL_RADIUS, self.y)
+            self.vy = -self.vy * BALL_RESTITUTION
+
+    def in_goal_mouth(self) -> bool:
+        return abs(self.x) < GOAL_HALF_WIDTH - BALL_RADIUS and self.z < GOAL_HEIGHT - BALL_RADIUS
+
+    def scored_goal(self) -> Optional[int]:
+        """Returns the team whose goal the ball is in, 0 (blue) for negative y, or None."""
+        if abs(self.y) > FIELD_HALF_LENGTH + BALL_RADIUS:
+            return 0 if self.y < 0 else 1
+        return None
+
+
+class SimCar:
+    __slots__ = ['team', 'name', 'x', 'y', 'z', 'vx', 'vy', 'vz', 'yaw', 'yaw_rate', 'boost', 'jumped',
+                 'is_demolished']
+
+    def __init__(self, team: int, name: str):
+        self.team = team
+        self.name = name
+        self.x, self.y, self.z = 0.0, 0.0, CAR_HEIGHT
+        self.vx, self.vy, self.vz = 0.0, 0.0, 0.0
+        self.yaw = 0.0
+        self.yaw_rate = 0.0
+        self.boost = 33.0
+        self.jumped = False
+        self.is_demolished = False
+
+    @property
+    def on_ground(self) -> bool:
+        return self.z <= CAR_HEIGHT
+
+    def step(self, controls: SimpleControllerState, dt: float):
+        """
+        Drives the car as a point on the floor: throttle, boost and braking along its yaw, turning with the
+        curvature of its speed. In the air the car only falls, a jump lifts it off the floor.
+        """
+        if self.on_ground:
+            forward_x, forward_y = math.cos(self.yaw), math.sin(self.yaw)
+            speed = self.vx * forward_x + self.vy * forward_y
+            throttle = controls.throttle
+            boosting = controls.boost and self.boost > 0
+            if boosting:
+                acceleration = throttle_acceleration(speed) + BOOST_ACCELERATION
+                self.boost = max(self.boost - BOOST_CONSUMPTION * dt, 0.0)
+            elif throttle * speed < 0:
+                acceleration = math.copysign(BRAKE_ACCELERATION, throttle)
+            elif abs(throttle) > 0.01:
+                acceleration = math.copysign(throttle_acceleration(abs(speed)) * abs(throttle), throttle)
+            else:
+                acceleration = -math.copysign(min(COAST_ACCELERATION, abs(speed) / dt), speed)
+            speed = max(min(speed + acceleration * dt, CAR_MAX_SPEED), -MAX_THROTTLE_SPEED)
+            self.yaw_rate = controls.steer * turn_curvature(speed) * speed
+            self.yaw = (self.yaw + self.yaw_rate * dt + math.pi) % (2 * math.pi) - math.pi
+            self.vx, self.vy = speed * math.cos(self.yaw), speed * math.sin(self.yaw)
+            self.vz = 0.0
+            self.jumped = False
+            if controls.jump:
+                self.vz = JUMP_SPEED
+                self.jumped = True
+        else:
+            self.yaw_rate = 0.0
+            self.vz += GRAVITY * dt
+        self.x += self.vx * dt
+        self.y += self.vy * dt
+        self.z = max(self.z + self.vz * dt, CAR_HEIGHT)
+        if abs(self.x) > FIELD_HALF_WIDTH:
+            self.x, self.vx = math.copysign(FIELD_HALF_WIDTH, self.x), 0.0
+        if abs(self.y) > FIELD_HALF_LENGTH:
+            self.y, self.vy = math.copysign(FIELD_HALF_LENGTH, self.y), 0.0
+
+    def hit(self, ball: SimBall):
+        """Pushes the ball away from the car if they touch."""
+        offset_x, offset_y, offset_z = ball.x - self.x, ball.y - self.y, ball.z - self.z
+        distance = math.sqrt(offset_x ** 2 + offset_y ** 2 + offset_z ** 2)
+        if distance >= CAR_HIT_RADIUS or distance == 0:
+            return
+        normal_x, normal_y, normal_z = offset_x / distance, offset_y / distance, offset_z / distance
+        approach = (self.vx - ball.vx) * normal_x + (self.vy - ball.vy) * normal_y + (self.vz - ball.vz) * normal_z
+        if approach > 0:
+            impulse = approach * (1 + BALL_RESTITUTION) + HIT_SPEED
+            ball.vx += impulse * normal_x
+            ball.vy += impulse * normal_y
+            ball.vz += impulse * normal_z
+            speed = math.sqrt(ball.vx ** 2 + ball.vy ** 2 + ball.vz ** 2)
+            if speed > BALL_MAX_SPEED:
+                scale = BALL_MAX_SPEED / speed
+                ball.vx, ball.vy, ball.vz = ball.vx * scale, ball.vy * scale, ball.vz * scale
+        # keep the ball outside of the car
+        ball.x = self.x + normal_x * CAR_HIT_RADIUS
+        ball.y = self.y + normal_y * CAR_HIT_RADIUS
+        ball.z = max(self.z + normal_z * CAR_HIT_RADIUS, BALL_RADIUS)
+
+
+class Simulator:
+    """
+    A lightweight kinematic stand-in for the game, so exercises, graders and bots can run without RLBot. The ball
+    flies ballistically and bounces off the arena, the cars drive on the floor, hit the ball and pick up boost, and
+    goals are scored. It is no physics engine: the numbers are plausible, not the ones of the game.
+
+    The state is set with GameStates like in the game, step() advances it by one tick and the packet, the field info
+    and the ball prediction are filled in the RLBot structs, which are reused like RLBot does.
+    """
+
+    def __init__(self, num_cars: int = 1, tick_rate: float = 120, teams: List[int] = None, names: List[str] = None):
+        self.tick_rate = tick_rate
+        self.dt = 1 / tick_rate
+        self.teams = teams if teams is not None else [i % 2 for i in range(num_cars)]
+        self.names = names if names is not None else [f'PGBot_{i}' for i in range(num_cars)]
+        self.time = 0.0
+        self.frame = 0
+        self.scores = [0, 0]
+        self.reset()
+        self.packet = GameTickPacket()
+        self.field_info = self._make_field_info()
+        self.ball_prediction = BallPrediction()
+        self._ball_prediction_frame = -1
+        self._write_packet()
+
+    def reset(self):
+        """
+        Puts the cars and the ball back to their defaults and respawns all boost pads, so a following GameState
+        always starts from the same state. Time and scores go on like in a match.
+        """
+        self.cars = [SimCar(team, name) for team, name in zip(self.teams, self.names)]
+        self.ball = SimBall()
+        self.boost_active = [True] * len(STANDARD_BOOST_PADS)
+        self.boost_timers = [0.0] * len(STANDARD_BOOST_PADS)
+
+    @staticmethod
+    def _make_field_info() -> FieldInfoPacket:
+        field_info = FieldInfoPacket()
+        field_info.num_boosts = len(STANDARD_BOOST_PADS)
+        for pad, (x, y, is_full_boost) in zip(field_info.boost_pads, STANDARD_BOOST_PADS):
+            pad.location.x, pad.location.y, pad.location.z = x, y, 73.0 if is_full_boost else 70.0
+            pad.is_full_boost = is_full_boost
+        field_info.num_goals = 2
+        for team, goal in enumerate(field_info.goals[:2]):
+            goal.team_num = team
+            goal.location.y = FIELD_HALF_LENGTH * (1 if team else -1)
+            goal.location.z = GOAL_HEIGHT / 2
+            goal.direction.y = -1 if team else 1
+            goal.width, goal.height = GOAL_HALF_WIDTH * 2, GOAL_HEIGHT
+        return field_info
+
+    def set_game_state(self, game_state: GameState):
+        """Applies a GameState like the game does: everything that is None stays as it is."""
+        if game_state.ball is not None and game_state.ball.physics is not None:
+            _apply_physics(self.ball, game_state.ball.physics)
+        for index, car_state in (game_state.cars or {}).items():
+            car = self.cars[index]
+            if car_state.physics is not None:
+                _apply_physics(car, car_state.physics)
+                rotation = car_state.physics.rotation
+                if rotation is not None and rotation.yaw is not None:
+                    car.yaw = rotation.yaw
+            if car_state.boost_amount is not None:
+                car.boost = float(car_state.boost_amount)
+            if car_state.jumped is not None:
+                car.jumped = car_state.jumped
+        self._write_packet()
+
+    def step(self, controls: Dict[int, SimpleControllerState]):
+        """Advances the game by one tick with the controls of the cars by index, cars without controls coast."""
+        dt = self.dt
+        for index, car in enumerate(self.cars):
+            car.step(controls.get(index) or _NO_CONTROLS, dt)
+        self.ball.step(dt)
+        for car in self.cars:
+            car.hit(self.ball)
+        self._pick_up_boosts(dt)
+        team = self.ball.scored_goal()
+        if team is not None:
+            # the team whose goal the ball is in concedes, the ball is put back to the center
+            self.scores[1 - team] += 1
+            self.ball = SimBall()
+        self.time += dt
+        self.frame += 1
+        self._write_packet()
+
+    def _pick_up_boosts(self, dt: float):
+        for i, (x, y, is_full_boost) in enumerate(STANDARD_BOOST_PADS):
+            if not self.boost_active[i]:
+                self.boost_timers[i] += dt
+                if self.boost_timers[i] >= (FULL_BOOST_RESPAWN_TIME if is_full_boost else SMALL_BOOST_RESPAWN_TIME):
+                    self.boost_active[i] = True
+                    self.boost_timers[i] = 0.0
+                continue
+            radius = FULL_BOOST_PICKUP_RADIUS if is_full_boost else SMALL_BOOST_PICKUP_RADIUS
+            for car in self.cars:
+                if car.boost < 100 and (car.x - x) ** 2 + (car.y - y) ** 2 < radius ** 2:
+                    car.boost = min(car.boost + (100 if is_full_boost else 12), 100.0)
+                    self.boost_active[i] = False
+                    break
+
+    def _write_packet(self):
+        packet = self.packet
+        packet.game_info.seconds_elapsed = self.time
+        packet.game_info.frame_num = self.frame
+        packet.game_info.is_round_active = True
+        packet.game_info.world_gravity_z = GRAVITY
+        packet.game_info.game_speed = 1.0
+        _write_physics(packet.game_ball.physics, self.ball, 0.0)
+        packet.num_cars = len(self.cars)
+        for car, info in zip(self.cars, packet.game_cars):
+            _write_physics(info.physics, car, car.yaw)
+            info.physics.angular_velocity.z = car.yaw_rate
+            info.team = car.team
+            info.name = car.name
+            info.is_bot = True
+            info.boost = int(car.boost)
+            info.has_wheel_contact = car.on_ground
+            info.jumped = car.jumped
+            info.is_super_sonic = car.vx ** 2 + car.vy ** 2 + car.vz ** 2 >= SUPERSONIC_SPEED ** 2
+            info.is_demolished = car.is_demolished
+        packet.num_teams = 2
+        for team in range(2):
+            packet.teams[team].team_index = team
+            packet.teams[team].score = self.scores[team]
+        packet.num_boost = len(STANDARD_BOOST_PADS)
+        for pad, is_active, timer in zip(packet.game_boosts, self.boost_active, self.boost_timers):
+            pad.is_active = is_active
+            pad.timer = timer
+
+    def get_ball_prediction_struct(self) -> BallPrediction:
+        """Predicts the ball without the cars, computed at most once per tick."""
+        if self._ball_prediction_frame != self.frame:
+            ball = SimBall()
+            source = self.ball
+            ball.x, ball.y, ball.z, ball.vx, ball.vy, ball.vz = source.x, source.y, source.z, source.vx, source.vy, \
+                source.vz
+            prediction = self.ball_prediction
+            prediction.num_slices = BALL_PREDICTION_SLICES
+            dt = 1 / BALL_PREDICTION_RATE
+            for i in range(BALL_PREDICTION_SLICES):
+                ball_slice = prediction.slices[i]
+                ball_slice.game_seconds = self.time + i * dt
+                _write_physics(ball_slice.physics, ball, 0.0)
+                ball.step(dt)
+            self._ball_prediction_frame = self.frame
+        return self.ball_prediction
+
+
+_NO_CONTROLS = SimpleControllerState()
+
+
+def _apply_physics(body, physics):
+    for target, vector in (('', physics.location), ('v', physics.velocity)):
+        if vector is None:
+            continue
+        for axis in ('x', 'y', 'z'):
+            value = getattr(vector, axis)
+            if value is not None:
+                setattr(body, target + axis, float(value))
+
+
+def _write_physics(physics, body, yaw: float):
+    location, velocity = physics.location, physics.velocity
+    location.x, location.y, location.z = body.x, body.y, body.z
+    velocity.x, velocity.y, velocity.z = body.vx, body.vy, body.vz
+    physics.rotation.yaw = yaw
@@ -1,15 +1,15 @@
-from typing import Callable
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple, Union
 
+import numpy as np
 from rlbot.utils.structures.ball_prediction_struct import BallPrediction, Slice
 
+from .struct_arrays import struct_array, vector3_view
+from .vec import Vec3
+
 # field length(5120) + ball radius(93) = 5213 however that results in false positives
 GOAL_THRESHOLD = 5235
 
-# We will jump this number of frames when looking for a moment where the ball is inside the goal.
-# Big number for efficiency, but not so big that the ball could go in and then back out during that
-# time span. Unit is the number of frames in the ball prediction, and the prediction is at 60 frames per second.
-GOAL_SEARCH_INCREMENT = 20
-
 
 def find_slice_at_time(ball_prediction: BallPrediction, game_time: float):
     """
@@ -23,13 +23,19 @@ def find_slice_at_time(ball_prediction: BallPrediction, game_time: float):
     return None
 
 
-def predict_future_goal(ball_prediction: BallPrediction):
+def predict_future_goal(ball_prediction: Union[BallPrediction, 'BallPredictionArray']):
     """
     Analyzes the ball prediction to see if the ball will enter one of the goals. Only works on standard arenas.
     Will return the first ball slice which appears to be inside the goal, or None if it does not enter a goal.
+    Every slice is checked, pass a BallPredictionArray that is updated once per tick to avoid copying the prediction
+    again.
     """
-    return find_matching_slice(ball_prediction, 0, lambda s: abs(s.physics.location.y) >= GOAL_THRESHOLD,
-                               search_increment=20)
+    if not isinstance(ball_prediction, BallPredictionArray):
+        ball_prediction = BallPredictionArray(ball_prediction)
+    goal = ball_prediction.find_goal()
+    if goal is None:
+        return None
+    return ball_prediction.slice(goal.index)
 
 
 def find_matching_slice(ball_prediction: BallPrediction, start_index: int, predicate: Callable[[Slice], bool],
@@ -46,3 +52,139 @@ def find_matching_slice(ball_prediction: BallPrediction, start_index: int, predi
                 if predicate(ball_slice):
                     return ball_slice
     return None
+
+
+@dataclass
+class GoalEntry:
+    # index of the first slice inside the goal
+    index: int
+    # game time at which the ball crosses GOAL_THRESHOLD, interpolated between the slices around the crossing
+    time: float
+    # ball location at that time
+    location: Vec3
+    # team whose goal the ball enters: 0 (blue) for negative y, 1 (orange) for positive y
+    team: int
+
+
+class BallPredictionArray:
+    """
+    The slices of a BallPrediction copied into numpy arrays (time, location, velocity), so questions about the whole
+    prediction horizon are answered with a few vectorized operations instead of a Python call per slice.
+    Create it once and call update() with the prediction of every tick, the arrays are reused.
+    """
+
+    def __init__(self, ball_prediction: BallPrediction = None, capacity: int = 360):
+        self.ball_prediction: BallPrediction = None
+        self.num_slices = 0
+        self._allocate(capacity)
+        if ball_prediction is not None:
+            self.update(ball_prediction)
+
+    def update(self, ball_prediction: BallPrediction) -> 'BallPredictionArray':
+        num_slices = ball_prediction.num_slices
+        if num_slices > len(self._time):
+            self._allocate(num_slices)
+        slices = struct_array(ball_prediction.slices, num_slices)
+        physics = slices['physics']
+        self._time[:num_slices] = slices['game_seconds']
+        self._location[:num_slices] = vector3_view(physics['location'])
+        self._velocity[:num_slices] = vector3_view(physics['velocity'])
+        self.ball_prediction = ball_prediction
+        self.num_slices = num_slices
+        return self
+
+    def _allocate(self, capacity: int):
+        self._time = np.zeros(capacity)
+        self._location = np.zeros((capacity, 3))
+        self._velocity = np.zeros((capacity, 3))
+
+    @property
+    def time(self) -> np.ndarray:
+        return self._time[:self.num_slices]
+
+    @property
+    def location(self) -> np.ndarray:
+        return self._location[:self.num_slices]
+
+    @property
+    def velocity(self) -> np.ndarray:
+        return self._velocity[:self.num_slices]
+
+    def slice(self, index: int) -> Slice:
+        return self.ball_prediction.slices[index]
+
+    def index_at_time(self, game_time: float) -> Optional[int]:
+        """Returns the index of the last slice at or before game_time, None if game_time is outside the prediction."""
+        if self.num_slices == 0 or not self.time[0] <= game_time <= self.time[-1]:
+            return None
+        return int(np.searchsorted(self.time, game_time, side='right')) - 1
+
+    def first_index(self, condition: np.ndarray, start_index: int = 0) -> Optional[int]:
+        """
+        Returns the index of the first slice from start_index on for which condition (a boolean array over the slices,
+        e.g. prediction.location[:, 2] < 200) is True, or None.
+        """
+        condition = condition[start_index:self.num_slices]
+        index = int(np.argmax(condition)) if len(condition) else 0
+        if len(condition) == 0 or not condition[index]:
+            return None
+        return start_index + index
+
+    def find_goal(self, goal_threshold: float = GOAL_THRESHOLD) -> Optional[GoalEntry]:
+        """
+        Finds the first slice inside a goal and interpolates the moment the ball crosses the goal threshold. Every
+        slice is checked, so short in-and-out events are not missed.
+        """
+        y = np.abs(self.location[:, 1])
+        index = self.first_index(y >= goal_threshold)
+        if index is None:
+            return None
+        location = self.location[index]
+        time = self.time[index]
+        if index > 0 and y[index] > y[index - 1]:
+            fraction = (goal_threshold - y[index - 1]) / (y[index] - y[index - 1])
+            time = self.time[index - 1] + fraction * (time - self.time[index - 1])
+            location = self.location[index - 1] + fraction * (location - self.location[index - 1])
+        return GoalEntry(index=index, time=float(time), location=Vec3._new(*location.tolist()),
+                         team=int(location[1] > 0))
+
+    def reachable_mask(self, car_location: Vec3, speed: float, current_time: float = None,
+                       radius: float = 0) -> np.ndarray:
+        """
+        Returns for every slice whether a car at car_location driving straight at the given average speed gets within
+        radius of the ball by the time of the slice.
+        """
+        if current_time is None:
+            current_time = self.time[0] if self.num_slices else 0.0
+        offset = self.location - (car_location.x, car_location.y, car_location.z)
+        distance = np.sqrt(np.einsum('ij,ij->i', offset, offset)) - radius
+        return distance <= speed * (self.time - current_time)
+
+    def earliest_intercept(self, car_location: Vec3, speed: float, current_time: float = None,
+                           radius: float = 0) -> Optional[int]:
+        """Returns the index of the first slice the car can reach in time (see reachable_mask), or None."""
+        return self.first_index(self.reachable_mask(car_location, speed, current_time, radius))
+
+    def windows(self, condition: np.ndarray) -> List[Tuple[float, float]]:
+        """
+        Returns the (start time, end time) of every run of consecutive slices for which condition is True.
+        """
+        condition = condition[:self.num_slices]
+        if len(condition) == 0:
+            return []
+        # the runs alternate between the changes of the condition, starting with a True run if the first slice is
+        bounds = [0] + (np.flatnonzero(condition[1:] != condition[:-1]) + 1).tolist() + [len(condition)]
+        time = self._time
+        return [(float(time[bounds[i]]), float(time[bounds[i + 1] - 1]))
+                for i in range(0 if condition[0] else 1, len(bounds) - 1, 2)]
+
+    def height_windows(self, min_height: float, max_height: float = float('inf')) -> List[Tuple[float, float]]:
+        """Returns the time windows in which the ball is between min_height and max_height, e.g. for aerials."""
+        z = self.location[:, 2]
+        return self.windows((z >= min_height) & (z <= max_height))
+
+    def region_windows(self, min_corner: Vec3, max_corner: Vec3) -> List[Tuple[float, float]]:
+        """Returns the time windows in which the ball is inside the axis aligned box between the two corners."""
+        inside = np.all((self.location >= (min_corner.x, min_corner.y, min_corner.z))
+                        & (self.location <= (max_corner.x, max_corner.y, max_corner.z)), axis=1)
+        return self.windows(inside)
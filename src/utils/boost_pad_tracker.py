@@ -1,10 +1,17 @@
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional, Union
 
+import numpy as np
 from rlbot.utils.structures.game_data_struct import GameTickPacket, FieldInfoPacket
 
+from .packet_snapshot import PacketSnapshot
+from .struct_arrays import struct_array, vector3_view
 from .vec import Vec3
 
+# Seconds until a picked up pad is active again
+FULL_BOOST_RESPAWN_TIME = 10.0
+SMALL_BOOST_RESPAWN_TIME = 4.0
+
 
 @dataclass
 class BoostPad:
@@ -19,25 +26,104 @@ class BoostPadTracker:
     This class merges together the boost pad location info with the is_active info so you can access it
     in one convenient list. For it to function correctly, you need to call initialize_boosts once when the
     game has started, and then update_boost_status every frame so that it knows which pads are active.
+
+    The state of the pads is kept in numpy arrays (locations, is_full_boost, is_active, timer, indexed like the pads
+    of the packet), so the queries below check all pads with a few vectorized operations. The queries return pad
+    indices; boost_pads and get_full_boosts still offer the pads as BoostPad objects.
     """
 
     def __init__(self):
-        self.boost_pads: List[BoostPad] = []
-        self._full_boosts_only: List[BoostPad] = []
+        self.locations = np.zeros((0, 3))
+        self.is_full_boost = np.zeros(0, dtype=bool)
+        self.is_active = np.zeros(0, dtype=bool)
+        self.timer = np.zeros(0)
+        self._respawn_time = np.zeros(0)
+        self._boost_pads: List[BoostPad] = None
 
     def initialize_boosts(self, game_info: FieldInfoPacket):
-        raw_boosts = [game_info.boost_pads[i] for i in range(game_info.num_boosts)]
-        self.boost_pads: List[BoostPad] = [BoostPad(Vec3(rb.location), rb.is_full_boost, False, 0) for rb in raw_boosts]
-        # Cache the list of full boosts since they're commonly requested.
-        # They reference the same objects in the boost_pads list.
-        self._full_boosts_only: List[BoostPad] = [bp for bp in self.boost_pads if bp.is_full_boost]
-
-    def update_boost_status(self, packet: GameTickPacket):
-        for i in range(packet.num_boost):
-            our_pad = self.boost_pads[i]
-            packet_pad = packet.game_boosts[i]
-            our_pad.is_active = packet_pad.is_active
-            our_pad.timer = packet_pad.timer
+        raw_boosts = struct_array(game_info.boost_pads, game_info.num_boosts)
+        self.locations = vector3_view(raw_boosts['location']).astype(np.float64)
+        self.is_full_boost = raw_boosts['is_full_boost'].copy()
+        self.is_active = np.zeros(game_info.num_boosts, dtype=bool)
+        self.timer = np.zeros(game_info.num_boosts)
+        self._respawn_time = np.where(self.is_full_boost, FULL_BOOST_RESPAWN_TIME, SMALL_BOOST_RESPAWN_TIME)
+        self._boost_pads = None
+
+    def update_boost_status(self, packet: Union[GameTickPacket, PacketSnapshot]):
+        if isinstance(packet, PacketSnapshot):
+            states = packet.boost_pad_states
+        else:
+            states = struct_array(packet.game_boosts, packet.num_boost)
+        num_pads = min(len(states), len(self.is_active))
+        self.is_active[:num_pads] = states['is_active'][:num_pads]
+        self.timer[:num_pads] = states['timer'][:num_pads]
+        self._boost_pads = None
+
+    @property
+    def boost_pads(self) -> List[BoostPad]:
+        """The pads as BoostPad objects, created on first access after each update."""
+        if self._boost_pads is None:
+            self._boost_pads = [BoostPad(Vec3._new(*location), is_full_boost, is_active, timer)
+                                for location, is_full_boost, is_active, timer
+                                in zip(self.locations.tolist(), self.is_full_boost.tolist(), self.is_active.tolist(),
+                                       self.timer.tolist())]
+        return self._boost_pads
 
     def get_full_boosts(self) -> List[BoostPad]:
-        return self._full_boosts_only
+        boost_pads = self.boost_pads
+        return [boost_pads[i] for i in np.flatnonzero(self.is_full_boost).tolist()]
+
+    def respawn_times(self) -> np.ndarray:
+        """Seconds until each pad is active again, 0 for active pads."""
+        return np.where(self.is_active, 0.0, np.maximum(self._respawn_time - self.timer, 0.0))
+
+    def _available(self, full_boost_only: bool, within_time: float) -> np.ndarray:
+        available = self.is_active if within_time <= 0 else self.respawn_times() <= within_time
+        if full_boost_only:
+            available = available & self.is_full_boost
+        return available
+
+    def _distances(self, location: Vec3) -> np.ndarray:
+        offset = self.locations - (location.x, location.y, location.z)
+        return np.sqrt(np.einsum('ij,ij->i', offset, offset))
+
+    def nearest_active_pad(self, location: Vec3, full_boost_only: bool = False,
+                           within_time: float = 0) -> Optional[int]:
+        """
+        Returns the index of the active pad nearest to location, or None. With within_time, pads that are active
+        again within that many seconds count as well.
+        """
+        distances = np.where(self._available(full_boost_only, within_time), self._distances(location), np.inf)
+        if len(distances) == 0:
+            return None
+        index = int(np.argmin(distances))
+        return index if distances[index] != np.inf else None
+
+    def nearest_active_full_pad(self, location: Vec3, within_time: float = 0) -> Optional[int]:
+        return self.nearest_active_pad(location, full_boost_only=True, within_time=within_time)
+
+    def pads_within(self, location: Vec3, radius: float, active_only: bool = True) -> np.ndarray:
+        """Returns the indices of the pads within radius of location, nearest first."""
+        distances = self._distances(location)
+        inside = distances <= radius
+        if active_only:
+            inside &= self.is_active
+        indices = np.flatnonzero(inside)
+        return indices[np.argsort(distances[indices], kind='stable')]
+
+    def pads_along(self, start: Vec3, end: Vec3, width: float, active_only: bool = True) -> np.ndarray:
+        """
+        Returns the indices of the pads within width of the ground path from start to end, in the order they are
+        passed on the way.
+        """
+        path = np.array((end.x - start.x, end.y - start.y))
+        offset = self.locations[:, :2] - (start.x, start.y)
+        length_squared = float(path @ path)
+        progress = offset @ path / length_squared if length_squared > 0 else np.zeros(len(offset))
+        np.clip(progress, 0, 1, out=progress)
+        closest = offset - progress[:, np.newaxis] * path
+        inside = np.einsum('ij,ij->i', closest, closest) <= width ** 2
+        if active_only:
+            inside &= self.is_active
+        indices = np.flatnonzero(inside)
+        return indices[np.argsort(progress[indices], kind='stable')]
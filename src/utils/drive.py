@@ -1,8 +1,10 @@
 import math
+from typing import Union
 
 from rlbot.utils.structures.game_data_struct import PlayerInfo
 
 from .orientation import Orientation, relative_location
+from .packet_snapshot import CarSnapshot
 from .vec import Vec3
 
 
@@ -19,7 +21,11 @@ def limit_to_safe_range(value: float) -> float:
     return value
 
 
-def steer_toward_target(car: PlayerInfo, target: Vec3) -> float:
-    relative = relative_location(Vec3(car.physics.location), Orientation(car.physics.rotation), target)
+def steer_toward_target(car: Union[PlayerInfo, CarSnapshot], target: Vec3) -> float:
+    if isinstance(car, CarSnapshot):
+        relative = relative_location(car.location, car.orientation, target)
+    else:
+        relative = relative_location(Vec3.from_packet(car.physics.location), Orientation(car.physics.rotation),
+                                     target)
     angle = math.atan2(relative.y, relative.x)
     return limit_to_safe_range(angle * 5)
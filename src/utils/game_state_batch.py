@@ -0,0 +1,129 @@
+from dataclasses import dataclass
+from typing import Iterator, List, Sequence, Union
+
+import numpy as np
+from rlbot.utils.game_state_util import GameState, BallState, CarState, Physics, Vector3, Rotator
+
+from src.utils.vec import LocationArray, UnitSystem
+
+
+@dataclass
+class GameStateBatch:
+    """
+    N starting states of an exercise with one car, one row per state, in Unreal units. Vectors have the shape (N, 3),
+    the car yaw, the boost and the difficulty tier the shape (N,). Velocities of the car and angular velocities are
+    zero like in the exercises.
+    GameState objects are only created on access, batch[i] returns the state of row i, batch[i:j] a smaller batch and
+    iterating yields the states one after another.
+    """
+    ball_location: np.ndarray
+    ball_velocity: np.ndarray
+    car_location: np.ndarray
+    car_yaw: np.ndarray
+    car_boost: np.ndarray
+    # the difficulty tier each state was sampled from, 0 for exercises without tiers
+    tier: np.ndarray
+
+    @staticmethod
+    def from_game_states(states: Sequence[GameState], tiers: Sequence[int] = None) -> 'GameStateBatch':
+        """
+        Stores GameStates of the form the exercises create: the ball and car 0 with a location, a yaw and a boost
+        amount, everything else zero. Raises a ValueError for other states, which a batch cannot hold.
+        """
+        ball_location, ball_velocity, car_location, car_yaw, car_boost = [], [], [], [], []
+        for state in states:
+            ball = state.ball.physics if state.ball is not None else None
+            car = state.cars.get(0) if state.cars is not None else None
+            if ball is None or car is None or car.physics is None or len(state.cars) != 1:
+                raise ValueError('a state needs the physics of the ball and of car 0 and no other cars')
+            physics = car.physics
+            rotation = physics.rotation
+            if not (_is_zero(ball.angular_velocity) and _is_zero(physics.velocity) and
+                    _is_zero(physics.angular_velocity) and rotation is not None and not rotation.pitch and
+                    not rotation.roll):
+                raise ValueError('only the yaw of the car may be set besides the locations and the ball velocity')
+            ball_location.append(_vector(ball.location))
+            ball_velocity.append(_vector(ball.velocity))
+            car_location.append(_vector(physics.location))
+            car_yaw.append(rotation.yaw or 0.0)
+            car_boost.append(car.boost_amount or 0.0)
+        count = len(ball_location)
+        return GameStateBatch(
+            ball_location=np.array(ball_location, dtype=np.float64).reshape(count, 3),
+            ball_velocity=np.array(ball_velocity, dtype=np.float64).reshape(count, 3),
+            car_location=np.array(car_location, dtype=np.float64).reshape(count, 3),
+            car_yaw=np.array(car_yaw, dtype=np.float64),
+            car_boost=np.array(car_boost, dtype=np.float64),
+            tier=np.zeros(count, dtype=np.int64) if tiers is None else np.array(tiers, dtype=np.int64),
+        )
+
+    def __len__(self):
+        return len(self.tier)
+
+    def __getitem__(self, item) -> Union[GameState, 'GameStateBatch']:
+        if isinstance(item, (int, np.integer)):
+            return self.game_state(int(item))
+        return GameStateBatch(
+            ball_location=self.ball_location[item],
+            ball_velocity=self.ball_velocity[item],
+            car_location=self.car_location[item],
+            car_yaw=self.car_yaw[item],
+            car_boost=self.car_boost[item],
+            tier=self.tier[item],
+        )
+
+    def __iter__(self) -> Iterator[GameState]:
+        for i in range(len(self)):
+            yield self.game_state(i)
+
+    def game_state(self, i: int) -> GameState:
+        ball_location = self.ball_location[i].tolist()
+        ball_velocity = self.ball_velocity[i].tolist()
+        car_location = self.car_location[i].tolist()
+        return GameState(
+            ball=BallState(physics=Physics(
+                location=Vector3(*ball_location),
+                velocity=Vector3(*ball_velocity),
+                angular_velocity=Vector3(0, 0, 0)
+            )),
+            cars={
+                0: CarState(
+                    physics=Physics(
+                        location=Vector3(*car_location),
+                        rotation=Rotator(0, float(self.car_yaw[i]), 0),
+                        velocity=Vector3(0, 0, 0),
+                        angular_velocity=Vector3(0, 0, 0)
+                    ),
+                    boost_amount=float(self.car_boost[i])
+                )
+            },
+        )
+
+    def tier_counts(self, num_tiers: int) -> np.ndarray:
+        return np.bincount(self.tier, minlength=num_tiers)
+
+
+def _vector(vector: Vector3) -> List[float]:
+    if vector is None:
+        return [0.0, 0.0, 0.0]
+    return [vector.x or 0.0, vector.y or 0.0, vector.z or 0.0]
+
+
+def _is_zero(vector: Vector3) -> bool:
+    return vector is None or not (vector.x or vector.y or vector.z)
+
+
+def unity_locations(x, y, z) -> np.ndarray:
+    """
+    Stacks Unity coordinates given as arrays or scalars into an (N, 3) array of Unreal locations. Scalars are
+    broadcast to the length of the arrays.
+    """
+    x, y, z = np.broadcast_arrays(*(np.asarray(c, dtype=np.float64) for c in (x, y, z)))
+    return LocationArray(np.stack([x, y, z], axis=-1), UnitSystem.UNITY).to_unreal_units().data
+
+
+def velocities_towards(location: np.ndarray, target: np.ndarray, speed: np.ndarray) -> np.ndarray:
+    """Velocities of the given speeds from each location towards its target, all (N, 3) in Unreal units."""
+    direction = target - location
+    length = np.sqrt(np.einsum('ij,ij->i', direction, direction))
+    return direction / length[:, None] * speed[:, None]
@@ -0,0 +1,160 @@
+import math
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from .ball_prediction_analysis import BallPredictionArray
+from .vec import Vec3
+
+# Rough car model, see https://github.com/RLBot/RLBot/wiki/Useful-Game-Values
+MAX_CAR_SPEED = 2300
+MAX_THROTTLE_SPEED = 1410
+THROTTLE_ACCELERATION = 1000  # average of the throttle acceleration between standstill and MAX_THROTTLE_SPEED
+BOOST_ACCELERATION = 991.667
+BOOST_CONSUMPTION = 33.3  # boost per second
+TURN_RATE = 3.0  # radians per second of a car turning at driving speed
+
+# Distance from the center of the ball at which the car touches it, roughly the ball radius plus half a car
+HIT_RADIUS = 150
+# The car model only drives on the ground, higher balls are not considered
+MAX_INTERCEPT_HEIGHT = 250
+
+
+@dataclass
+class Intercept:
+    # index of the slice in the prediction the intercept was planned on
+    index: int
+    # game time at which the car reaches the ball
+    time: float
+    # ball location at that time
+    location: Vec3
+    # time the car needs to get there, estimated when planning
+    arrival_time: float
+    # time the car has to spare when planning, the time until the intercept minus arrival_time
+    spare_time: float
+
+
+class InterceptPlanner:
+    """
+    Finds the earliest slice of the ball prediction that a car can reach, with a simple model of turning, throttle,
+    boost and the car's current speed evaluated over all slices at once.
+
+    The last intercept is reused on the next ticks as long as it is still valid: the new prediction must still have
+    the ball within location_tolerance of the planned location at the planned time, and the time the car has to spare
+    on its way there must not have changed by more than time_tolerance.
+    """
+
+    def __init__(self, location_tolerance: float = 50, time_tolerance: float = 0.1,
+                 max_height: float = MAX_INTERCEPT_HEIGHT, hit_radius: float = HIT_RADIUS, use_boost: bool = True):
+        self.location_tolerance = location_tolerance
+        self.time_tolerance = time_tolerance
+        self.max_height = max_height
+        self.hit_radius = hit_radius
+        # whether the car boosts on its way, bots that never boost should not plan with it
+        self.use_boost = use_boost
+        self.intercept: Optional[Intercept] = None
+        # number of plans that had to search the prediction, for diagnostics
+        self.num_searches = 0
+
+    def _car_model(self, car):
+        """
+        Returns the unit forward direction of the car on the ground, its forward speed, its acceleration and the
+        top speed it can reach with its boost.
+        """
+        forward, velocity = car.orientation.forward, car.velocity
+        forward_length = max(math.hypot(forward.x, forward.y), 1e-6)
+        forward_x, forward_y = forward.x / forward_length, forward.y / forward_length
+        speed = max(velocity.x * forward_x + velocity.y * forward_y, 0)
+        boost_time = car.boost / BOOST_CONSUMPTION if self.use_boost else 0
+        if boost_time > 0:
+            acceleration = THROTTLE_ACCELERATION + BOOST_ACCELERATION
+            max_speed = min(MAX_CAR_SPEED, MAX_THROTTLE_SPEED + boost_time * BOOST_ACCELERATION)
+        else:
+            acceleration = THROTTLE_ACCELERATION
+            max_speed = MAX_THROTTLE_SPEED
+        return forward_x, forward_y, min(speed, max_speed), acceleration, max_speed
+
+    def arrival_times(self, car, targets: np.ndarray) -> np.ndarray:
+        """
+        Estimates the time the car needs to reach each of the targets (an (N, 3) array) on the ground: turning towards
+        the target first, then accelerating along the straight line up to the top speed. car needs location,
+        velocity, orientation and boost, e.g. a CarSnapshot.
+        """
+        forward_x, forward_y, speed, acceleration, max_speed = self._car_model(car)
+        offset = targets[:, :2] - (car.location.x, car.location.y)
+        offset_length = np.sqrt(np.einsum('ij,ij->i', offset, offset))
+        cos_angle = offset @ (forward_x, forward_y)
+        cos_angle /= np.maximum(offset_length, 1e-6)
+        np.clip(cos_angle, -1, 1, out=cos_angle)
+        distance = np.maximum(offset_length - self.hit_radius, 0)
+        # speed towards the targets after turning, a car that has to turn around loses its speed
+        speed = np.maximum(cos_angle, 0) * speed
+        # accelerating until max_speed is reached, then driving on at max_speed
+        acceleration_distance = (max_speed ** 2 - speed ** 2) / (2 * acceleration)
+        drive_time = np.sqrt(speed ** 2 + 2 * acceleration * np.minimum(distance, acceleration_distance))
+        drive_time -= speed
+        drive_time /= acceleration
+        drive_time += np.maximum(distance - acceleration_distance, 0) / max_speed
+        return np.arccos(cos_angle) / TURN_RATE + drive_time
+
+    def arrival_time(self, car, target: Vec3) -> float:
+        """Same as arrival_times for a single target, without the overhead of numpy."""
+        forward_x, forward_y, speed, acceleration, max_speed = self._car_model(car)
+        offset_x, offset_y = target.x - car.location.x, target.y - car.location.y
+        offset_length = math.hypot(offset_x, offset_y)
+        cos_angle = min(max((offset_x * forward_x + offset_y * forward_y) / max(offset_length, 1e-6), -1), 1)
+        distance = max(offset_length - self.hit_radius, 0)
+        speed = max(cos_angle, 0) * speed
+        acceleration_distance = (max_speed ** 2 - speed ** 2) / (2 * acceleration)
+        drive_time = (math.sqrt(speed ** 2 + 2 * acceleration * min(distance, acceleration_distance)) - speed) / \
+            acceleration + max(distance - acceleration_distance, 0) / max_speed
+        return math.acos(cos_angle) / TURN_RATE + drive_time
+
+    def plan(self, prediction: BallPredictionArray, car, current_time: float) -> Optional[Intercept]:
+        """
+        Returns the earliest intercept of the car with the predicted ball, or None if the car cannot reach the ball
+        within the prediction.
+        """
+        if self.intercept is not None and self._is_valid(prediction, car, current_time):
+            return self.intercept
+        self.intercept = self._search(prediction, car, current_time)
+        return self.intercept
+
+    def invalidate(self):
+        self.intercept = None
+
+    def _search(self, prediction: BallPredictionArray, car, current_time: float) -> Optional[Intercept]:
+        self.num_searches += 1
+        location = prediction.location
+        arrival = self.arrival_times(car, location)
+        reachable = (arrival <= prediction.time - current_time) & (location[:, 2] <= self.max_height)
+        index = prediction.first_index(reachable)
+        if index is None:
+            return None
+        time = float(prediction.time[index])
+        return Intercept(index=index, time=time, location=Vec3._new(*location[index].tolist()),
+                         arrival_time=float(arrival[index]), spare_time=time - current_time - float(arrival[index]))
+
+    def _is_valid(self, prediction: BallPredictionArray, car, current_time: float) -> bool:
+        intercept = self.intercept
+        remaining_time = intercept.time - current_time
+        if remaining_time <= 0:
+            return False
+        index = prediction.index_at_time(intercept.time)
+        if index is None:
+            return False
+        # the ball must still be where it was planned to be, the slices of the new prediction lie between the old ones
+        x, y, z = prediction.location[index].tolist()
+        if index + 1 < prediction.num_slices:
+            time = prediction.time
+            fraction = float((intercept.time - time[index]) / (time[index + 1] - time[index]))
+            next_x, next_y, next_z = prediction.location[index + 1].tolist()
+            x, y, z = x + fraction * (next_x - x), y + fraction * (next_y - y), z + fraction * (next_z - z)
+        planned = intercept.location
+        if (x - planned.x) ** 2 + (y - planned.y) ** 2 + (z - planned.z) ** 2 > self.location_tolerance ** 2:
+            return False
+        # A car that drives as planned keeps its spare time. If it lost time, it may not make it anymore, if it won
+        # time, an earlier intercept may exist.
+        spare_time = remaining_time - self.arrival_time(car, planned)
+        return abs(spare_time - intercept.spare_time) <= self.time_tolerance
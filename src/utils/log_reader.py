@@ -0,0 +1,205 @@
+import json
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass, fields, replace
+from typing import List
+
+import numpy as np
+
+from src.utils.logger import read_frame_file
+
+COLUMNS_SUFFIX = '.columns'
+COLUMNS_VERSION = 1
+COLUMNS_ALIGNMENT = 64
+
+PHYSICS_COLUMNS = ['location', 'rotation', 'velocity', 'angular_velocity']
+
+
+@dataclass
+class CarTrack:
+    """
+    Columns of a single car in a scenario log. Vectors have the shape (frames, 3).
+    """
+    car_id: str
+    time: np.ndarray
+    location: np.ndarray
+    rotation: np.ndarray
+    velocity: np.ndarray
+    angular_velocity: np.ndarray
+    boost: np.ndarray
+    has_wheel_contact: np.ndarray
+    jumped: np.ndarray
+
+
+@dataclass
+class ScenarioLog:
+    """
+    Columnar view of the log of a test scenario, in the Unity units of the JSON log. Car columns have the shape
+    (frames, cars, ...) with the cars in the order of car_ids, ball vectors have the shape (frames, 3).
+    The arrays are usually memory mapped, so only the parts that are accessed are read from disk.
+    """
+    car_ids: List[str]
+    time: np.ndarray
+    car_location: np.ndarray
+    car_rotation: np.ndarray
+    car_velocity: np.ndarray
+    car_angular_velocity: np.ndarray
+    car_boost: np.ndarray
+    car_has_wheel_contact: np.ndarray
+    car_jumped: np.ndarray
+    ball_location: np.ndarray
+    ball_rotation: np.ndarray
+    ball_velocity: np.ndarray
+    ball_angular_velocity: np.ndarray
+
+    def __len__(self):
+        return len(self.time)
+
+    def time_slice(self, start_time: float = None, end_time: float = None) -> 'ScenarioLog':
+        """
+        Returns the frames with start_time <= time < end_time. The times of a log are sorted, so this is a binary
+        search and the returned columns are views.
+        """
+        start = 0 if start_time is None else int(np.searchsorted(self.time, start_time, side='left'))
+        end = len(self.time) if end_time is None else int(np.searchsorted(self.time, end_time, side='left'))
+        return self.frame_slice(start, end)
+
+    def frame_slice(self, start: int, end: int) -> 'ScenarioLog':
+        columns = {f.name: getattr(self, f.name)[start:end] for f in fields(self) if f.name != 'car_ids'}
+        return replace(self, **columns)
+
+    def car_index(self, car_id: str) -> int:
+        return self.car_ids.index(car_id)
+
+    def car(self, car_id: str) -> CarTrack:
+        i = self.car_index(car_id)
+        return CarTrack(
+            car_id=car_id,
+            time=self.time,
+            location=self.car_location[:, i],
+            rotation=self.car_rotation[:, i],
+            velocity=self.car_velocity[:, i],
+            angular_velocity=self.car_angular_velocity[:, i],
+            boost=self.car_boost[:, i],
+            has_wheel_contact=self.car_has_wheel_contact[:, i],
+            jumped=self.car_jumped[:, i],
+        )
+
+
+def open_log(path: str) -> ScenarioLog:
+    """
+    Opens a scenario log as a ScenarioLog. Frame files of the FrameRecorder are memory mapped directly. JSON logs are
+    converted once into a columnar sidecar directory (<log>.columns) next to them, which is memory mapped on every
+    later call as long as the JSON file did not change.
+    """
+    if not path.endswith('.json'):
+        return _open_frame_file(path)
+    columns_path = path + COLUMNS_SUFFIX
+    log = _open_columns(columns_path, path)
+    if log is None:
+        write_columns(_read_json_log(path), columns_path, path)
+        log = _open_columns(columns_path, path)
+    return log
+
+
+def _open_frame_file(path: str) -> ScenarioLog:
+    header, frames = read_frame_file(path)
+    cars = frames['game_cars']
+    ball = frames['game_ball']['physics']
+    columns = dict(
+        car_ids=header['car_ids'],
+        time=frames['time'],
+        car_boost=cars['boost'],
+        car_has_wheel_contact=cars['has_wheel_contact'],
+        car_jumped=cars['jumped'],
+    )
+    for name in PHYSICS_COLUMNS:
+        columns['car_' + name] = cars['physics'][name]
+        columns['ball_' + name] = ball[name]
+    return ScenarioLog(**columns)
+
+
+def _source_stamp(source_path: str) -> dict:
+    stat = os.stat(source_path)
+    return {'source_size': stat.st_size, 'source_mtime_ns': stat.st_mtime_ns}
+
+
+def _open_columns(columns_path: str, source_path: str):
+    try:
+        with open(os.path.join(columns_path, 'meta.json')) as meta_file:
+            meta = json.load(meta_file)
+    except (OSError, ValueError):
+        return None
+    if meta.get('version') != COLUMNS_VERSION or meta.get('source') != _source_stamp(source_path):
+        return None
+    data_path = os.path.join(columns_path, 'columns.bin')
+    data = np.empty(0, dtype=np.uint8)
+    if os.path.getsize(data_path) > 0:
+        data = np.memmap(data_path, dtype=np.uint8, mode='r')
+    columns = {}
+    for name, (dtype, shape, offset) in meta['columns'].items():
+        dtype = np.dtype(dtype)
+        count = int(np.prod(shape))
+        columns[name] = np.frombuffer(data, dtype=dtype, count=count, offset=offset).reshape(shape)
+    return ScenarioLog(car_ids=meta['car_ids'], **columns)
+
+
+def write_columns(log: ScenarioLog, columns_path: str, source_path: str):
+    """
+    Writes the columnar sidecar of a log: all columns one after another in columns.bin and their layout in meta.json.
+    It is written to a temporary directory first and then moved into place, so concurrent readers never see a half
+    written sidecar.
+    """
+    parent = os.path.dirname(os.path.abspath(columns_path))
+    tmp_path = tempfile.mkdtemp(dir=parent, prefix='.columns-')
+    layout = {}
+    offset = 0
+    with open(os.path.join(tmp_path, 'columns.bin'), 'wb') as data_file:
+        for f in fields(log):
+            if f.name == 'car_ids':
+                continue
+            column = np.ascontiguousarray(getattr(log, f.name))
+            # keep every column aligned for the memory mapped views
+            padding = -offset % COLUMNS_ALIGNMENT
+            data_file.write(b'\0' * padding)
+            offset += padding
+            layout[f.name] = (column.dtype.str, list(column.shape), offset)
+            data_file.write(column.tobytes())
+            offset += column.nbytes
+    with open(os.path.join(tmp_path, 'meta.json'), 'w') as meta_file:
+        json.dump({'version': COLUMNS_VERSION, 'car_ids': log.car_ids, 'columns': layout,
+                   'source': _source_stamp(source_path)}, meta_file)
+    shutil.rmtree(columns_path, ignore_errors=True)
+    try:
+        os.rename(tmp_path, columns_path)
+    except OSError:
+        # another process wrote the sidecar in the meantime
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+
+def _vectors(objects, name) -> list:
+    return [(v['x'], v['y'], v['z']) for v in (o['physics'][name] for o in objects)]
+
+
+def _read_json_log(path: str) -> ScenarioLog:
+    with open(path) as logfile:
+        frames = json.load(logfile)['frames']
+    num_frames = len(frames)
+    car_ids = [car['id'] for car in frames[0]['game_cars']] if frames else []
+    num_cars = len(car_ids)
+
+    cars = [car for frame in frames for car in frame['game_cars']]
+    balls = [frame['game_ball'] for frame in frames]
+    columns = dict(
+        car_ids=car_ids,
+        time=np.array([frame['time'] for frame in frames], dtype=np.float64),
+        car_boost=np.array([car['boost'] for car in cars], dtype=np.int32).reshape(num_frames, num_cars),
+        car_has_wheel_contact=np.array([car['has_wheel_contact'] for car in cars],
+                                       dtype=bool).reshape(num_frames, num_cars),
+        car_jumped=np.array([car['jumped'] for car in cars], dtype=bool).reshape(num_frames, num_cars),
+    )
+    for name in PHYSICS_COLUMNS:
+        columns['car_' + name] = np.array(_vectors(cars, name), dtype=np.float64).reshape(num_frames, num_cars, 3)
+        columns['ball_' + name] = np.array(_vectors(balls, name), dtype=np.float64).reshape(num_frames, 3)
+    return ScenarioLog(**columns)
@@ -1,10 +1,17 @@
+import ctypes
 import json
 import os
+import queue
+import struct
+import textwrap
+import threading
 import time
 
+import numpy as np
 from rlbot.utils.structures.game_data_struct import GameTickPacket, PlayerInfo, BallInfo, Physics as PhysicsInfo
+from src.utils.struct_arrays import struct_dtype
 from src.utils.vec import Vec3, Location, EulerAngles, Velocity, AngularVelocity, Quaternion
-from typing import Union
+from typing import Union, Tuple, List
 
 
 class Logger:
@@ -71,3 +78,269 @@ class ComplexEncoder(json.JSONEncoder):
                     result[slot] = getattr(obj, slot)
             return result
         return json.JSONEncoder.default(self, obj)
+
+
+FRAME_FILE_MAGIC = b'RLBF'
+FRAME_FILE_VERSION = 1
+# The records start at a multiple of this so the file can be memory mapped with aligned records
+FRAME_FILE_ALIGNMENT = 64
+
+# Physics in Unity units as written to the frame file: locations and velocities in uu / 100 with the axes swapped,
+# rotations as Euler angles in degrees, the same values the Logger writes to the JSON file.
+PHYSICS_DTYPE = np.dtype([
+    ('location', '<f8', (3,)),
+    ('rotation', '<f8', (3,)),
+    ('velocity', '<f8', (3,)),
+    ('angular_velocity', '<f8', (3,)),
+])
+
+CAR_DTYPE = np.dtype([
+    ('physics', PHYSICS_DTYPE),
+    ('has_wheel_contact', '?'),
+    ('jumped', '?'),
+    ('boost', '<i4'),
+])
+
+
+def frame_dtype(num_cars: int) -> np.dtype:
+    """
+    Returns the fixed record layout of one frame in a frame file with the given number of cars.
+    """
+    return np.dtype([
+        ('time', '<f8'),
+        ('game_cars', CAR_DTYPE, (num_cars,)),
+        ('game_ball', [('physics', PHYSICS_DTYPE)]),
+    ])
+
+
+def _raw_frame_dtype(num_cars: int) -> np.dtype:
+    # The packet data as it is copied on the tick thread, converted to frame_dtype by the writer thread
+    return np.dtype([
+        ('time', '<f8'),
+        ('game_cars', struct_dtype(PlayerInfo), (num_cars,)),
+        ('game_ball', struct_dtype(PhysicsInfo)),
+    ])
+
+
+class FrameRecorder:
+    """
+    Records the game packets of a scenario to a binary frame file while the scenario runs. Each tick only copies the
+    packet data into a preallocated chunk, a background writer thread converts full chunks to Unity units and appends
+    them to the file. At most max_pending_chunks chunks are buffered, after that log() waits for the writer.
+    If the writer fails, e.g. because the disk is full, it stops and log(), dump() and join() raise its error instead
+    of waiting for it.
+
+    The frame file can be converted to the JSON format of the Logger with convert_to_json. If json_path is given this
+    is done by the writer thread after dump().
+    """
+
+    def __init__(self, record_path: str, json_path: str = None, chunk_size: int = 120, max_pending_chunks: int = 16):
+        self.record_path = record_path
+        self.json_path = json_path
+        self.chunk_size = chunk_size
+        self.start_time = time.time()
+        self.was_dumped = False
+        self.num_frames = 0
+        self._queue = queue.Queue(maxsize=max_pending_chunks)
+        self._writer: threading.Thread = None
+        self._error: Exception = None
+        self._chunk: np.ndarray = None
+        self._count = 0
+        self._num_cars = 0
+        self._frame_size = 0
+        self._cars_offset = self._cars_size = 0
+        self._ball_offset = self._ball_size = 0
+
+    def log(self, packet: GameTickPacket):
+        self._raise_error()
+        if self._writer is None:
+            self._start(packet)
+
+        # Plain memory copies of the packet structs, everything else is done by the writer thread
+        frame_address = self._chunk_address + self._count * self._frame_size
+        self._times[self._count] = time.time() - self.start_time
+        ctypes.memmove(frame_address + self._cars_offset, ctypes.addressof(packet.game_cars), self._cars_size)
+        ctypes.memmove(frame_address + self._ball_offset, ctypes.addressof(packet.game_ball.physics),
+                       self._ball_size)
+        self._count += 1
+        self.num_frames += 1
+        if self._count == self.chunk_size:
+            self._put(self._chunk)
+            self._new_chunk(self._chunk.dtype)
+
+    def dump(self):
+        """
+        Hands the remaining frames to the writer thread and lets it close the file. Does not wait for the writer.
+        """
+        self.was_dumped = True
+        if self._writer is None:
+            self._start(None)
+        if self._count > 0:
+            self._put(self._chunk[:self._count])
+        self._put(None)
+
+    def join(self, timeout: float = None):
+        """
+        Waits until the writer thread has written (and converted) everything.
+        """
+        if self._writer is not None:
+            self._writer.join(timeout)
+        self._raise_error()
+
+    def _raise_error(self):
+        if self._error is not None:
+            raise self._error
+
+    def _put(self, raw_frames):
+        # a writer that failed takes nothing from the queue anymore, so a full queue is checked for its error
+        while True:
+            self._raise_error()
+            try:
+                self._queue.put(raw_frames, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def _start(self, packet: GameTickPacket):
+        car_ids = []
+        if packet is not None:
+            self._num_cars = packet.num_cars
+            car_ids = [packet.game_cars[i].name.replace('PGBot_', '') for i in range(packet.num_cars)]
+        dtype = _raw_frame_dtype(self._num_cars)
+        self._frame_size = dtype.itemsize
+        self._cars_offset = dtype.fields['game_cars'][1]
+        self._cars_size = dtype['game_cars'].itemsize
+        self._ball_offset = dtype.fields['game_ball'][1]
+        self._ball_size = dtype['game_ball'].itemsize
+        self._new_chunk(dtype)
+        self._writer = threading.Thread(target=self._write, args=(car_ids,), daemon=True)
+        self._writer.start()
+
+    def _new_chunk(self, dtype: np.dtype):
+        self._chunk = np.empty(self.chunk_size, dtype=dtype)
+        self._chunk_address = self._chunk.ctypes.data
+        self._times = self._chunk['time']
+        self._count = 0
+
+    def _write(self, car_ids: List[str]):
+        try:
+            with open(self.record_path, 'wb') as record_file:
+                write_frame_file_header(record_file, car_ids)
+                while True:
+                    raw_frames = self._queue.get()
+                    if raw_frames is None:
+                        break
+                    record_file.write(convert_raw_frames(raw_frames).tobytes())
+            if self.json_path is not None:
+                convert_to_json(self.record_path, self.json_path)
+        except Exception as error:
+            self._error = error
+
+
+def _to_unity_physics(raw: np.ndarray, physics: np.ndarray):
+    """
+    Converts raw packet physics to Unity units with the same arithmetic as the to_unity_units methods in vec.py.
+    """
+    for name in ('location', 'velocity'):
+        vector = raw[name]
+        physics[name][..., 0] = vector['y'].astype(np.float64) / 100
+        physics[name][..., 1] = vector['z'].astype(np.float64) / 100
+        physics[name][..., 2] = vector['x'].astype(np.float64) / 100
+    angular_velocity = raw['angular_velocity']
+    physics['angular_velocity'][..., 0] = angular_velocity['y']
+    physics['angular_velocity'][..., 1] = angular_velocity['z']
+    physics['angular_velocity'][..., 2] = angular_velocity['x']
+    rotation = raw['rotation']
+    for i, name in enumerate(('pitch', 'yaw', 'roll')):
+        degrees = rotation[name].astype(np.float64) / np.pi * 180
+        physics['rotation'][..., i] = (degrees > 0) * 360 - degrees
+
+
+def convert_raw_frames(raw_frames: np.ndarray) -> np.ndarray:
+    """
+    Converts frames copied from the packets into the Unity unit records of the frame file.
+    """
+    num_cars = raw_frames.dtype['game_cars'].shape[0]
+    frames = np.empty(len(raw_frames), dtype=frame_dtype(num_cars))
+    frames['time'] = raw_frames['time']
+    raw_cars = raw_frames['game_cars']
+    cars = frames['game_cars']
+    _to_unity_physics(raw_cars['physics'], cars['physics'])
+    cars['has_wheel_contact'] = raw_cars['has_wheel_contact']
+    cars['jumped'] = raw_cars['jumped']
+    cars['boost'] = raw_cars['boost']
+    _to_unity_physics(raw_frames['game_ball'], frames['game_ball']['physics'])
+    return frames
+
+
+def write_frame_file_header(record_file, car_ids: List[str]):
+    header = json.dumps({'version': FRAME_FILE_VERSION, 'num_cars': len(car_ids), 'car_ids': car_ids}).encode()
+    padding = -(len(FRAME_FILE_MAGIC) + 4 + len(header)) % FRAME_FILE_ALIGNMENT
+    header += b' ' * padding
+    record_file.write(FRAME_FILE_MAGIC)
+    record_file.write(struct.pack('<I', len(header)))
+    record_file.write(header)
+
+
+def read_frame_file(record_path: str) -> Tuple[dict, np.ndarray]:
+    """
+    Returns the header and the memory mapped frames of a frame file written by the FrameRecorder.
+    """
+    with open(record_path, 'rb') as record_file:
+        if record_file.read(len(FRAME_FILE_MAGIC)) != FRAME_FILE_MAGIC:
+            raise ValueError(f'{record_path} is not a frame file')
+        header_length = struct.unpack('<I', record_file.read(4))[0]
+        header = json.loads(record_file.read(header_length))
+    if header['version'] != FRAME_FILE_VERSION:
+        raise ValueError(f'Unsupported frame file version {header["version"]}')
+    dtype = frame_dtype(header['num_cars'])
+    offset = len(FRAME_FILE_MAGIC) + 4 + header_length
+    num_frames = (os.path.getsize(record_path) - offset) // dtype.itemsize
+    if num_frames == 0:
+        return header, np.empty(0, dtype=dtype)
+    frames = np.memmap(record_path, dtype=dtype, mode='r', offset=offset, shape=(num_frames,))
+    return header, frames
+
+
+def _vector_dict(vector: np.ndarray) -> dict:
+    x, y, z = vector.tolist()
+    return {'x': x, 'y': y, 'z': z}
+
+
+def _physics_dict(physics: np.void) -> dict:
+    return {
+        'location': _vector_dict(physics['location']),
+        'rotation': _vector_dict(physics['rotation']),
+        'velocity': _vector_dict(physics['velocity']),
+        'angular_velocity': _vector_dict(physics['angular_velocity']),
+    }
+
+
+def convert_to_json(record_path: str, json_path: str):
+    """
+    Writes a frame file as JSON in exactly the format of Logger.dump, so the RoboLeague comparison tooling can read
+    it. The frames are written one after another instead of building the whole document in memory.
+    """
+    header, frames = read_frame_file(record_path)
+    car_ids = header['car_ids']
+    with open(json_path, 'w') as logfile:
+        if len(frames) == 0:
+            logfile.write('{\n    "frames": []\n}')
+            return
+        logfile.write('{\n    "frames": [\n')
+        for i, frame in enumerate(frames):
+            frame_dict = {
+                'time': float(frame['time']),
+                'game_cars': [{
+                    'physics': _physics_dict(car['physics']),
+                    'has_wheel_contact': bool(car['has_wheel_contact']),
+                    'jumped': bool(car['jumped']),
+                    'boost': int(car['boost']),
+                    'id': car_ids[j],
+                } for j, car in enumerate(frame['game_cars'])],
+                'game_ball': {'physics': _physics_dict(frame['game_ball']['physics'])},
+            }
+            if i > 0:
+                logfile.write(',\n')
+            logfile.write(textwrap.indent(json.dumps(frame_dict, indent=4), ' ' * 8))
+        logfile.write('\n    ]\n}')
@@ -0,0 +1,84 @@
+import numpy as np
+from rlbot.utils.structures.game_data_struct import GameTickPacket
+
+from src.utils.orientation import Orientation
+
+# Number of floats in the observation the RoboLeague agents are trained on.
+OBSERVATION_SIZE = 20
+
+# Vec3.__truediv__ multiplies with the reciprocal, keep that to stay bit-identical.
+_ANGULAR_VELOCITY_SCALE = 1 / 5.5
+_BALL_VELOCITY_SCALE = 1 / float(60)
+
+
+class ObservationBuilder:
+    """
+    Builds the observation vector for the ONNX models directly from the GameTickPacket. The values are written
+    unit-converted (Unreal -> Unity) and normalized into a single preallocated float32 buffer, so no intermediate
+    Location / Velocity objects are created each tick. The rotation quaternion is the one of the given Orientation of
+    the car, e.g. the one of its CarSnapshot, or of an Orientation built for this observation.
+
+    The layout of the observation is:
+
+    * 0:3   car location
+    * 3:7   car rotation (quaternion)
+    * 7:10  car velocity
+    * 10:13 car angular velocity
+    * 13:16 ball location
+    * 16:19 ball velocity
+    * 19    boost
+    """
+
+    def __init__(self, buffer: np.ndarray = None):
+        """
+        :param buffer: optional float32 array of shape (1, OBSERVATION_SIZE) to write into, e.g. a bound model input.
+        """
+        if buffer is None:
+            buffer = np.zeros(shape=(1, OBSERVATION_SIZE), dtype=np.float32)
+        self.buffer = buffer
+        self._row = buffer[0]
+
+    def build(self, packet: GameTickPacket, index: int, orientation: Orientation = None) -> np.ndarray:
+        """
+        Writes the observation of the car at index into the buffer and returns the buffer.
+        orientation is the one of the car in this packet if the caller already has it.
+        The arithmetic mirrors Location/Velocity/Quaternion/AngularVelocity.to_unity_units().obs_normalized() so the
+        result is identical to building the observation with the vec classes.
+        """
+        car = packet.game_cars[index]
+        car_physics = car.physics
+        ball_physics = packet.game_ball.physics
+
+        location = car_physics.location
+        velocity = car_physics.velocity
+        angular_velocity = car_physics.angular_velocity
+        ball_location = ball_physics.location
+        ball_velocity = ball_physics.velocity
+        if orientation is None:
+            orientation = Orientation(car_physics.rotation)
+        rotation = orientation.quaternion
+
+        # Unreal (x, y, z) -> Unity (y, z, x), see the to_unity_units methods in vec.py
+        self._row[:] = (
+            (location.y / 100 + 60) / 120,
+            location.z / 100 / 20,
+            (location.x / 100 + 41) / 82,
+            rotation.y,
+            rotation.z,
+            rotation.x,
+            rotation.w,
+            velocity.y / 100 / 23,
+            velocity.z / 100 / 23,
+            velocity.x / 100 / 23,
+            angular_velocity.y * _ANGULAR_VELOCITY_SCALE,
+            angular_velocity.z * _ANGULAR_VELOCITY_SCALE,
+            angular_velocity.x * _ANGULAR_VELOCITY_SCALE,
+            (ball_location.y / 100 + 60) / 120,
+            ball_location.z / 100 / 20,
+            (ball_location.x / 100 + 41) / 82,
+            ball_velocity.y / 100 * _BALL_VELOCITY_SCALE,
+            ball_velocity.z / 100 * _BALL_VELOCITY_SCALE,
+            ball_velocity.x / 100 * _BALL_VELOCITY_SCALE,
+            car.boost / 100,
+        )
+        return self.buffer
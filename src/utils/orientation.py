@@ -1,6 +1,6 @@
 import math
 
-from .vec import Vec3
+from .vec import Vec3, Quaternion
 
 
 # This is a helper class for calculating directions relative to your car. You can extend it or delete if you want.
@@ -9,12 +9,17 @@ class Orientation:
     This class describes the orientation of an object from the rotation of the object.
     Use this to find the direction of cars: forward, right, up.
     It can also be used to find relative locations.
+
+    forward, right and up are the columns of the rotation matrix. The quaternion of the rotation, as used in the
+    observations (see Quaternion(rotator)), is computed on first access.
+    Use the orientation of a CarSnapshot to share one Orientation between all users of a car in a tick.
     """
 
     def __init__(self, rotation):
         self.yaw = float(rotation.yaw)
         self.roll = float(rotation.roll)
         self.pitch = float(rotation.pitch)
+        self._quaternion: Quaternion = None
 
         cr = math.cos(self.roll)
         sr = math.sin(self.roll)
@@ -23,9 +28,48 @@ class Orientation:
         cy = math.cos(self.yaw)
         sy = math.sin(self.yaw)
 
-        self.forward = Vec3(cp * cy, cp * sy, sp)
-        self.right = Vec3(cy*sp*sr-cr*sy, sy*sp*sr+cr*cy, -cp*sr)
-        self.up = Vec3(-cr*cy*sp-sr*sy, -cr*sy*sp+sr*cy, cp*cr)
+        self.forward = Vec3._new(cp * cy, cp * sy, sp)
+        self.right = Vec3._new(cy*sp*sr-cr*sy, sy*sp*sr+cr*cy, -cp*sr)
+        self.up = Vec3._new(-cr*cy*sp-sr*sy, -cr*sy*sp+sr*cy, cp*cr)
+
+    @property
+    def quaternion(self) -> Quaternion:
+        if self._quaternion is None:
+            self._quaternion = Quaternion(self)
+        return self._quaternion
+
+    @staticmethod
+    def from_quaternion(quaternion: Quaternion) -> 'Orientation':
+        """
+        Creates the orientation of a quaternion as returned by Quaternion(rotator), without converting to Euler angles
+        first. Those quaternions follow a right-handed convention; in the left-handed game coordinates the same
+        rotation is the one of (-x, -y, z, w).
+        """
+        q = quaternion
+        (fx, rx, ux), (fy, ry, uy), (fz, rz, uz) = Quaternion._new(-q.x, -q.y, q.z, q.w).to_matrix()
+        ori = Orientation.__new__(Orientation)
+        ori.forward = Vec3._new(fx, fy, fz)
+        ori.right = Vec3._new(rx, ry, rz)
+        ori.up = Vec3._new(ux, uy, uz)
+        ori.pitch = math.asin(max(-1.0, min(1.0, fz)))
+        ori.yaw = math.atan2(fy, fx)
+        ori.roll = math.atan2(-rz, uz)
+        ori._quaternion = quaternion
+        return ori
+
+    def matrix(self):
+        """Returns the rotation matrix as a tuple of three rows."""
+        f, r, u = self.forward, self.right, self.up
+        return (f.x, r.x, u.x), (f.y, r.y, u.y), (f.z, r.z, u.z)
+
+    def to_world(self, local: Vec3) -> Vec3:
+        """Rotates a vector given in the frame of the object (x forward, y right, z up) into world coordinates."""
+        f, r, u = self.forward, self.right, self.up
+        return Vec3._new(
+            f.x * local.x + r.x * local.y + u.x * local.z,
+            f.y * local.x + r.y * local.y + u.y * local.z,
+            f.z * local.x + r.z * local.y + u.z * local.z
+        )
 
 
 # Sometimes things are easier, when everything is seen from your point of view.
@@ -41,7 +85,8 @@ def relative_location(center: Vec3, ori: Orientation, target: Vec3) -> Vec3:
     * y: how far right
     * z: how far above
     """
-    x = (target - center).dot(ori.forward)
-    y = (target - center).dot(ori.right)
-    z = (target - center).dot(ori.up)
-    return Vec3(x, y, z)
+    offset = target - center
+    x = offset.dot(ori.forward)
+    y = offset.dot(ori.right)
+    z = offset.dot(ori.up)
+    return Vec3._new(x, y, z)
@@ -0,0 +1,225 @@
+from typing import List
+
+import numpy as np
+from rlbot.utils.structures.game_data_struct import GameTickPacket, PlayerInfo, BallInfo
+
+from .orientation import Orientation
+from .proximity import Proximity
+from .struct_arrays import struct_array, vector3_view
+from .vec import Vec3
+
+
+class PhysicsSnapshot:
+    """
+    Lazy view on the physics of a car or the ball in one tick. Every value is converted on first access and then
+    remembered until the snapshot is updated with the next packet.
+    """
+    __slots__ = ['physics', '_location', '_velocity', '_angular_velocity', '_orientation']
+
+    def __init__(self):
+        self.physics = None
+        self._location: Vec3 = None
+        self._velocity: Vec3 = None
+        self._angular_velocity: Vec3 = None
+        self._orientation: Orientation = None
+
+    def _reset(self, physics):
+        self.physics = physics
+        self._location = None
+        self._velocity = None
+        self._angular_velocity = None
+        self._orientation = None
+
+    @property
+    def location(self) -> Vec3:
+        if self._location is None:
+            self._location = Vec3.from_packet(self.physics.location)
+        return self._location
+
+    @property
+    def velocity(self) -> Vec3:
+        if self._velocity is None:
+            self._velocity = Vec3.from_packet(self.physics.velocity)
+        return self._velocity
+
+    @property
+    def angular_velocity(self) -> Vec3:
+        if self._angular_velocity is None:
+            self._angular_velocity = Vec3.from_packet(self.physics.angular_velocity)
+        return self._angular_velocity
+
+    @property
+    def orientation(self) -> Orientation:
+        if self._orientation is None:
+            self._orientation = Orientation(self.physics.rotation)
+        return self._orientation
+
+
+class CarSnapshot(PhysicsSnapshot):
+    """
+    Lazy view on one car in one tick. info is the PlayerInfo of the packet for everything that is not converted.
+    """
+    __slots__ = ['index', 'info', '_tick', '_packet', '_physics']
+
+    def __init__(self, index: int):
+        super().__init__()
+        self.index = index
+        self.info: PlayerInfo = None
+        self._tick = -1
+        # ctypes creates a new object on every access of a struct field, the ones of the packet are kept instead
+        self._packet: GameTickPacket = None
+        self._physics = None
+
+    @property
+    def team(self) -> int:
+        return self.info.team
+
+    @property
+    def boost(self) -> int:
+        return self.info.boost
+
+
+class BallSnapshot(PhysicsSnapshot):
+    __slots__ = ['info']
+
+    def __init__(self):
+        super().__init__()
+        self.info: BallInfo = None
+
+
+class PacketSnapshot:
+    """
+    Per tick cache of the GameTickPacket for the bot and its helpers. Call update() with the packet at the start of
+    get_output and pass the snapshot to the helpers (steer_toward_target, BoostPadTracker, SpikeWatcher, ...). Car and
+    ball values are converted to Vec3 / Orientation on first access only and shared by everyone for the rest of the
+    tick. The snapshot, its car views, the ctypes objects of the packet and the arrays below are reused between ticks,
+    so the arrays returned by car_locations, car_velocities and proximity are overwritten by the next update.
+    """
+
+    def __init__(self, packet: GameTickPacket = None):
+        self.packet: GameTickPacket = None
+        self.tick = 0
+        self.ball = BallSnapshot()
+        self._cars = []
+        self._ball_physics = None
+        self._boost_pad_states: np.ndarray = None
+        self._car_array: np.ndarray = None
+        self._num_cars = -1
+        # float32 views of the packet, the float64 buffers they are copied into and the tick the copy was made in
+        self._car_location_view: np.ndarray = None
+        self._car_velocity_view: np.ndarray = None
+        self._car_locations: np.ndarray = None
+        self._car_velocities: np.ndarray = None
+        self._car_locations_tick = -1
+        self._car_velocities_tick = -1
+        self._proximity = Proximity()
+        self._proximity_tick = -1
+        if packet is not None:
+            self.update(packet)
+
+    def update(self, packet: GameTickPacket) -> 'PacketSnapshot':
+        if packet is not self.packet:
+            # RLBot reuses one packet object, so the views usually survive between ticks
+            self.ball.info = packet.game_ball
+            self._ball_physics = self.ball.info.physics
+            self._boost_pad_states = None
+            self._car_array = None
+            self._num_cars = -1
+        self.packet = packet
+        self.tick += 1
+        if packet.num_cars != self._num_cars:
+            self._resize_car_arrays(packet.num_cars)
+        self.ball._reset(self._ball_physics)
+        return self
+
+    def _resize_car_arrays(self, num_cars: int):
+        cars = struct_array(self.packet.game_cars)
+        self._car_array = cars[:num_cars]
+        self._car_location_view = vector3_view(cars['physics']['location'])[:num_cars]
+        self._car_velocity_view = vector3_view(cars['physics']['velocity'])[:num_cars]
+        self._car_locations = np.empty((num_cars, 3))
+        self._car_velocities = np.empty((num_cars, 3))
+        self._car_locations_tick = self._car_velocities_tick = -1
+        self._num_cars = num_cars
+
+    @property
+    def time(self) -> float:
+        return self.packet.game_info.seconds_elapsed
+
+    @property
+    def num_cars(self) -> int:
+        return self.packet.num_cars
+
+    def car(self, index: int) -> CarSnapshot:
+        cars = self._cars
+        while len(cars) <= index:
+            cars.append(CarSnapshot(len(cars)))
+        car = cars[index]
+        if car._tick != self.tick:
+            if car._packet is not self.packet:
+                car.info = self.packet.game_cars[index]
+                car._physics = car.info.physics
+                car._packet = self.packet
+            car._reset(car._physics)
+            car._tick = self.tick
+        return car
+
+    def cars(self):
+        """Yields the views of all cars of this tick."""
+        for i in range(self.packet.num_cars):
+            yield self.car(i)
+
+    @property
+    def car_array(self) -> np.ndarray:
+        """
+        Structured array of the PlayerInfos of this tick (see struct_dtype), viewing the packet's memory directly.
+        """
+        return self._car_array
+
+    @property
+    def car_locations(self) -> np.ndarray:
+        """
+        Locations of all cars of this tick as a (num_cars, 3) float64 array, for vectorized distance checks.
+        """
+        if self._car_locations_tick != self.tick:
+            np.copyto(self._car_locations, self._car_location_view)
+            self._car_locations_tick = self.tick
+        return self._car_locations
+
+    @property
+    def car_location_list(self) -> List[List[float]]:
+        """
+        Locations of all cars of this tick as lists of [x, y, z] floats, the values of car_locations without the array
+        overhead for loops over a few cars.
+        """
+        return self._car_location_view.tolist()
+
+    @property
+    def car_velocities(self) -> np.ndarray:
+        """
+        Velocities of all cars of this tick as a (num_cars, 3) float64 array.
+        """
+        if self._car_velocities_tick != self.tick:
+            np.copyto(self._car_velocities, self._car_velocity_view)
+            self._car_velocities_tick = self.tick
+        return self._car_velocities
+
+    @property
+    def proximity(self) -> Proximity:
+        """
+        Distances between the cars and the ball of this tick, computed once per tick and shared by the helpers.
+        """
+        if self._proximity_tick != self.tick:
+            self._proximity.update(self)
+            self._proximity_tick = self.tick
+        return self._proximity
+
+    @property
+    def boost_pad_states(self) -> np.ndarray:
+        """
+        Structured array with the fields is_active and timer of the boost pads of this tick, viewing the packet's
+        memory directly.
+        """
+        if self._boost_pad_states is None or len(self._boost_pad_states) != self.packet.num_boost:
+            self._boost_pad_states = struct_array(self.packet.game_boosts, self.packet.num_boost)
+        return self._boost_pad_states
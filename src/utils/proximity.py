@@ -0,0 +1,155 @@
+import math
+from typing import List, Optional
+
+import numpy as np
+
+# Distance between the centers of two cars when they collide, roughly the length of an octane
+DEMOLITION_RADIUS = 160
+
+# Up to this many cars the car to ball distances are computed with plain floats, the numpy calls only pay off from
+# about 24 cars on
+SCALAR_MAX_CARS = 8
+
+
+class Proximity:
+    """
+    Distances between all cars and the ball in one tick, for every car at once. The car to ball distances are
+    computed on update, the car to car matrix on first access. Both are plain numpy arrays indexed like the cars of
+    the packet, so they work the same for 2 and for 64 cars.
+    Use it through PacketSnapshot.proximity, which updates it once per tick. The arrays are reused and overwritten by
+    the next update, copy them to keep them.
+    """
+
+    def __init__(self):
+        self._snapshot = None
+        self._car_distances: np.ndarray = None
+        self._ball_location = np.zeros(3)
+        self._ball_locations = np.zeros((0, 3))
+        self._offset = np.zeros((0, 3))
+        self._ball_distances = np.zeros(0)
+        # car to ball distances as floats, only up to SCALAR_MAX_CARS cars, copied into _ball_distances on demand
+        self._ball_distance_list: Optional[List[float]] = None
+
+    def update(self, snapshot) -> 'Proximity':
+        self._snapshot = snapshot
+        self._car_distances = None
+        ball = snapshot.ball.location
+        num_cars = snapshot.packet.num_cars
+        if num_cars != len(self._ball_distances):
+            self._ball_distances = np.zeros(num_cars)
+            self._ball_locations = np.zeros((num_cars, 3))
+            self._offset = np.zeros((num_cars, 3))
+        if num_cars <= SCALAR_MAX_CARS:
+            # same operations in the same order as below, so the distances are identical
+            bx, by, bz = ball.x, ball.y, ball.z
+            distances = []
+            for x, y, z in snapshot.car_location_list:
+                dx, dy, dz = x - bx, y - by, z - bz
+                distances.append(math.sqrt(dx * dx + dy * dy + dz * dz))
+            self._ball_distance_list = distances
+            return self
+        self._ball_distance_list = None
+        ball_location = self._ball_location
+        ball_location[0] = ball.x
+        ball_location[1] = ball.y
+        ball_location[2] = ball.z
+        # broadcasting and einsum allocate iterator buffers on every call, equal shapes and out= allocate nothing
+        np.copyto(self._ball_locations, ball_location)
+        offset = np.subtract(snapshot.car_locations, self._ball_locations, out=self._offset)
+        np.multiply(offset, offset, out=offset)
+        np.add(offset[:, 0], offset[:, 1], out=self._ball_distances)
+        np.add(self._ball_distances, offset[:, 2], out=self._ball_distances)
+        np.sqrt(self._ball_distances, out=self._ball_distances)
+        return self
+
+    @property
+    def car_locations(self) -> np.ndarray:
+        """(num_cars, 3) locations of the cars, see PacketSnapshot.car_locations."""
+        return self._snapshot.car_locations
+
+    @property
+    def ball_distances(self) -> np.ndarray:
+        """Distances between the cars and the ball."""
+        if self._ball_distance_list is not None:
+            self._ball_distances[:] = self._ball_distance_list
+            self._ball_distance_list = None
+        return self._ball_distances
+
+    @property
+    def num_cars(self) -> int:
+        return len(self._ball_distances)
+
+    @property
+    def car_distances(self) -> np.ndarray:
+        """(num_cars, num_cars) matrix of the distances between the cars."""
+        if self._car_distances is None:
+            # |a - b|^2 = |a|^2 + |b|^2 - 2 a.b, one matrix product instead of num_cars^2 difference vectors
+            locations = self.car_locations
+            squared = np.einsum('ij,ij->i', locations, locations)
+            distances_squared = squared[:, np.newaxis] + squared[np.newaxis, :] - 2 * (locations @ locations.T)
+            np.maximum(distances_squared, 0, out=distances_squared)
+            np.fill_diagonal(distances_squared, 0)
+            self._car_distances = np.sqrt(distances_squared, out=distances_squared)
+        return self._car_distances
+
+    def closest_car_to_ball(self, max_distance: float = float('inf')) -> Optional[int]:
+        """Returns the index of the car closest to the ball, or None if no car is within max_distance of it."""
+        if self.num_cars == 0:
+            return None
+        distances = self._ball_distance_list
+        if distances is not None:
+            index = min(range(len(distances)), key=distances.__getitem__)
+            return index if distances[index] < max_distance else None
+        index = int(np.argmin(self._ball_distances))
+        return index if self._ball_distances[index] < max_distance else None
+
+    def closest_to_ball(self, team: int = None) -> np.ndarray:
+        """Returns the indices of the cars (of one team if given) ordered by their distance to the ball."""
+        order = np.argsort(self.ball_distances, kind='stable')
+        if team is not None:
+            order = order[self._snapshot.car_array['team'][order] == team]
+        return order
+
+    def ball_rank(self, index: int) -> int:
+        """Returns how many cars are closer to the ball than the car with the given index."""
+        return int(np.count_nonzero(self.ball_distances < self.ball_distances[index]))
+
+    def nearest_car(self, index: int) -> Optional[int]:
+        """Returns the index of the car nearest to the car with the given index, or None if it is alone."""
+        if self.num_cars < 2:
+            return None
+        distances = self.car_distances[index].copy()
+        distances[index] = np.inf
+        return int(np.argmin(distances))
+
+    def demolition_risks(self, time_horizon: float = 0.5, radius: float = DEMOLITION_RADIUS) -> np.ndarray:
+        """
+        Returns a (num_cars, num_cars) boolean matrix which is True at [attacker, victim] if the attacker is an opponent
+        of the victim, at supersonic speed and, with both cars keeping their velocities, gets within radius of the
+        victim in the next time_horizon seconds. Demolished cars are neither attackers nor victims.
+        """
+        cars = self._snapshot.car_array
+        team = cars['team']
+        alive = ~cars['is_demolished']
+        risks = np.zeros((self.num_cars, self.num_cars), dtype=bool)
+        # only supersonic cars can demolish, usually few of them, so the pairs are computed for them only
+        attackers = np.flatnonzero(alive & cars['is_super_sonic'])
+        if len(attackers) == 0:
+            return risks
+        locations = self.car_locations
+        velocities = self._snapshot.car_velocities
+        # offset and relative velocity of every victim as seen from every attacker
+        offset = locations[np.newaxis, :, :] - locations[attackers, np.newaxis, :]
+        relative_velocity = velocities[np.newaxis, :, :] - velocities[attackers, np.newaxis, :]
+        speed_squared = np.einsum('ijk,ijk->ij', relative_velocity, relative_velocity)
+        # time of the closest approach, clamped to the horizon
+        closest_time = -np.einsum('ijk,ijk->ij', offset, relative_velocity) / np.maximum(speed_squared, 1e-6)
+        np.clip(closest_time, 0, time_horizon, out=closest_time)
+        closest = offset + closest_time[:, :, np.newaxis] * relative_velocity
+        within = np.einsum('ijk,ijk->ij', closest, closest) <= radius ** 2
+        risks[attackers] = within & (team[attackers, np.newaxis] != team[np.newaxis, :]) & alive[np.newaxis, :]
+        return risks
+
+    def threatened_by(self, index: int, time_horizon: float = 0.5, radius: float = DEMOLITION_RADIUS) -> np.ndarray:
+        """Returns the indices of the opponents that may demolish the car with the given index, see demolition_risks."""
+        return np.flatnonzero(self.demolition_risks(time_horizon, radius)[:, index])
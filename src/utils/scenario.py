@@ -0,0 +1,167 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from dataclasses import dataclass
+from typing import NamedTuple, Tuple
+
+from rlbot.agents.base_agent import SimpleControllerState
+
+# Bump when the classes below change, so old cache files are not read anymore
+SCENARIO_CACHE_VERSION = 1
+
+CONTROLLER_INPUTS = frozenset(vars(SimpleControllerState()))
+
+
+class ScenarioError(ValueError):
+    pass
+
+
+class Vector3(NamedTuple):
+    x: float
+    y: float
+    z: float
+
+
+@dataclass
+class StartValues:
+    __slots__ = ['position', 'velocity', 'angular_velocity', 'rotation']
+    position: Vector3
+    velocity: Vector3
+    angular_velocity: Vector3
+    rotation: Vector3
+
+
+# Actions are kept as plain (duration, ((input name, value), ...)) tuples. Large scenarios have thousands of them and
+# plain tuples are several times faster to unpickle from the cache than objects of a class.
+Input = Tuple[str, float]
+Action = Tuple[float, Tuple[Input, ...]]
+
+
+@dataclass
+class GameObject:
+    __slots__ = ['game_object', 'id', 'team', 'lead', 'start_values', 'actions']
+    game_object: str
+    id: str
+    team: str
+    lead: bool
+    start_values: StartValues
+    actions: Tuple[Action, ...]
+
+    @property
+    def is_car(self) -> bool:
+        return self.game_object == 'car'
+
+
+@dataclass
+class Scenario:
+    """
+    Parsed and validated test scenario. The runner parses each scenario file once and hands it to the bots through a
+    cache file (see cache_scenario), so the bots neither walk the settings chain nor parse the JSON themselves.
+    """
+    __slots__ = ['name', 'time', 'game_objects']
+    name: str
+    time: float
+    game_objects: Tuple[GameObject, ...]
+
+    @property
+    def cars(self) -> Tuple[GameObject, ...]:
+        return tuple(go for go in self.game_objects if go.is_car)
+
+    @property
+    def ball(self) -> GameObject:
+        return next((go for go in self.game_objects if go.game_object == 'ball'), None)
+
+    def car(self, car_id: str) -> GameObject:
+        for go in self.game_objects:
+            if go.is_car and go.id == car_id:
+                return go
+        raise ScenarioError(f'scenario {self.name} has no car with id {car_id}')
+
+
+def _vector(values: dict, name: str) -> Vector3:
+    vector = values[name]
+    return Vector3(float(vector['x']), float(vector['y']), float(vector['z']))
+
+
+def _parse_game_object(data: dict) -> GameObject:
+    start_values = data['startValues']
+    actions = []
+    for action in data.get('actions', ()):
+        duration = float(action['duration'])
+        if duration < 0:
+            raise ScenarioError(f'negative action duration {duration}')
+        inputs = tuple((i['name'], i['value']) for i in action['inputs'])
+        for name, _ in inputs:
+            if name not in CONTROLLER_INPUTS:
+                raise ScenarioError(f'unknown input {name}')
+        actions.append((duration, inputs))
+    return GameObject(
+        game_object=data['gameObject'],
+        id=str(data.get('id', '')),
+        team=str(data.get('team', '0')),
+        lead=bool(data.get('lead', False)),
+        start_values=StartValues(
+            position=_vector(start_values, 'position'),
+            velocity=_vector(start_values, 'velocity'),
+            angular_velocity=_vector(start_values, 'angularVelocity'),
+            rotation=_vector(start_values, 'rotation'),
+        ),
+        actions=tuple(actions),
+    )
+
+
+def parse_scenario(data: dict) -> Scenario:
+    """
+    Builds a Scenario from the content of a scenario JSON file. Raises a ScenarioError if the scenario is malformed.
+    """
+    try:
+        scenario = Scenario(
+            name=data['name'],
+            time=float(data['time']),
+            game_objects=tuple(_parse_game_object(go) for go in data['gameObjects']),
+        )
+    except (KeyError, TypeError) as e:
+        raise ScenarioError(f'malformed scenario {data.get("name", "")}: {e!r}') from e
+    car_ids = [car.id for car in scenario.cars]
+    if len(set(car_ids)) != len(car_ids):
+        raise ScenarioError(f'scenario {scenario.name} has duplicate car ids')
+    return scenario
+
+
+def load_scenario(scenario_path: str) -> Scenario:
+    with open(scenario_path, 'rb') as scenario_file:
+        return parse_scenario(json.loads(scenario_file.read()))
+
+
+def cache_scenario(scenario_path: str, cache_directory: str) -> Tuple[Scenario, str]:
+    """
+    Parses a scenario file and stores it as a pickle named after the hash of the file content. Returns the scenario
+    and the path of the cache file. Scenarios that are already in the cache directory are read from their cache file,
+    so a scenario is parsed only once per run.
+
+    The bots unpickle the cache files, so cache_directory has to be a private directory of the run, e.g. one created
+    with tempfile.mkdtemp. A directory other users can write to lets them run code in the bots.
+    """
+    with open(scenario_path, 'rb') as scenario_file:
+        content = scenario_file.read()
+    digest = hashlib.sha1(content + str(SCENARIO_CACHE_VERSION).encode()).hexdigest()
+    cache_path = os.path.join(cache_directory, digest + '.pickle')
+    try:
+        return read_scenario_cache(cache_path), cache_path
+    except (OSError, pickle.UnpicklingError, EOFError):
+        pass
+    scenario = parse_scenario(json.loads(content))
+    os.makedirs(cache_directory, exist_ok=True)
+    # written to a temporary file first, concurrent runners must never read a partial cache file
+    fd, tmp_path = tempfile.mkstemp(dir=cache_directory, suffix='.tmp')
+    with os.fdopen(fd, 'wb') as cache_file:
+        pickle.dump(scenario, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, cache_path)
+    return scenario, cache_path
+
+
+def read_scenario_cache(cache_path: str) -> Scenario:
+    with open(cache_path, 'rb') as cache_file:
+        return pickle.load(cache_file)
@@ -1,6 +1,8 @@
+from typing import Union
+
 from rlbot.utils.structures.game_data_struct import PlayerInfo, GameTickPacket
 
-from .vec import Vec3
+from .packet_snapshot import PacketSnapshot
 
 # When the ball is attached to a car's spikes, the distance will vary a bit depending on whether the ball is
 # on the front bumper, the roof, etc. It tends to be most far away when the ball is on one of the front corners
@@ -13,24 +15,21 @@ MAX_DISTANCE_WHEN_SPIKED = 200
 class SpikeWatcher:
     def __init__(self):
         self.carrying_car: PlayerInfo = None
+        self.carrying_index: int = None
         self.spike_moment = 0
         self.carry_duration = 0
+        # used when read_packet gets the raw packet
+        self._snapshot = PacketSnapshot()
 
-    def read_packet(self, packet: GameTickPacket):
-        ball_location = Vec3(packet.game_ball.physics.location)
-        closest_candidate: PlayerInfo = None
-        closest_distance = 999999
-        for i in range(packet.num_cars):
-            car = packet.game_cars[i]
-            car_location = Vec3(car.physics.location)
-            distance = car_location.dist(ball_location)
-            if distance < MAX_DISTANCE_WHEN_SPIKED:
-                if distance < closest_distance:
-                    closest_candidate = car
-                    closest_distance = distance
-        if closest_candidate != self.carrying_car and closest_candidate is not None:
+    def read_packet(self, packet: Union[GameTickPacket, PacketSnapshot]):
+        snapshot = packet if isinstance(packet, PacketSnapshot) else self._snapshot.update(packet)
+        packet = snapshot.packet
+        closest_index = snapshot.proximity.closest_car_to_ball(MAX_DISTANCE_WHEN_SPIKED)
+        # compared by index, the PlayerInfo objects of the packet are new objects on every access
+        if closest_index != self.carrying_index and closest_index is not None:
             self.spike_moment = packet.game_info.seconds_elapsed
 
-        self.carrying_car = closest_candidate
+        self.carrying_index = closest_index
+        self.carrying_car = packet.game_cars[closest_index] if closest_index is not None else None
         if self.carrying_car is not None:
             self.carry_duration = packet.game_info.seconds_elapsed - self.spike_moment
@@ -0,0 +1,63 @@
+import ctypes
+from functools import lru_cache
+
+import numpy as np
+
+
+@lru_cache(maxsize=None)
+def struct_dtype(struct_type) -> np.dtype:
+    """
+    Returns a numpy dtype with the memory layout of the given ctypes Structure (e.g. PlayerInfo or Slice), so arrays
+    of the game data structs can be read as numpy structured arrays without copying them field by field.
+    Fields numpy cannot represent (like the wide char names) are left out, the itemsize stays the one of the struct.
+    """
+    names = []
+    formats = []
+    offsets = []
+    for field in struct_type._fields_:
+        name, field_type = field[0], field[1]
+        field_format = _field_format(field_type)
+        if field_format is None:
+            continue
+        names.append(name)
+        formats.append(field_format)
+        offsets.append(getattr(struct_type, name).offset)
+    return np.dtype({'names': names, 'formats': formats, 'offsets': offsets,
+                     'itemsize': ctypes.sizeof(struct_type)})
+
+
+def _field_format(field_type):
+    if issubclass(field_type, ctypes.Structure):
+        return struct_dtype(field_type)
+    if issubclass(field_type, ctypes.Array):
+        element_format = _field_format(field_type._type_)
+        if element_format is None:
+            return None
+        return element_format, (field_type._length_,)
+    if field_type in (ctypes.c_wchar, ctypes.c_char):
+        return None
+    return np.dtype(field_type)
+
+
+def struct_array(ctypes_array, count: int = None) -> np.ndarray:
+    """
+    Returns a structured numpy array viewing the memory of a ctypes array of structs, e.g. packet.game_cars or
+    ball_prediction.slices. The view is live: it reflects later changes of the ctypes array.
+    """
+    dtype = struct_dtype(ctypes_array._type_)
+    if count is None:
+        count = len(ctypes_array)
+    return np.frombuffer(ctypes_array, dtype=dtype, count=count)
+
+
+
+# Vector3 and Rotator structs are three consecutive floats
+_VECTOR3 = np.dtype((np.float32, (3,)))
+
+
+def vector3_view(vectors: np.ndarray) -> np.ndarray:
+    """
+    Returns a (..., 3) float32 view of a structured array of Vector3 or Rotator structs, e.g.
+    struct_array(packet.game_cars)['physics']['location'], so vector math can run on it directly.
+    """
+    return vectors.view(_VECTOR3)
@@ -0,0 +1,233 @@
+import argparse
+import csv
+import glob
+import os
+from dataclasses import dataclass, field
+from multiprocessing import Pool
+from typing import Dict, List, Tuple, Iterable, Optional
+
+import numpy as np
+
+from src.utils.log_reader import ScenarioLog, open_log, PHYSICS_COLUMNS
+
+BALL_ID = 'ball'
+
+# Step of the common time base if none can be taken from the logs: one tick at 120 ticks per second
+DEFAULT_TIME_STEP = 1 / 120
+
+# Error above which a trajectory counts as diverged, in the Unity units of the logs (m, degrees, m/s, rad/s)
+DEFAULT_DIVERGENCE_THRESHOLDS = {
+    'location': 0.1,
+    'rotation': 5.0,
+    'velocity': 0.5,
+    'angular_velocity': 0.5,
+}
+
+
+@dataclass
+class ErrorMetrics:
+    rmse: float
+    max_error: float
+    mean_error: float
+    # First time of the common time base at which the error exceeded the divergence threshold, nan if it never did
+    divergence_time: float
+
+
+@dataclass
+class TrajectoryComparison:
+    """
+    Per tick errors between two runs of the same scenario on a common time base. errors maps each physics quantity to
+    an array of shape (ticks, objects) with the objects in the order of object_ids (the ball and the cars present in
+    both runs). Rotation errors are the norm of the per axis Euler angle differences wrapped to [-180, 180).
+    """
+    scenario: str
+    time: np.ndarray
+    object_ids: List[str]
+    errors: Dict[str, np.ndarray]
+    divergence_thresholds: Dict[str, float]
+    rmse: Dict[str, np.ndarray] = field(init=False)
+    max_error: Dict[str, np.ndarray] = field(init=False)
+    mean_error: Dict[str, np.ndarray] = field(init=False)
+    divergence_time: Dict[str, np.ndarray] = field(init=False)
+
+    def __post_init__(self):
+        self.rmse, self.max_error, self.mean_error, self.divergence_time = {}, {}, {}, {}
+        for quantity, error in self.errors.items():
+            if len(error) == 0:
+                nan = np.full(len(self.object_ids), np.nan)
+                self.rmse[quantity] = self.max_error[quantity] = self.mean_error[quantity] = nan
+                self.divergence_time[quantity] = nan
+                continue
+            self.rmse[quantity] = np.sqrt(np.mean(error ** 2, axis=0))
+            self.max_error[quantity] = error.max(axis=0)
+            self.mean_error[quantity] = error.mean(axis=0)
+            exceeded = error > self.divergence_thresholds[quantity]
+            first = exceeded.argmax(axis=0)
+            self.divergence_time[quantity] = np.where(exceeded.any(axis=0), self.time[first], np.nan)
+
+    def metrics(self, object_id: str, quantity: str) -> ErrorMetrics:
+        i = self.object_ids.index(object_id)
+        return ErrorMetrics(
+            rmse=float(self.rmse[quantity][i]),
+            max_error=float(self.max_error[quantity][i]),
+            mean_error=float(self.mean_error[quantity][i]),
+            divergence_time=float(self.divergence_time[quantity][i]),
+        )
+
+    def rows(self) -> Iterable[Tuple]:
+        """
+        Yields one (scenario, object id, quantity, rmse, max error, mean error, divergence time) row per object and
+        quantity.
+        """
+        for quantity in self.errors:
+            for i, object_id in enumerate(self.object_ids):
+                yield (self.scenario, object_id, quantity, float(self.rmse[quantity][i]),
+                       float(self.max_error[quantity][i]), float(self.mean_error[quantity][i]),
+                       float(self.divergence_time[quantity][i]))
+
+
+RESULT_HEADER = ('scenario', 'object', 'quantity', 'rmse', 'max_error', 'mean_error', 'divergence_time')
+
+
+def resample(time: np.ndarray, values: np.ndarray, new_time: np.ndarray) -> np.ndarray:
+    """
+    Linearly interpolates values (shape (len(time), ...)) at new_time for all trailing dimensions at once.
+    new_time has to lie within the range of time.
+    """
+    time = np.asarray(time)
+    values = np.asarray(values, dtype=np.float64)
+    if len(time) == 1:
+        return np.repeat(values, len(new_time), axis=0)
+    right = np.clip(np.searchsorted(time, new_time, side='right'), 1, len(time) - 1)
+    left = right - 1
+    span = time[right] - time[left]
+    weight = np.divide(new_time - time[left], span, out=np.zeros(len(new_time)), where=span > 0)
+    weight = weight.reshape((-1,) + (1,) * (values.ndim - 1))
+    return values[left] * (1 - weight) + values[right] * weight
+
+
+def _unwrap_degrees(angles: np.ndarray) -> np.ndarray:
+    return np.degrees(np.unwrap(np.radians(angles), axis=0))
+
+
+def _stack_objects(log: ScenarioLog, car_ids: List[str], quantity: str) -> np.ndarray:
+    # (frames, objects, 3) with the ball first and then the cars in the order of car_ids
+    ball = np.asarray(getattr(log, 'ball_' + quantity))[:, np.newaxis]
+    cars = np.asarray(getattr(log, 'car_' + quantity))
+    car_indices = [log.car_index(car_id) for car_id in car_ids]
+    return np.concatenate([ball, cars[:, car_indices]], axis=1)
+
+
+def common_time_base(time_a: np.ndarray, time_b: np.ndarray, time_step: float = None) -> np.ndarray:
+    """
+    Returns evenly spaced times covering the overlap of both runs. The step defaults to the median tick duration of
+    the first run, or DEFAULT_TIME_STEP if that is not positive, e.g. with repeated timestamps after a pause.
+    """
+    if time_step is not None and not time_step > 0:
+        raise ValueError(f'time_step must be positive, got {time_step}')
+    start = max(time_a[0], time_b[0])
+    end = min(time_a[-1], time_b[-1])
+    if end < start:
+        return np.empty(0)
+    if time_step is None:
+        time_step = float(np.median(np.diff(time_a))) if len(time_a) > 1 else DEFAULT_TIME_STEP
+        if not time_step > 0:
+            time_step = DEFAULT_TIME_STEP
+    return start + np.arange(int(np.floor((end - start) / time_step)) + 1) * time_step
+
+
+def compare_logs(log_a: ScenarioLog, log_b: ScenarioLog, scenario: str = '', time_step: float = None,
+                 divergence_thresholds: Dict[str, float] = None) -> TrajectoryComparison:
+    """
+    Compares two runs of the same scenario, e.g. the RLBot and the RoboLeague log. Both are resampled onto a common
+    time base and the errors of the ball and all cars in both runs are computed over the whole arrays at once.
+    """
+    thresholds = dict(DEFAULT_DIVERGENCE_THRESHOLDS)
+    if divergence_thresholds:
+        thresholds.update(divergence_thresholds)
+    car_ids = [car_id for car_id in log_a.car_ids if car_id in log_b.car_ids]
+    object_ids = [BALL_ID] + car_ids
+
+    if len(log_a) == 0 or len(log_b) == 0:
+        time = np.empty(0)
+    else:
+        time = common_time_base(np.asarray(log_a.time), np.asarray(log_b.time), time_step)
+
+    errors = {}
+    for quantity in PHYSICS_COLUMNS:
+        if len(time) == 0:
+            errors[quantity] = np.empty((0, len(object_ids)))
+            continue
+        values_a = _stack_objects(log_a, car_ids, quantity)
+        values_b = _stack_objects(log_b, car_ids, quantity)
+        if quantity == 'rotation':
+            values_a = _unwrap_degrees(values_a)
+            values_b = _unwrap_degrees(values_b)
+        difference = resample(log_a.time, values_a, time) - resample(log_b.time, values_b, time)
+        if quantity == 'rotation':
+            difference = (difference + 180) % 360 - 180
+        errors[quantity] = np.linalg.norm(difference, axis=-1)
+
+    return TrajectoryComparison(scenario=scenario, time=time, object_ids=object_ids, errors=errors,
+                                divergence_thresholds=thresholds)
+
+
+def compare_files(path_a: str, path_b: str, time_step: float = None,
+                  divergence_thresholds: Dict[str, float] = None) -> TrajectoryComparison:
+    scenario = os.path.splitext(os.path.basename(path_a))[0]
+    return compare_logs(open_log(path_a), open_log(path_b), scenario, time_step, divergence_thresholds)
+
+
+def _compare_files_star(args) -> TrajectoryComparison:
+    return compare_files(*args)
+
+
+def find_log_pairs(directory_a: str, directory_b: str) -> List[Tuple[str, str]]:
+    """
+    Pairs the JSON logs of two result directories by file name, e.g. the RLBot and the RoboLeague results.
+    """
+    pairs = []
+    for path_a in sorted(glob.glob(os.path.join(directory_a, '*.json'))):
+        path_b = os.path.join(directory_b, os.path.basename(path_a))
+        if os.path.exists(path_b):
+            pairs.append((path_a, path_b))
+    return pairs
+
+
+def compare_batch(pairs: List[Tuple[str, str]], time_step: float = None,
+                  divergence_thresholds: Dict[str, float] = None,
+                  processes: Optional[int] = None) -> Iterable[TrajectoryComparison]:
+    """
+    Compares many pairs of logs. With processes > 1 the pairs are spread over a process pool, results are yielded in
+    the order of the pairs.
+    """
+    arguments = [(path_a, path_b, time_step, divergence_thresholds) for path_a, path_b in pairs]
+    if processes is None or processes <= 1:
+        for argument in arguments:
+            yield _compare_files_star(argument)
+        return
+    with Pool(processes) as pool:
+        for comparison in pool.imap(_compare_files_star, arguments, chunksize=16):
+            yield comparison
+
+
+def write_results(comparisons: Iterable[TrajectoryComparison], csv_path: str):
+    with open(csv_path, 'w', newline='') as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(RESULT_HEADER)
+        for comparison in comparisons:
+            writer.writerows(comparison.rows())
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compares the RLBot and RoboLeague logs of the test scenarios.')
+    parser.add_argument('rlbot_results', help='directory with the RLBot logs')
+    parser.add_argument('roboleague_results', help='directory with the RoboLeague logs')
+    parser.add_argument('--output', default='comparison.csv', help='CSV file for the metrics')
+    parser.add_argument('--time-step', type=float, default=None, help='step of the common time base in seconds')
+    parser.add_argument('--processes', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    log_pairs = find_log_pairs(args.rlbot_results, args.roboleague_results)
+    write_results(compare_batch(log_pairs, args.time_step, processes=args.processes), args.output)
+    print(f'compared {len(log_pairs)} scenarios, metrics written to {args.output}')
@@ -1,6 +1,7 @@
-import copy
 import math
-from typing import Union
+from typing import Union, Iterable, List
+
+import numpy as np
 
 from rlbot.utils.game_state_util import Vector3, Rotator
 from rlbot.utils.structures.game_data_struct import Rotator as GDRotator
@@ -57,20 +58,40 @@ class Vec3:
             self.z = float(z)
         self.unit_system = unit_system
 
+    @classmethod
+    def _new(cls, x: float, y: float, z: float, unit_system: UnitSystem = UnitSystem.UNREAL):
+        """
+        Creates a vector from plain floats without the checks of __init__. Used for the results of arithmetic, which
+        are floats already.
+        """
+        vec = object.__new__(cls)
+        vec.x = x
+        vec.y = y
+        vec.z = z
+        vec.unit_system = unit_system
+        return vec
+
+    @classmethod
+    def from_packet(cls, vector):
+        """
+        Creates a vector from a vector of the GameTickPacket, e.g. `Vec3.from_packet(car.physics.location)`.
+        """
+        return cls._new(vector.x, vector.y, vector.z)
+
     def __getitem__(self, item: int):
         return (self.x, self.y, self.z)[item]
 
     def __add__(self, other: 'Vec3') -> 'Vec3':
-        return Vec3(self.x + other.x, self.y + other.y, self.z + other.z)
+        return Vec3._new(self.x + other.x, self.y + other.y, self.z + other.z)
 
     def __sub__(self, other: 'Vec3') -> 'Vec3':
-        return Vec3(self.x - other.x, self.y - other.y, self.z - other.z)
+        return Vec3._new(self.x - other.x, self.y - other.y, self.z - other.z)
 
     def __neg__(self):
-        return Vec3(-self.x, -self.y, -self.z)
+        return Vec3._new(-self.x, -self.y, -self.z)
 
     def __mul__(self, scale: float) -> 'Vec3':
-        return Vec3(self.x * scale, self.y * scale, self.z * scale)
+        return Vec3._new(self.x * scale, self.y * scale, self.z * scale)
 
     def __rmul__(self, scale):
         return self * scale
@@ -87,7 +108,7 @@ class Vec3:
 
     def flat(self):
         """Returns a new Vec3 that equals this Vec3 but projected onto the ground plane. I.e. where z=0."""
-        return Vec3(self.x, self.y, 0)
+        return Vec3._new(self.x, self.y, 0.0)
 
     def length(self):
         """Returns the length of the vector. Also called magnitude and norm."""
@@ -111,7 +132,7 @@ class Vec3:
 
     def cross(self, other: 'Vec3') -> 'Vec3':
         """Returns the cross product."""
-        return Vec3(
+        return Vec3._new(
             self.y * other.z - self.z * other.y,
             self.z * other.x - self.x * other.z,
             self.x * other.y - self.y * other.x
@@ -174,20 +195,33 @@ class Vec4:
             self.w = float(w)
         self.unit_system = unit_system
 
+    @classmethod
+    def _new(cls, x: float, y: float, z: float, w: float, unit_system: UnitSystem = UnitSystem.UNREAL):
+        """
+        Creates a vector from plain floats without the checks of __init__.
+        """
+        vec = object.__new__(cls)
+        vec.x = x
+        vec.y = y
+        vec.z = z
+        vec.w = w
+        vec.unit_system = unit_system
+        return vec
+
     def __getitem__(self, item: int):
         return (self.x, self.y, self.z, self.w)[item]
 
     def __add__(self, other: 'Vec4') -> 'Vec4':
-        return Vec4(self.x + other.x, self.y + other.y, self.z + other.z, self.w + other.w)
+        return Vec4._new(self.x + other.x, self.y + other.y, self.z + other.z, self.w + other.w)
 
     def __sub__(self, other: 'Vec4') -> 'Vec4':
-        return Vec4(self.x - other.x, self.y - other.y, self.z - other.z, self.w - other.w)
+        return Vec4._new(self.x - other.x, self.y - other.y, self.z - other.z, self.w - other.w)
 
     def __neg__(self):
-        return Vec4(-self.x, -self.y, -self.z, -self.w)
+        return Vec4._new(-self.x, -self.y, -self.z, -self.w)
 
     def __mul__(self, scale: float) -> 'Vec4':
-        return Vec4(self.x * scale, self.y * scale, self.z * scale, self.w * scale)
+        return Vec4._new(self.x * scale, self.y * scale, self.z * scale, self.w * scale)
 
     def __rmul__(self, scale):
         return self * scale
@@ -204,7 +238,7 @@ class Vec4:
 
     def flat(self):
         """Returns a new Vec4 that equals this Vec4 but projected onto the ground plane. I.e. where z=0 and w=0."""
-        return Vec4(self.x, self.y, 0, 0)
+        return Vec4._new(self.x, self.y, 0.0, 0.0)
 
     def length(self):
         """Returns the length of the vector. Also called magnitude and norm."""
@@ -228,7 +262,7 @@ class Vec4:
 
     def cross(self, other: 'Vec4') -> 'Vec4':
         """Returns the cross product."""
-        return Vec4(
+        return Vec4._new(
             self.y * other.z - self.z * other.y,
             self.z * other.w - self.w * other.z,
             self.w * other.x - self.x * other.w,
@@ -266,13 +300,25 @@ class Location(Vec3):
         self.unit_system = UnitSystem.UNREAL
         return self
 
+    def as_unity_units(self) -> 'Location':
+        """Returns a converted copy, unlike to_unity_units this vector stays unchanged."""
+        if self.unit_system == UnitSystem.UNITY:
+            return Location._new(self.x, self.y, self.z, UnitSystem.UNITY)
+        return Location._new(self.y / 100, self.z / 100, self.x / 100, UnitSystem.UNITY)
+
+    def as_unreal_units(self) -> 'Location':
+        """Returns a converted copy, unlike to_unreal_units this vector stays unchanged."""
+        if self.unit_system == UnitSystem.UNREAL:
+            return Location._new(self.x, self.y, self.z)
+        return Location._new(self.z * 100, self.x * 100, self.y * 100)
+
     def to_game_state_vector(self):
         if self.unit_system == UnitSystem.UNITY:
-            return copy.deepcopy(self).to_unreal_units().to_game_state_vector()
+            return self.as_unreal_units().to_game_state_vector()
         return Vec3.to_game_state_vector(self)
 
     def obs_normalized(self):
-        return Location((self.x + 60) / 120, self.y / 20, (self.z + 41) / 82)
+        return Location._new((self.x + 60) / 120, self.y / 20, (self.z + 41) / 82)
 
 
 class Velocity(Vec3):
@@ -300,10 +346,22 @@ class Velocity(Vec3):
         self.unit_system = UnitSystem.UNREAL
         return self
 
+    def as_unity_units(self) -> 'Velocity':
+        """Returns a converted copy, unlike to_unity_units this vector stays unchanged."""
+        if self.unit_system == UnitSystem.UNITY:
+            return Velocity._new(self.x, self.y, self.z, UnitSystem.UNITY)
+        return Velocity._new(self.y / 100, self.z / 100, self.x / 100, UnitSystem.UNITY)
+
+    def as_unreal_units(self) -> 'Velocity':
+        """Returns a converted copy, unlike to_unreal_units this vector stays unchanged."""
+        if self.unit_system == UnitSystem.UNREAL:
+            return Velocity._new(self.x, self.y, self.z)
+        return Velocity._new(self.z * 100, self.x * 100, self.y * 100)
+
     def obs_normalized(self, is_ball=False):
         if is_ball:
             return self / 60
-        return Vec3(self.x / 23, self.y / 23, self.z / 23)
+        return Vec3._new(self.x / 23, self.y / 23, self.z / 23)
 
 
 class AngularVelocity(Vec3):
@@ -329,6 +387,18 @@ class AngularVelocity(Vec3):
         self.unit_system = UnitSystem.UNREAL
         return self
 
+    def as_unity_units(self) -> 'AngularVelocity':
+        """Returns a converted copy, unlike to_unity_units this vector stays unchanged."""
+        if self.unit_system == UnitSystem.UNITY:
+            return AngularVelocity._new(self.x, self.y, self.z, UnitSystem.UNITY)
+        return AngularVelocity._new(self.y, self.z, self.x, UnitSystem.UNITY)
+
+    def as_unreal_units(self) -> 'AngularVelocity':
+        """Returns a converted copy, unlike to_unreal_units this vector stays unchanged."""
+        if self.unit_system == UnitSystem.UNREAL:
+            return AngularVelocity._new(self.x, self.y, self.z)
+        return AngularVelocity._new(self.z, self.x, self.y)
+
     def obs_normalized(self):
         return self / 5.5
 
@@ -336,7 +406,7 @@ class AngularVelocity(Vec3):
 class EulerAngles(Vec3):
     def __init__(self, pitch: Union[float, 'Quaternion', 'Rotator', 'GDRotator'] = 0, yaw: float = 0, roll: float = 0,
                  unit_system: UnitSystem = UnitSystem.UNREAL):
-        super().__init__()
+        # every branch sets all components, so Vec3.__init__ is not needed
         if isinstance(pitch, Quaternion):
             q = pitch
 
@@ -388,6 +458,17 @@ class EulerAngles(Vec3):
         self.unit_system = UnitSystem.UNREAL
         return self
 
+    def as_unity_units(self) -> 'EulerAngles':
+        """Returns a converted copy, unlike to_unity_units these angles stay unchanged."""
+        if self.unit_system == UnitSystem.UNITY:
+            return EulerAngles._new(self.x, self.y, self.z, UnitSystem.UNITY)
+        return EulerAngles._new((self.x > 0) * 360 - self.x, (self.y > 0) * 360 - self.y, (self.z > 0) * 360 - self.z,
+                                UnitSystem.UNITY)
+
+    def as_unreal_units(self) -> 'EulerAngles':
+        """Returns a converted copy, unlike to_unreal_units these angles stay unchanged."""
+        return EulerAngles._new(self.x, self.y, self.z)
+
     # if self.unit_system == UnitSystem.UNREAL:
     #     return self
     #
@@ -408,7 +489,7 @@ class EulerAngles(Vec3):
 class Quaternion(Vec4):
     def __init__(self, x: Union[float, 'Quaternion', 'Rotator', 'GDRotator'] = 0, y: float = 0, z: float = 0,
                  w: float = 0, unit_system: UnitSystem = UnitSystem.UNREAL):
-        super().__init__()
+        # every branch sets all components, so Vec4.__init__ is not needed
         if hasattr(x, 'pitch'):
             # x are euler angles
             cy = cos(x.yaw * 0.5)
@@ -461,5 +542,439 @@ class Quaternion(Vec4):
         self.unit_system = UnitSystem.UNREAL
         return self
 
+    def as_unity_units(self) -> 'Quaternion':
+        """Returns a converted copy, unlike to_unity_units this quaternion stays unchanged."""
+        if self.unit_system == UnitSystem.UNITY:
+            return Quaternion._new(self.x, self.y, self.z, self.w, UnitSystem.UNITY)
+        return Quaternion._new(self.y, self.z, self.x, self.w, UnitSystem.UNITY)
+
+    def as_unreal_units(self) -> 'Quaternion':
+        """Returns a converted copy, unlike to_unreal_units this quaternion stays unchanged."""
+        if self.unit_system == UnitSystem.UNREAL:
+            return Quaternion._new(self.x, self.y, self.z, self.w)
+        return Quaternion._new(self.z, self.x, self.y, self.w)
+
     def obs_normalized(self):
         return self
+
+    def multiply(self, other: 'Quaternion') -> 'Quaternion':
+        """Returns the Hamilton product self * other, i.e. the rotation other followed by self."""
+        x1, y1, z1, w1 = self.x, self.y, self.z, self.w
+        x2, y2, z2, w2 = other.x, other.y, other.z, other.w
+        return Quaternion._new(
+            w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2,
+            w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2,
+            w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2,
+            w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2,
+            self.unit_system
+        )
+
+    def conjugate(self) -> 'Quaternion':
+        """Returns the conjugate, which is the inverse rotation for unit quaternions."""
+        return Quaternion._new(-self.x, -self.y, -self.z, self.w, self.unit_system)
+
+    def rotate(self, vec: Vec3) -> Vec3:
+        """Returns the vector rotated by this unit quaternion, without building the rotation matrix."""
+        x, y, z, w = self.x, self.y, self.z, self.w
+        # t = 2 * cross(q, v), v' = v + w * t + cross(q, t)
+        tx = 2 * (y * vec.z - z * vec.y)
+        ty = 2 * (z * vec.x - x * vec.z)
+        tz = 2 * (x * vec.y - y * vec.x)
+        return Vec3._new(
+            vec.x + w * tx + y * tz - z * ty,
+            vec.y + w * ty + z * tx - x * tz,
+            vec.z + w * tz + x * ty - y * tx
+        )
+
+    def to_matrix(self):
+        """Returns the rotation matrix of this unit quaternion as a tuple of three rows."""
+        x, y, z, w = self.x, self.y, self.z, self.w
+        return (
+            (1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)),
+            (2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)),
+            (2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)),
+        )
+
+    @classmethod
+    def from_matrix(cls, rows, unit_system: UnitSystem = UnitSystem.UNREAL) -> 'Quaternion':
+        """Returns the unit quaternion (with w >= 0) of a rotation matrix given as three rows."""
+        (m00, m01, m02), (m10, m11, m12), (m20, m21, m22) = rows
+        trace = m00 + m11 + m22
+        # branch on the largest diagonal term to stay accurate for rotations near 180 degrees
+        if trace > 0:
+            s = 2 * math.sqrt(trace + 1)
+            q = cls._new((m21 - m12) / s, (m02 - m20) / s, (m10 - m01) / s, s / 4, unit_system)
+        elif m00 > m11 and m00 > m22:
+            s = 2 * math.sqrt(1 + m00 - m11 - m22)
+            q = cls._new(s / 4, (m01 + m10) / s, (m02 + m20) / s, (m21 - m12) / s, unit_system)
+        elif m11 > m22:
+            s = 2 * math.sqrt(1 + m11 - m00 - m22)
+            q = cls._new((m01 + m10) / s, s / 4, (m12 + m21) / s, (m02 - m20) / s, unit_system)
+        else:
+            s = 2 * math.sqrt(1 + m22 - m00 - m11)
+            q = cls._new((m02 + m20) / s, (m12 + m21) / s, s / 4, (m10 - m01) / s, unit_system)
+        if q.w < 0:
+            q.x, q.y, q.z, q.w = -q.x, -q.y, -q.z, -q.w
+        return q
+
+    def slerp(self, other: 'Quaternion', t: float) -> 'Quaternion':
+        """Spherical linear interpolation between two unit quaternions along the shorter arc, t in [0, 1]."""
+        cos_half = self.dot(other)
+        # q and -q are the same rotation, interpolate towards the one closer to self
+        sign = 1.0
+        if cos_half < 0:
+            sign = -1.0
+            cos_half = -cos_half
+        if cos_half > 0.9995:
+            # nearly the same rotation: normalized linear interpolation is accurate and avoids dividing by sin(0)
+            a = 1 - t
+            b = sign * t
+            x, y, z, w = (a * self.x + b * other.x, a * self.y + b * other.y, a * self.z + b * other.z,
+                          a * self.w + b * other.w)
+            length = math.sqrt(x * x + y * y + z * z + w * w)
+            return Quaternion._new(x / length, y / length, z / length, w / length, self.unit_system)
+        half = math.acos(cos_half)
+        sin_half = math.sin(half)
+        a = math.sin((1 - t) * half) / sin_half
+        b = sign * math.sin(t * half) / sin_half
+        return Quaternion._new(a * self.x + b * other.x, a * self.y + b * other.y, a * self.z + b * other.z,
+                               a * self.w + b * other.w, self.unit_system)
+
+
+class Vec3Array:
+    """
+    N vectors in one (N, 3) float array, with the operations of Vec3 applied to all of them at once. Use it instead of
+    lists of Vec3 when looping over thousands of vectors, e.g. in offline analysis or when generating game states.
+    Convert from and to the scalar classes with from_vecs() and to_vecs().
+    """
+    __slots__ = [
+        'data',
+        'unit_system'
+    ]
+
+    # The scalar class of the elements, used by to_vecs() and indexing
+    scalar_type = Vec3
+
+    def __init__(self, data, unit_system: UnitSystem = UnitSystem.UNREAL):
+        self.data = np.array(data, dtype=np.float64).reshape(-1, 3)
+        self.unit_system = unit_system
+
+    @classmethod
+    def _new(cls, data: np.ndarray, unit_system: UnitSystem = UnitSystem.UNREAL):
+        # Takes ownership of an array of the right shape and dtype without copying it
+        array = cls.__new__(cls)
+        array.data = data
+        array.unit_system = unit_system
+        return array
+
+    @classmethod
+    def from_vecs(cls, vecs: Iterable[Vec3]):
+        vecs = list(vecs)
+        unit_system = vecs[0].unit_system if vecs else UnitSystem.UNREAL
+        return cls._new(np.array([(v.x, v.y, v.z) for v in vecs], dtype=np.float64).reshape(-1, 3), unit_system)
+
+    def to_vecs(self) -> List[Vec3]:
+        return [self.scalar_type(x, y, z, unit_system=self.unit_system) for x, y, z in self.data.tolist()]
+
+    @property
+    def x(self) -> np.ndarray:
+        return self.data[:, 0]
+
+    @property
+    def y(self) -> np.ndarray:
+        return self.data[:, 1]
+
+    @property
+    def z(self) -> np.ndarray:
+        return self.data[:, 2]
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, item):
+        if isinstance(item, (int, np.integer)):
+            x, y, z = self.data[item].tolist()
+            return self.scalar_type(x, y, z, unit_system=self.unit_system)
+        return self._new(self.data[item].reshape(-1, 3), self.unit_system)
+
+    @staticmethod
+    def _data(other) -> np.ndarray:
+        # Another array, a single Vec3 or anything broadcastable to (N, 3)
+        if isinstance(other, Vec3Array):
+            return other.data
+        if isinstance(other, Vec3):
+            return np.array((other.x, other.y, other.z))
+        return np.asarray(other, dtype=np.float64)
+
+    @staticmethod
+    def _scale(scale) -> np.ndarray:
+        # A scalar or one scale per vector
+        scale = np.asarray(scale, dtype=np.float64)
+        return scale[:, np.newaxis] if scale.ndim == 1 else scale
+
+    # Unlike the scalar classes, arithmetic keeps the class (e.g. LocationArray) and the unit system of the array
+    def __add__(self, other) -> 'Vec3Array':
+        return self._new(self.data + self._data(other), self.unit_system)
+
+    def __sub__(self, other) -> 'Vec3Array':
+        return self._new(self.data - self._data(other), self.unit_system)
+
+    def __neg__(self) -> 'Vec3Array':
+        return self._new(-self.data, self.unit_system)
+
+    def __mul__(self, scale) -> 'Vec3Array':
+        return self._new(self.data * self._scale(scale), self.unit_system)
+
+    def __rmul__(self, scale):
+        return self * scale
+
+    def __truediv__(self, scale) -> 'Vec3Array':
+        return self * (1 / self._scale(scale))
+
+    def __str__(self):
+        return f"{type(self).__name__}({len(self)} vectors)"
+
+    def __repr__(self):
+        return self.__str__()
+
+    def flat(self) -> 'Vec3Array':
+        """Returns the vectors projected onto the ground plane. I.e. where z=0."""
+        data = self.data.copy()
+        data[:, 2] = 0
+        return self._new(data, self.unit_system)
+
+    def length(self) -> np.ndarray:
+        """Returns the lengths of the vectors."""
+        return np.sqrt(np.einsum('ij,ij->i', self.data, self.data))
+
+    def dist(self, other) -> np.ndarray:
+        """Returns the distances between these vectors and other vectors (or a single Vec3)."""
+        return (self - other).length()
+
+    def normalized(self) -> 'Vec3Array':
+        """Returns vectors with the same direction but a length of one."""
+        return self / self.length()
+
+    def rescale(self, new_len) -> 'Vec3Array':
+        """Returns vectors with the same direction but a different length."""
+        return self.normalized() * new_len
+
+    def dot(self, other) -> np.ndarray:
+        """Returns the dot products."""
+        return np.einsum('ij,ij->i', self.data, np.broadcast_to(self._data(other), self.data.shape))
+
+    def cross(self, other) -> 'Vec3Array':
+        """Returns the cross products."""
+        return Vec3Array._new(np.cross(self.data, self._data(other)), self.unit_system)
+
+    def ang_to(self, ideal) -> np.ndarray:
+        """Returns the angles to the ideal vectors. Angles will be between 0 and pi."""
+        ideal = ideal if isinstance(ideal, Vec3Array) else Vec3Array._new(
+            np.broadcast_to(self._data(ideal), self.data.shape))
+        cos_ang = self.dot(ideal) / (self.length() * ideal.length())
+        # clipped, rounding can push the cosine of parallel vectors slightly out of [-1, 1]
+        return np.arccos(np.clip(cos_ang, -1, 1))
+
+
+def _to_unity_axes(data: np.ndarray, scale: float = 1) -> np.ndarray:
+    # (x, y, z) in Unreal is (y, z, x) in Unity
+    return data[:, [1, 2, 0]] / scale
+
+
+def _to_unreal_axes(data: np.ndarray, scale: float = 1) -> np.ndarray:
+    return data[:, [2, 0, 1]] * scale
+
+
+class LocationArray(Vec3Array):
+    __slots__ = []
+    scalar_type = Location
+
+    def to_unity_units(self) -> 'LocationArray':
+        if self.unit_system == UnitSystem.UNITY:
+            return self
+        self.data = _to_unity_axes(self.data, 100)
+        self.unit_system = UnitSystem.UNITY
+        return self
+
+    def to_unreal_units(self) -> 'LocationArray':
+        if self.unit_system == UnitSystem.UNREAL:
+            return self
+        self.data = _to_unreal_axes(self.data, 100)
+        self.unit_system = UnitSystem.UNREAL
+        return self
+
+    def obs_normalized(self) -> 'LocationArray':
+        return LocationArray._new((self.data + (60, 0, 41)) / (120, 20, 82), self.unit_system)
+
+
+class VelocityArray(Vec3Array):
+    __slots__ = []
+    scalar_type = Velocity
+
+    def to_unity_units(self) -> 'VelocityArray':
+        if self.unit_system == UnitSystem.UNITY:
+            return self
+        self.data = _to_unity_axes(self.data, 100)
+        self.unit_system = UnitSystem.UNITY
+        return self
+
+    def to_unreal_units(self) -> 'VelocityArray':
+        if self.unit_system == UnitSystem.UNREAL:
+            return self
+        self.data = _to_unreal_axes(self.data, 100)
+        self.unit_system = UnitSystem.UNREAL
+        return self
+
+    def obs_normalized(self, is_ball=False) -> Vec3Array:
+        # the same operations as Velocity.obs_normalized, whose ball case multiplies by 1 / 60 in Vec3.__truediv__
+        if is_ball:
+            return Vec3Array._new(self.data * (1 / 60), self.unit_system)
+        return Vec3Array._new(self.data / 23, self.unit_system)
+
+
+class AngularVelocityArray(Vec3Array):
+    __slots__ = []
+    scalar_type = AngularVelocity
+
+    def to_unity_units(self) -> 'AngularVelocityArray':
+        if self.unit_system == UnitSystem.UNITY:
+            return self
+        self.data = _to_unity_axes(self.data)
+        self.unit_system = UnitSystem.UNITY
+        return self
+
+    def to_unreal_units(self) -> 'AngularVelocityArray':
+        if self.unit_system == UnitSystem.UNREAL:
+            return self
+        self.data = _to_unreal_axes(self.data)
+        self.unit_system = UnitSystem.UNREAL
+        return self
+
+    def obs_normalized(self) -> Vec3Array:
+        # multiplied by 1 / 5.5 like AngularVelocity.obs_normalized does in Vec3.__truediv__
+        return Vec3Array._new(self.data * (1 / 5.5), self.unit_system)
+
+
+class QuaternionArray:
+    """
+    N quaternions in one (N, 4) float array in the (x, y, z, w) order of Quaternion, with its operations applied to
+    all of them at once.
+    """
+    __slots__ = [
+        'data',
+        'unit_system'
+    ]
+
+    def __init__(self, data, unit_system: UnitSystem = UnitSystem.UNREAL):
+        self.data = np.array(data, dtype=np.float64).reshape(-1, 4)
+        self.unit_system = unit_system
+
+    @classmethod
+    def _new(cls, data: np.ndarray, unit_system: UnitSystem = UnitSystem.UNREAL) -> 'QuaternionArray':
+        array = cls.__new__(cls)
+        array.data = data
+        array.unit_system = unit_system
+        return array
+
+    @classmethod
+    def from_rotators(cls, pitch, yaw, roll) -> 'QuaternionArray':
+        """
+        Creates the quaternions of the given arrays of Euler angles in radians, like Quaternion(rotator).
+        """
+        cy, sy = np.cos(np.asarray(yaw) * 0.5), np.sin(np.asarray(yaw) * 0.5)
+        cp, sp = np.cos(np.asarray(pitch) * 0.5), np.sin(np.asarray(pitch) * 0.5)
+        cr, sr = np.cos(np.asarray(roll) * 0.5), np.sin(np.asarray(roll) * 0.5)
+        return cls._new(np.stack([
+            sr * cp * cy - cr * sp * sy,
+            cr * sp * cy + sr * cp * sy,
+            cr * cp * sy - sr * sp * cy,
+            cr * cp * cy + sr * sp * sy,
+        ], axis=-1).reshape(-1, 4))
+
+    @classmethod
+    def from_quaternions(cls, quaternions: Iterable['Quaternion']) -> 'QuaternionArray':
+        quaternions = list(quaternions)
+        unit_system = quaternions[0].unit_system if quaternions else UnitSystem.UNREAL
+        data = np.array([(q.x, q.y, q.z, q.w) for q in quaternions], dtype=np.float64).reshape(-1, 4)
+        return cls._new(data, unit_system)
+
+    def to_quaternions(self) -> List['Quaternion']:
+        return [Quaternion(x, y, z, w, unit_system=self.unit_system) for x, y, z, w in self.data.tolist()]
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, item):
+        if isinstance(item, (int, np.integer)):
+            x, y, z, w = self.data[item].tolist()
+            return Quaternion(x, y, z, w, unit_system=self.unit_system)
+        return self._new(self.data[item].reshape(-1, 4), self.unit_system)
+
+    @staticmethod
+    def _data(other) -> np.ndarray:
+        # Another array, a single Quaternion or anything broadcastable to (N, 4)
+        if isinstance(other, QuaternionArray):
+            return other.data
+        if isinstance(other, Vec4):
+            return np.array((other.x, other.y, other.z, other.w))
+        return np.asarray(other, dtype=np.float64)
+
+    def __add__(self, other) -> 'QuaternionArray':
+        return self._new(self.data + self._data(other), self.unit_system)
+
+    def __sub__(self, other) -> 'QuaternionArray':
+        return self._new(self.data - self._data(other), self.unit_system)
+
+    def __neg__(self) -> 'QuaternionArray':
+        return self._new(-self.data, self.unit_system)
+
+    def __mul__(self, scale) -> 'QuaternionArray':
+        scale = np.asarray(scale, dtype=np.float64)
+        return self._new(self.data * (scale[:, np.newaxis] if scale.ndim == 1 else scale), self.unit_system)
+
+    def __rmul__(self, scale):
+        return self * scale
+
+    def __str__(self):
+        return f"QuaternionArray({len(self)} quaternions)"
+
+    def __repr__(self):
+        return self.__str__()
+
+    def length(self) -> np.ndarray:
+        return np.sqrt(np.einsum('ij,ij->i', self.data, self.data))
+
+    def normalized(self) -> 'QuaternionArray':
+        return self * (1 / self.length())
+
+    def dist(self, other) -> np.ndarray:
+        """Returns the distances between these quaternions and other quaternions (or a single Quaternion)."""
+        return (self - other).length()
+
+    def dot(self, other) -> np.ndarray:
+        return np.einsum('ij,ij->i', self.data, np.broadcast_to(self._data(other), self.data.shape))
+
+    def ang_to(self, ideal) -> np.ndarray:
+        """Returns the angles to the ideal quaternions as 4d vectors, like Vec4.ang_to. Between 0 and pi."""
+        ideal = ideal if isinstance(ideal, QuaternionArray) else QuaternionArray._new(
+            np.broadcast_to(self._data(ideal), self.data.shape))
+        cos_ang = self.dot(ideal) / (self.length() * ideal.length())
+        # clipped, rounding can push the cosine of parallel quaternions slightly out of [-1, 1]
+        return np.arccos(np.clip(cos_ang, -1, 1))
+
+    def to_unity_units(self) -> 'QuaternionArray':
+        if self.unit_system == UnitSystem.UNITY:
+            return self
+        self.data = self.data[:, [1, 2, 0, 3]]
+        self.unit_system = UnitSystem.UNITY
+        return self
+
+    def to_unreal_units(self) -> 'QuaternionArray':
+        if self.unit_system == UnitSystem.UNREAL:
+            return self
+        self.data = self.data[:, [2, 0, 1, 3]]
+        self.unit_system = UnitSystem.UNREAL
+        return self
+
+    def obs_normalized(self) -> 'QuaternionArray':
+        return self
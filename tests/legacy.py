@@ -0,0 +1,209 @@
+"""
+The code paths the tests check the optimized ones against and the benchmarks time them against: mostly the
+implementations as they were before an optimization, and the live graders fed one packet after the other.
+"""
+import copy
+import math
+
+import numpy as np
+from rlbottraining.grading.training_tick_packet import TrainingTickPacket
+
+from src.models.onnx_model import ONNXModel
+from src.scenarios.goalie.goalie_training import BallRollingToGoalie
+from src.scenarios.striker.striker_training import make_game_state_diff0, make_game_state_diff1, \
+    make_game_state_diff2, make_game_state_diff3, NUM_DIFFICULTIES
+from src.utils.ball_prediction_analysis import GOAL_THRESHOLD, find_matching_slice
+from src.utils.drive import steer_toward_target, limit_to_safe_range
+from src.utils.observation import OBSERVATION_SIZE
+from src.utils.orientation import Orientation
+from src.utils.spikes import MAX_DISTANCE_WHEN_SPIKED
+from src.utils.vec import Vec3, Vec4, Quaternion, Location, Velocity, AngularVelocity
+
+
+def first_goal_slice_with_predicate(ball_prediction):
+    """The exact first slice inside a goal, checking every slice with a Python predicate."""
+    return find_matching_slice(ball_prediction, 0, lambda s: abs(s.physics.location.y) >= GOAL_THRESHOLD)
+
+
+def nearest_active_per_pad(boost_pads, location, full_boost_only=False):
+    candidates = [i for i, pad in enumerate(boost_pads) if pad.is_active and (pad.is_full_boost or not full_boost_only)]
+    return min(candidates, key=lambda i: boost_pads[i].location.dist(location), default=None)
+
+
+def within_per_pad(boost_pads, location, radius):
+    distances = [(pad.location.dist(location), i) for i, pad in enumerate(boost_pads) if pad.is_active]
+    return [i for distance, i in sorted(distances) if distance <= radius]
+
+
+DIFFICULTIES = [make_game_state_diff0, make_game_state_diff1, make_game_state_diff2, make_game_state_diff3]
+
+
+def striker_state(rng):
+    """GoalStrikingExercise.make_game_state, also returning the tier."""
+    difficulty = math.floor(rng.uniform(0, NUM_DIFFICULTIES))
+    return difficulty, DIFFICULTIES[difficulty](rng)
+
+
+def goalie_state(rng):
+    return 0, BallRollingToGoalie('BallRollingToGoalie').make_game_state(rng)
+
+
+def build_observation_with_vec(packet, index):
+    """The observation building as it was done in MyBot.get_output with the vec classes."""
+    car_physics = packet.game_cars[index].physics
+    ball_physics = packet.game_ball.physics
+
+    car_location = Location(car_physics.location)
+    car_location.to_unity_units()
+    car_location = car_location.obs_normalized()
+
+    car_velocity = Velocity(car_physics.velocity)
+    car_velocity.to_unity_units()
+    car_velocity = car_velocity.obs_normalized()
+
+    car_rotation = Quaternion(car_physics.rotation)
+    car_rotation.to_unity_units()
+    car_rotation = car_rotation.obs_normalized()
+
+    car_angular_velocity = AngularVelocity(car_physics.angular_velocity)
+    car_angular_velocity.to_unity_units()
+    car_angular_velocity = car_angular_velocity.obs_normalized()
+
+    ball_location = Location(ball_physics.location)
+    ball_location.to_unity_units()
+    ball_location = ball_location.obs_normalized()
+
+    ball_velocity = Velocity(ball_physics.velocity)
+    ball_velocity.to_unity_units()
+    ball_velocity = ball_velocity.obs_normalized(is_ball=True)
+
+    boost = packet.game_cars[index].boost / 100
+
+    data = np.zeros(shape=[1, OBSERVATION_SIZE], dtype=np.float32)
+    data[0, 0:3] = list(car_location)
+    data[0, 3:7] = list(car_rotation)
+    data[0, 7:10] = list(car_velocity)
+    data[0, 10:13] = list(car_angular_velocity)
+    data[0, 13:16] = list(ball_location)
+    data[0, 16:19] = list(ball_velocity)
+    data[0, 19] = boost
+    return data
+
+
+def run_uncached(model: ONNXModel, data):
+    """The model call as it was done before the session metadata was cached."""
+    input_shape = model.session.get_inputs()[0].shape
+    input_shape[0] = 1
+    if model.is_continuous:
+        return model.session.run([model.output_name], {model.input_name: data})
+    return model.session.run([model.output_name], {model.input_name: data,
+                                                   'action_masks': np.array([[1] * 26], dtype=np.float32)})
+
+
+def packet_tick(packet, index, boost_pad_tracker, spike_watcher):
+    boost_pad_tracker.update_boost_status(packet)
+    spike_watcher.read_packet(packet)
+    my_car = packet.game_cars[index]
+    car_location = Vec3(my_car.physics.location)
+    car_velocity = Vec3(my_car.physics.velocity)
+    ball_location = Vec3(packet.game_ball.physics.location)
+    car_location.dist(ball_location)
+    car_velocity.length()
+    return steer_toward_target(my_car, ball_location)
+
+
+def snapshot_tick(snapshot, packet, index, boost_pad_tracker, spike_watcher):
+    snapshot.update(packet)
+    boost_pad_tracker.update_boost_status(snapshot)
+    spike_watcher.read_packet(snapshot)
+    my_car = snapshot.car(index)
+    car_location = my_car.location
+    car_velocity = my_car.velocity
+    ball_location = snapshot.ball.location
+    car_location.dist(ball_location)
+    car_velocity.length()
+    return steer_toward_target(my_car, ball_location)
+
+
+def intercept_per_slice(planner, ball_prediction, car, current_time):
+    """The earliest intercept with the car model of the planner evaluated for one slice after the other."""
+    for i in range(ball_prediction.num_slices):
+        ball_slice = ball_prediction.slices[i]
+        location = ball_slice.physics.location
+        if location.z <= planner.max_height and \
+                planner.arrival_time(car, location) <= ball_slice.game_seconds - current_time:
+            return i
+    return None
+
+
+def spiked_car_per_car(packet):
+    """The spike detection of SpikeWatcher as it was before, with a Vec3 per car."""
+    ball_location = Vec3.from_packet(packet.game_ball.physics.location)
+    closest_index = None
+    closest_distance = 999999
+    for i in range(packet.num_cars):
+        distance = Vec3.from_packet(packet.game_cars[i].physics.location).dist(ball_location)
+        if distance < MAX_DISTANCE_WHEN_SPIKED and distance < closest_distance:
+            closest_index = i
+            closest_distance = distance
+    return closest_index
+
+
+def car_distances_per_car(packet):
+    locations = [Vec3.from_packet(packet.game_cars[i].physics.location) for i in range(packet.num_cars)]
+    return [[a.dist(b) for b in locations] for a in locations]
+
+
+def legacy_orientation(rotation):
+    """Orientation as it was built before, with the checked Vec3 constructor."""
+    ori = Orientation.__new__(Orientation)
+    ori.yaw = float(rotation.yaw)
+    ori.roll = float(rotation.roll)
+    ori.pitch = float(rotation.pitch)
+    cr, sr = math.cos(ori.roll), math.sin(ori.roll)
+    cp, sp = math.cos(ori.pitch), math.sin(ori.pitch)
+    cy, sy = math.cos(ori.yaw), math.sin(ori.yaw)
+    ori.forward = Vec3(cp * cy, cp * sy, sp)
+    ori.right = Vec3(cy * sp * sr - cr * sy, sy * sp * sr + cr * cy, -cp * sr)
+    ori.up = Vec3(-cr * cy * sp - sr * sy, -cr * sy * sp + sr * cy, cp * cr)
+    return ori
+
+
+def legacy_sub(a, b):
+    return Vec3(a.x - b.x, a.y - b.y, a.z - b.z)
+
+
+def legacy_relative_location(center, ori, target):
+    """relative_location as it was before: three subtractions through the checked Vec3 constructor."""
+    x = legacy_sub(target, center).dot(ori.forward)
+    y = legacy_sub(target, center).dot(ori.right)
+    z = legacy_sub(target, center).dot(ori.up)
+    return Vec3(x, y, z)
+
+
+def legacy_steer_toward_target(car, target):
+    relative = legacy_relative_location(Vec3(car.physics.location), legacy_orientation(car.physics.rotation), target)
+    angle = math.atan2(relative.y, relative.x)
+    return limit_to_safe_range(angle * 5)
+
+
+def legacy_quaternion(rotator):
+    """Quaternion(rotator) as it was before, which ran Vec4.__init__ first."""
+    q = Quaternion.__new__(Quaternion)
+    Vec4.__init__(q)
+    Quaternion.__init__(q, rotator)
+    return q
+
+
+def legacy_game_state_vector(location):
+    return copy.deepcopy(location).to_unreal_units().to_game_state_vector()
+
+
+def grade_live(grader, packets):
+    tick = TrainingTickPacket()
+    for i, packet in enumerate(packets):
+        tick.update(packet)
+        grade = grader.on_tick(tick)
+        if grade is not None:
+            return i, grade
+    return None
@@ -0,0 +1,20 @@
+import onnx
+from onnx import helper
+
+
+def make_deterministic_model(model_path: str, path: str):
+    """
+    Writes a copy of the model that does not sample: RandomNormalLike nodes return zeros (x - x) and Multinomial nodes
+    (single int64 sample) pick the most likely action.
+    """
+    model = onnx.load(model_path)
+    nodes = list(model.graph.node)
+    for i, node in enumerate(nodes):
+        if node.op_type == 'RandomNormalLike':
+            nodes[i] = helper.make_node('Sub', [node.input[0], node.input[0]], list(node.output), name=node.name)
+        elif node.op_type == 'Multinomial':
+            nodes[i] = helper.make_node('ArgMax', list(node.input), list(node.output), name=node.name, axis=1,
+                                        keepdims=1)
+    del model.graph.node[:]
+    model.graph.node.extend(nodes)
+    onnx.save(model, path)
@@ -0,0 +1,158 @@
+"""
+Builders of game data for the tests and the benchmarks, so they can run without a game: random packets, field info
+and ball predictions, the packets of a graded run and the action steps and tick times of a test scenario.
+"""
+import random
+
+from rlbot.agents.base_agent import SimpleControllerState
+from rlbot.utils.structures.ball_prediction_struct import BallPrediction
+from rlbot.utils.structures.game_data_struct import GameTickPacket, FieldInfoPacket
+
+from src.utils.sequence import ControlStep
+
+# Number of boost pads on the standard arenas
+STANDARD_NUM_BOOSTS = 34
+
+
+def _fill_vector(vector, rng: random.Random, scale: float):
+    vector.x = rng.uniform(-scale, scale)
+    vector.y = rng.uniform(-scale, scale)
+    vector.z = rng.uniform(0, scale)
+
+
+def _fill_physics(physics, rng: random.Random):
+    _fill_vector(physics.location, rng, 4000)
+    _fill_vector(physics.velocity, rng, 2000)
+    _fill_vector(physics.angular_velocity, rng, 5.5)
+    physics.rotation.pitch = rng.uniform(-1.5, 1.5)
+    physics.rotation.yaw = rng.uniform(-3.1, 3.1)
+    physics.rotation.roll = rng.uniform(-3.1, 3.1)
+
+
+def make_packet(num_cars: int = 1, seed: int = 0, num_boosts: int = 0) -> GameTickPacket:
+    """
+    Creates a GameTickPacket filled with random but plausible physics values.
+    """
+    rng = random.Random(seed)
+    packet = GameTickPacket()
+    packet.num_cars = num_cars
+    for i in range(num_cars):
+        car = packet.game_cars[i]
+        _fill_physics(car.physics, rng)
+        car.boost = rng.randint(0, 100)
+        car.team = i % 2
+        car.name = f'PGBot_{i}'
+    _fill_physics(packet.game_ball.physics, rng)
+    packet.num_boost = num_boosts
+    for i in range(num_boosts):
+        pad = packet.game_boosts[i]
+        pad.is_active = rng.random() < 0.7
+        pad.timer = 0.0 if pad.is_active else rng.uniform(0, 10)
+    packet.game_info.seconds_elapsed = rng.uniform(0, 300)
+    return packet
+
+
+def make_field_info(num_boosts: int = STANDARD_NUM_BOOSTS, seed: int = 0) -> FieldInfoPacket:
+    """
+    Creates a FieldInfoPacket with randomly placed boost pads, every sixth of them a full boost.
+    """
+    rng = random.Random(seed)
+    field_info = FieldInfoPacket()
+    field_info.num_boosts = num_boosts
+    for i in range(num_boosts):
+        pad = field_info.boost_pads[i]
+        pad.location.x = rng.uniform(-4000, 4000)
+        pad.location.y = rng.uniform(-5000, 5000)
+        pad.location.z = 70
+        pad.is_full_boost = i % 6 == 0
+    return field_info
+
+
+def make_ball_prediction(seed: int = 0, start_time: float = 100.0, num_slices: int = 360,
+                         velocity_scale: float = 2000) -> BallPrediction:
+    """
+    Creates a BallPrediction with a simple ballistic ball that bounces off the floor and the side walls, sampled at
+    60 slices per second like the real prediction. The ball is not stopped by the goals, so it may fly through one.
+    """
+    rng = random.Random(seed)
+    prediction = BallPrediction()
+    prediction.num_slices = num_slices
+    x, y, z = rng.uniform(-3000, 3000), rng.uniform(-4000, 4000), rng.uniform(93, 1500)
+    vx, vy, vz = (rng.uniform(-velocity_scale, velocity_scale), rng.uniform(-velocity_scale, velocity_scale),
+                  rng.uniform(-velocity_scale / 2, velocity_scale / 2))
+    dt = 1 / 60
+    for i in range(num_slices):
+        ball_slice = prediction.slices[i]
+        ball_slice.game_seconds = start_time + i * dt
+        location, velocity = ball_slice.physics.location, ball_slice.physics.velocity
+        location.x, location.y, location.z = x, y, z
+        velocity.x, velocity.y, velocity.z = vx, vy, vz
+        vz -= 650 * dt
+        x, y, z = x + vx * dt, y + vy * dt, z + vz * dt
+        if z < 93:
+            z, vz = 93, -vz * 0.6
+        if abs(x) > 4000:
+            vx = -vx
+    return prediction
+
+
+def shift_prediction(ball_prediction, num_slices):
+    """The prediction num_slices ticks later, if nothing touches the ball."""
+    shifted = BallPrediction()
+    shifted.num_slices = ball_prediction.num_slices - num_slices
+    for i in range(shifted.num_slices):
+        shifted.slices[i] = ball_prediction.slices[i + num_slices]
+    return shifted
+
+
+def make_run(seed: int, num_ticks: int = 600):
+    """
+    Creates the packets of a random run: the ball and the car wander along y, the ball changes its direction now and
+    then, and goals are scored or the scores are reset at random ticks.
+    """
+    rng = random.Random(seed)
+    packets = []
+    seconds_elapsed = rng.uniform(0, 300)
+    ball_y = rng.uniform(-3000, 3000)
+    car_y = rng.uniform(-3000, 3000)
+    velocity_y = 0
+    scores = [rng.randint(0, 3), rng.randint(0, 3)]
+    for _ in range(num_ticks):
+        packet = GameTickPacket()
+        if rng.random() < 0.05:
+            velocity_y = rng.uniform(-1500, 1500)
+        ball_y += velocity_y / 60
+        car_y += rng.uniform(-30, 30)
+        roll = rng.random()
+        if roll < 0.002:
+            scores[rng.randint(0, 1)] += 1
+        elif roll < 0.003:
+            scores = [0, 0]
+        seconds_elapsed += rng.choice((1 / 60, 1 / 60, 1 / 120))
+        packet.game_info.seconds_elapsed = seconds_elapsed
+        packet.game_ball.physics.location.y = ball_y
+        packet.game_ball.physics.velocity.y = velocity_y
+        packet.num_cars = 1
+        packet.game_cars[0].physics.location.y = car_y
+        packet.num_teams = 2
+        for team_index, score in enumerate(scores):
+            packet.teams[team_index].team_index = team_index
+            packet.teams[team_index].score = score
+        packets.append(packet)
+    return packets
+
+
+def make_steps(num_actions=5000, seed=0):
+    rng = random.Random(seed)
+    return [ControlStep(duration=rng.choice([0.0, 1 / 120, 1 / 60, 0.1]),
+                        controls=SimpleControllerState(throttle=rng.uniform(-1, 1), jump=rng.random() < 0.5))
+            for _ in range(num_actions)]
+
+
+def make_tick_times(duration, seed=0):
+    # ticks at roughly 120 Hz with some jitter, as the game delivers them
+    rng = random.Random(seed)
+    times = [0.0]
+    while times[-1] < duration:
+        times.append(times[-1] + 1 / 120 + rng.uniform(-0.002, 0.002))
+    return times
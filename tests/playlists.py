@@ -0,0 +1,80 @@
+"""
+The exercises, graders and bots the tests and the benchmarks run.
+"""
+import os
+
+from rlbot.training.training import Pass
+
+from src.bots.bot import MyBot
+from src.bots.model_bot import MyBot as ModelBot
+from src.evaluation.parallel import BotFactory
+from src.evaluation.results import MODEL_SEED
+from src.graders.fail_graders import FailOnTimeout, FailOnBallPassingStriker
+from src.graders.pass_graders import PassOnGoalForAllyTeam, PassOnBallGoingAwayFromGoal, PassOnTimeout
+from src.models.onnx_model import ONNXModel
+from src.scenarios.goalie.goalie_training import BallRollingToGoalie, GoalieGrader, \
+    make_default_playlist as make_goalie_default_playlist
+from src.scenarios.striker.striker_training import GoalStrikingExercise, StrikerGrader, \
+    make_default_playlist as make_striker_default_playlist
+
+GOALIE_MODEL = os.path.join(os.path.dirname(__file__), '..', 'models', 'GoalKeeping.onnx')
+
+GRADERS = [
+    lambda: FailOnTimeout(8.0),
+    lambda: PassOnTimeout(8.0),
+    lambda: FailOnBallPassingStriker(),
+    lambda: PassOnGoalForAllyTeam(0),
+    lambda: PassOnGoalForAllyTeam(1),
+    lambda: PassOnBallGoingAwayFromGoal(0),
+    lambda: PassOnBallGoingAwayFromGoal(1),
+    lambda: StrikerGrader(timeout_seconds=8.0),
+    lambda: GoalieGrader(timeout_seconds=8.0, ally_team=1),
+]
+
+
+def make_playlist():
+    """The default playlists of the striker and the goalie."""
+    return make_striker_default_playlist() + make_goalie_default_playlist()
+
+
+def make_striker_playlist(early_termination=False):
+    return [GoalStrikingExercise('GoalStrikingExercise', grader=StrikerGrader(early_termination=early_termination))]
+
+
+def make_goalie_playlist(early_termination=False):
+    return [BallRollingToGoalie('BallRollingToGoalie', grader=GoalieGrader(early_termination=early_termination))]
+
+
+def make_striker_bots():
+    return [MyBot('PGBot', 0, 0)]
+
+
+def make_goalie_bots():
+    # a fresh model per episode, the model samples its actions and a shared one would carry its random state over
+    bot = ModelBot('PGBot', 0, 0)
+    bot.switch_model(GOALIE_MODEL, ONNXModel(GOALIE_MODEL, MODEL_SEED))
+    return [bot]
+
+
+def outcome(grade):
+    if grade is None:
+        return 'none'
+    return 'pass' if isinstance(grade, Pass) else 'fail'
+
+
+class CrashOnceBotFactory(BotFactory):
+    """Kills the worker process the first time it creates a bot, in any worker."""
+
+    def __init__(self, marker_path: str):
+        super().__init__(MyBot)
+        self.marker_path = marker_path
+
+    def __call__(self):
+        if not os.path.exists(self.marker_path):
+            open(self.marker_path, 'w').close()
+            os._exit(3)
+        return super().__call__()
+
+
+def comparable(table):
+    return [(r.model, r.exercise, r.episode, r.seed, r.outcome, r.grade, r.ticks) for r in table.rows]
@@ -0,0 +1,84 @@
+import math
+
+import pytest
+
+from src.utils.ball_prediction_analysis import BallPredictionArray, GOAL_THRESHOLD, predict_future_goal
+from src.utils.vec import Vec3
+from tests.legacy import first_goal_slice_with_predicate
+from tests.packets import make_ball_prediction
+
+PREDICTIONS = [make_ball_prediction(seed=seed) for seed in range(200)]
+
+
+def locations(prediction):
+    return [prediction.slices[i].physics.location for i in range(prediction.num_slices)]
+
+
+def test_goal_slice_matches_the_predicate_per_slice():
+    prediction_array = BallPredictionArray()
+    goals = 0
+    for prediction in PREDICTIONS:
+        expected = first_goal_slice_with_predicate(prediction)
+        actual = predict_future_goal(prediction_array.update(prediction))
+        assert (actual is None) == (expected is None)
+        if expected is not None:
+            goals += 1
+            assert actual.game_seconds == expected.game_seconds
+            assert predict_future_goal(prediction).game_seconds == expected.game_seconds
+    # the comparison means little if the synthetic predictions rarely reach a goal
+    assert goals > 10
+
+
+def test_goal_crossing_is_between_the_slices_around_it():
+    prediction_array = BallPredictionArray()
+    for prediction in PREDICTIONS:
+        goal = prediction_array.update(prediction).find_goal()
+        if goal is None or goal.index == 0:
+            continue
+        before, after = prediction.slices[goal.index - 1], prediction.slices[goal.index]
+        assert before.game_seconds <= goal.time <= after.game_seconds
+        assert abs(goal.location.y) == pytest.approx(GOAL_THRESHOLD)
+        assert goal.team == (1 if after.physics.location.y > 0 else 0)
+
+
+@pytest.mark.parametrize('speed', [500, 1400, 2300])
+def test_earliest_intercept_matches_the_check_per_slice(speed):
+    car = Vec3(0, -4000, 17)
+    prediction_array = BallPredictionArray()
+    for prediction in PREDICTIONS[:50]:
+        prediction_array.update(prediction)
+        start = prediction.slices[0].game_seconds
+        expected = next((i for i, location in enumerate(locations(prediction))
+                         if car.dist(Vec3(location)) <= speed * (prediction.slices[i].game_seconds - start)), None)
+        assert prediction_array.earliest_intercept(car, speed) == expected
+
+
+def test_height_windows_match_the_check_per_slice():
+    prediction_array = BallPredictionArray()
+    for prediction in PREDICTIONS[:50]:
+        prediction_array.update(prediction)
+        expected = []
+        for i, location in enumerate(locations(prediction)):
+            if location.z >= 300:
+                time = prediction.slices[i].game_seconds
+                if expected and expected[-1][1] == prediction.slices[i - 1].game_seconds and \
+                        prediction.slices[i - 1].physics.location.z >= 300:
+                    expected[-1] = (expected[-1][0], time)
+                else:
+                    expected.append((time, time))
+        assert prediction_array.height_windows(300) == expected
+
+
+def test_update_follows_the_number_of_slices():
+    prediction_array = BallPredictionArray(capacity=100)
+    long_prediction = make_ball_prediction(seed=1, num_slices=360)
+    short_prediction = make_ball_prediction(seed=2, num_slices=30)
+    assert prediction_array.update(long_prediction).num_slices == 360
+    assert prediction_array.update(short_prediction).num_slices == 30
+    assert len(prediction_array.location) == 30
+    assert prediction_array.location[-1, 0] == short_prediction.slices[29].physics.location.x
+    start = short_prediction.slices[0].game_seconds
+    assert prediction_array.index_at_time(float(prediction_array.time[10])) == 10
+    assert prediction_array.index_at_time(start - 1) is None
+    assert prediction_array.index_at_time(start + 1) is None
+    assert math.isclose(prediction_array.time[-1], short_prediction.slices[29].game_seconds)
@@ -0,0 +1,138 @@
+import configparser
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from src.bots import test_bot
+from src.simulation.matchcomms import LocalMatchcomms, LOCAL_ROOT_URL
+from src.utils import logger
+from tests.packets import make_packet
+
+TEST_DIRECTORY = Path(__file__).absolute().parent.parent / 'src' / 'scenarios' / 'Test'
+
+
+def scenario_data(name: str, cars) -> dict:
+    vector = {'x': 0.0, 'y': 0.0, 'z': 0.0}
+    start_values = {'position': vector, 'velocity': vector, 'angularVelocity': vector, 'rotation': vector}
+    game_objects = [{'gameObject': 'ball', 'startValues': start_values}]
+    game_objects += [{'gameObject': 'car', 'id': car_id, 'team': '0', 'lead': lead, 'startValues': start_values,
+                      'actions': [{'duration': 0.5, 'inputs': [{'name': 'throttle', 'value': 1.0}]}]}
+                     for car_id, lead in cars]
+    return {'name': name, 'time': 1.0, 'gameObjects': game_objects}
+
+
+@pytest.fixture
+def test_runner(monkeypatch):
+    # the runner is started from its directory and imports test_training from there
+    monkeypatch.chdir(TEST_DIRECTORY)
+    monkeypatch.syspath_prepend(str(TEST_DIRECTORY))
+    import test_runner
+    return test_runner
+
+
+def write_scenarios(directory: Path, scenarios) -> list:
+    directory.mkdir(exist_ok=True)
+    paths = []
+    for data in scenarios:
+        path = directory / (data['name'] + '.json')
+        path.write_text(json.dumps(data))
+        paths.append(str(path))
+    return paths
+
+
+def _lead(config_path: str) -> str:
+    config = configparser.ConfigParser()
+    config.read(config_path)
+    return config['Bot Parameters']['lead']
+
+
+def test_rosters_get_their_own_bot_configs(test_runner, tmp_path):
+    # the first scenarios of both rosters have the same name and the same cars, only the lead car differs
+    paths = write_scenarios(tmp_path / 'a', [scenario_data('same', [('0', True), ('1', False)])])
+    paths += write_scenarios(tmp_path / 'b', [scenario_data('same', [('0', False), ('1', True)])])
+    with test_runner.BotConfigs() as bot_configs:
+        playlist = test_runner.make_batch_playlist(bot_configs, paths, str(tmp_path))
+        leads = [[_lead(player.config_path) for player in exercise.match_config.player_configs]
+                 for exercise in playlist]
+    assert leads == [['True', 'False'], ['False', 'True']]
+
+
+def test_briefing_waits_for_a_bot_that_connects_late(test_runner, tmp_path):
+    paths = write_scenarios(tmp_path / 'scenarios', [scenario_data('first', [('0', True)]),
+                                                     scenario_data('second', [('0', True)])])
+    hub = LocalMatchcomms()
+    with test_runner.BotConfigs() as bot_configs:
+        playlist = test_runner.make_batch_playlist(bot_configs, paths, str(tmp_path))
+        exercise = playlist[1]
+        exercise.matchcomms_factory = hub.connect
+
+        bot = test_bot.TestBot('PGBot_0', 0, 0)
+        bot.matchcomms_root = LOCAL_ROOT_URL
+        bot.scenario_cache_directory = str(bot_configs.directory)
+        stop = threading.Event()
+
+        def run_bot():
+            # the bot connects after the first briefing was sent
+            time.sleep(1.5)
+            bot._matchcomms = hub.connect()
+            while not stop.is_set():
+                bot.check_briefing()
+                time.sleep(0.01)
+
+        thread = threading.Thread(target=run_bot, daemon=True)
+        thread.start()
+        exercise.on_briefing()
+        stop.set()
+        thread.join()
+        assert bot.scenario.name == 'second'
+        assert bot.briefing_id is not None
+
+        # a resent briefing is answered but does not restart the scenario
+        bot.active_sequence = sequence = object()
+        message = {'scenario_cache': exercise.scenario_cache, 'results_path': exercise.results_path, 'car_id': '0',
+                   'reply_id': bot.briefing_id}
+        bot.matchcomms.incoming_broadcast.put_nowait(message)
+        bot.check_briefing()
+        assert bot.active_sequence is sequence
+
+
+def test_scenario_caches_stay_in_the_private_directory(test_runner, tmp_path):
+    paths = write_scenarios(tmp_path / 'scenarios', [scenario_data('first', [('0', True)])])
+    with test_runner.BotConfigs() as bot_configs:
+        playlist = test_runner.make_batch_playlist(bot_configs, paths, str(tmp_path))
+        cache_directory = Path(playlist[0].scenario_cache).parent
+        assert cache_directory == bot_configs.directory
+        assert cache_directory.stat().st_mode & 0o077 == 0
+
+        # a briefing that points the bot to a cache somewhere else is ignored
+        bot = test_bot.TestBot('PGBot_0', 0, 0)
+        bot.matchcomms_root = LOCAL_ROOT_URL
+        bot.scenario_cache_directory = str(cache_directory)
+        bot._matchcomms = LocalMatchcomms().connect()
+        planted = tmp_path / 'planted.pickle'
+        planted.write_bytes(Path(playlist[0].scenario_cache).read_bytes())
+        bot.matchcomms.incoming_broadcast.put_nowait({'scenario_cache': str(planted), 'results_path': str(tmp_path),
+                                                      'car_id': '0', 'reply_id': 'planted'})
+        bot.check_briefing()
+        assert bot.scenario is None
+
+
+def test_retired_bot_leaves_a_complete_log(tmp_path):
+    def slow_convert_to_json(record_path, json_path):
+        time.sleep(0.3)
+        convert_to_json(record_path, json_path)
+
+    convert_to_json = logger.convert_to_json
+    bot = test_bot.TestBot('PGBot_0', 0, 0)
+    json_path = tmp_path / 'scenario.json'
+    bot.logger = logger.FrameRecorder(str(tmp_path / 'scenario.frames'), json_path=str(json_path))
+    with mock.patch('src.utils.logger.convert_to_json', slow_convert_to_json):
+        for seed in range(10):
+            bot.logger.log(make_packet(num_cars=1, seed=seed))
+        bot.retire()
+        assert len(json.loads(json_path.read_text())) > 0
@@ -0,0 +1,55 @@
+import pytest
+
+from src.utils.boost_pad_tracker import BoostPadTracker
+from src.utils.packet_snapshot import PacketSnapshot
+from src.utils.vec import Vec3
+from tests.legacy import nearest_active_per_pad, within_per_pad
+from tests.packets import make_packet, make_field_info, STANDARD_NUM_BOOSTS
+
+
+def tracked(num_packets=100):
+    """Yields the tracker updated with one synthetic packet after the other, and the packet and car location."""
+    tracker = BoostPadTracker()
+    snapshot = PacketSnapshot()
+    for seed in range(num_packets):
+        packet = make_packet(seed=seed, num_boosts=STANDARD_NUM_BOOSTS)
+        tracker.initialize_boosts(make_field_info(seed=seed))
+        tracker.update_boost_status(snapshot.update(packet))
+        yield tracker, packet, snapshot.car(0).location
+
+
+def test_tracker_reads_the_pads_of_the_packet():
+    for tracker, packet, _ in tracked():
+        assert [(pad.is_active, pad.timer) for pad in tracker.boost_pads] == \
+               [(packet.game_boosts[i].is_active, packet.game_boosts[i].timer) for i in range(packet.num_boost)]
+
+
+def test_queries_match_the_loops_per_pad():
+    for tracker, _, location in tracked():
+        boost_pads = tracker.boost_pads
+        assert tracker.nearest_active_pad(location) == nearest_active_per_pad(boost_pads, location)
+        assert tracker.nearest_active_full_pad(location) == nearest_active_per_pad(boost_pads, location, True)
+        assert tracker.pads_within(location, 2000).tolist() == within_per_pad(boost_pads, location, 2000)
+
+
+@pytest.mark.parametrize('within_time', [1, 5])
+def test_nearest_pad_counts_pads_that_respawn_in_time(within_time):
+    for tracker, _, location in tracked(30):
+        respawn_times = tracker.respawn_times()
+        candidates = [i for i, pad in enumerate(tracker.boost_pads) if respawn_times[i] <= within_time]
+        expected = min(candidates, key=lambda i: tracker.boost_pads[i].location.dist(location), default=None)
+        assert tracker.nearest_active_pad(location, within_time=within_time) == expected
+
+
+def test_pads_along_the_path_in_passing_order():
+    end = Vec3(0, 5000, 17)
+    for tracker, _, start in tracked(30):
+        path = end - start
+        expected = []
+        for i, pad in enumerate(tracker.boost_pads):
+            offset = pad.location - start
+            progress = min(max((offset.x * path.x + offset.y * path.y) / (path.x ** 2 + path.y ** 2), 0), 1)
+            closest = Vec3(offset.x - progress * path.x, offset.y - progress * path.y, 0)
+            if pad.is_active and closest.length() <= 500:
+                expected.append((progress, i))
+        assert tracker.pads_along(start, end, 500).tolist() == [i for _, i in sorted(expected)]
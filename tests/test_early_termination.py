@@ -0,0 +1,61 @@
+from functools import lru_cache
+
+import pytest
+from rlbot.utils.structures.ball_prediction_struct import BallPrediction
+
+from src.graders.early_termination import PredictedPass, PredictedFail, game_ball_prediction
+from src.scenarios.state_corpus import StateCorpus, make_replay_playlist
+from src.simulation.headless import HeadlessSession
+from tests.playlists import make_striker_playlist, make_striker_bots, make_goalie_playlist, \
+    make_goalie_bots, outcome
+
+PLAYLISTS = [(make_striker_playlist, make_striker_bots), (make_goalie_playlist, make_goalie_bots)]
+
+
+@lru_cache(maxsize=None)
+def run_corpus(make_playlist, make_bots, num_seeds=40):
+    corpus = StateCorpus.build(make_playlist(), range(num_seeds))
+    session = HeadlessSession(make_bots)
+    full = [session.run(exercise, 0) for exercise in make_replay_playlist(corpus, make_playlist)]
+    early = [session.run(exercise, 0) for exercise in make_replay_playlist(corpus, lambda: make_playlist(True))]
+    return full, early
+
+
+@pytest.mark.parametrize('make_playlist, make_bots', PLAYLISTS)
+def test_early_grades_agree_with_full_length_runs(make_playlist, make_bots):
+    full, early = run_corpus(make_playlist, make_bots)
+    for full_result, early_result in zip(full, early):
+        assert early_result.ticks <= full_result.ticks
+        if isinstance(early_result.grade, (PredictedPass, PredictedFail)):
+            assert outcome(early_result.grade) == outcome(full_result.grade)
+        else:
+            # without a prediction both runs are the same
+            assert (early_result.ticks, repr(early_result.grade)) == (full_result.ticks, repr(full_result.grade))
+
+
+def test_goalie_ends_exercises_early():
+    full, early = run_corpus(make_goalie_playlist, make_goalie_bots)
+    assert any(isinstance(result.grade, (PredictedPass, PredictedFail)) for result in early)
+    assert sum(result.ticks for result in early) < sum(result.ticks for result in full)
+
+
+def test_striker_leaves_passes_to_its_graders():
+    _, early = run_corpus(make_striker_playlist, make_striker_bots)
+    assert not any(isinstance(result.grade, PredictedPass) for result in early)
+
+
+class FakeGameInterface:
+    def __init__(self):
+        self.updates = 0
+
+    def update_ball_prediction(self, prediction: BallPrediction):
+        self.updates += 1
+        prediction.num_slices = self.updates
+
+
+def test_game_ball_prediction_fills_one_struct():
+    game_interface = FakeGameInterface()
+    source = game_ball_prediction(game_interface)
+    first = source()
+    assert source() is first
+    assert first.num_slices == 2
@@ -0,0 +1,91 @@
+import math
+from random import Random
+
+import numpy as np
+import pytest
+from rlbottraining.rng import SeededRandomNumberGenerator
+
+from src.scenarios.goalie.goalie_training import sample_goalie_game_states
+from src.scenarios.striker.striker_training import sample_striker_game_states, NUM_DIFFICULTIES
+from src.utils.game_state_batch import GameStateBatch
+from tests.legacy import striker_state, goalie_state
+
+COLUMNS = ('ball_location', 'ball_velocity', 'car_location', 'car_yaw', 'car_boost', 'tier')
+COUNT = 20000
+EXERCISES = [
+    pytest.param(striker_state, sample_striker_game_states, NUM_DIFFICULTIES, id='GoalStrikingExercise'),
+    pytest.param(goalie_state, sample_goalie_game_states, 1, id='BallRollingToGoalie'),
+]
+
+
+def columns_of_states(tiers_and_states):
+    """The columns of a GameStateBatch, read from GameState objects."""
+    def vector(v):
+        return v.x, v.y, v.z
+
+    tiers, states = zip(*tiers_and_states)
+    return {
+        'ball_location': np.array([vector(s.ball.physics.location) for s in states], dtype=np.float64),
+        'ball_velocity': np.array([vector(s.ball.physics.velocity) for s in states], dtype=np.float64),
+        'car_location': np.array([vector(s.cars[0].physics.location) for s in states], dtype=np.float64),
+        'car_yaw': np.array([s.cars[0].physics.rotation.yaw for s in states], dtype=np.float64),
+        'car_boost': np.array([s.cars[0].boost_amount for s in states], dtype=np.float64),
+        'tier': np.array(tiers, dtype=np.int64),
+    }
+
+
+def check_same_distribution(expected, batch, num_tiers):
+    count = len(batch)
+    expected_share = np.bincount(expected['tier'], minlength=num_tiers) / count
+    share = batch.tier_counts(num_tiers) / count
+    # binomial standard error of a share of 1 / num_tiers
+    assert np.all(np.abs(share - expected_share) < 5 * math.sqrt(2 / num_tiers / count)), \
+        'the tiers are not equally likely'
+    for tier in range(num_tiers):
+        for column, values in expected.items():
+            if column == 'tier':
+                continue
+            expected_values = values[expected['tier'] == tier]
+            values = getattr(batch, column)[batch.tier == tier]
+            mean_error = np.abs(values.mean(axis=0) - expected_values.mean(axis=0))
+            standard_error = np.sqrt(expected_values.var(axis=0) / len(expected_values) +
+                                     values.var(axis=0) / len(values))
+            assert np.all(mean_error <= 5 * standard_error + 1e-6), f'{column} differs in tier {tier}'
+            spread = np.ptp(expected_values, axis=0)
+            quantiles = (0.05, 0.25, 0.5, 0.75, 0.95)
+            assert np.all(np.abs(np.quantile(values, quantiles, axis=0) -
+                                 np.quantile(expected_values, quantiles, axis=0)) <= 0.03 * spread + 1e-6), \
+                f'{column} has different quantiles in tier {tier}'
+            if column != 'ball_velocity':
+                # the sampled values cover the same ranges, the velocities derived from them have rare extremes
+                assert np.all(np.abs(values.min(axis=0) - expected_values.min(axis=0)) <= 0.02 * spread + 1e-6) and \
+                    np.all(np.abs(values.max(axis=0) - expected_values.max(axis=0)) <= 0.02 * spread + 1e-6), \
+                    f'{column} has a different range in tier {tier}'
+
+
+@pytest.mark.parametrize('make_state, sample, num_tiers', EXERCISES)
+def test_batch_follows_the_distribution_of_single_states(make_state, sample, num_tiers):
+    states = []
+    for seed in range(COUNT):
+        rng = Random()
+        rng.seed(seed)
+        states.append(make_state(SeededRandomNumberGenerator(rng)))
+    check_same_distribution(columns_of_states(states), sample(COUNT, seed=0), num_tiers)
+
+
+@pytest.mark.parametrize('make_state, sample, num_tiers', EXERCISES)
+def test_materialized_states_are_the_rows_of_the_batch(make_state, sample, num_tiers):
+    batch = sample(500, seed=1)
+    columns = columns_of_states(zip(batch.tier, list(batch)))
+    for column in COLUMNS:
+        assert np.allclose(columns[column], getattr(batch, column))
+    again = GameStateBatch.from_game_states(list(batch), batch.tier)
+    for column in COLUMNS:
+        assert np.allclose(getattr(again, column), getattr(batch, column))
+
+
+@pytest.mark.parametrize('make_state, sample, num_tiers', EXERCISES)
+def test_same_seed_gives_the_same_batch(make_state, sample, num_tiers):
+    batch, again, other = sample(1000, seed=0), sample(1000, seed=0), sample(1000, seed=1)
+    assert all(np.array_equal(getattr(batch, column), getattr(again, column)) for column in COLUMNS)
+    assert not np.array_equal(batch.ball_location, other.ball_location)
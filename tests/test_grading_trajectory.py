@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+from rlbottraining.grading.grader import Grader
+
+from src.graders.trajectory import GradingTrajectory, grade_trajectory, first_run_end
+from tests.legacy import grade_live
+from tests.packets import make_run
+from tests.playlists import GRADERS
+
+RUNS = [make_run(seed) for seed in range(100)]
+TRAJECTORIES = [GradingTrajectory.from_packets(packets) for packets in RUNS]
+
+
+@pytest.mark.parametrize('make_grader', GRADERS, ids=lambda make_grader: type(make_grader()).__name__)
+def test_trajectory_grade_matches_the_live_grader(make_grader):
+    decided = 0
+    for packets, trajectory in zip(RUNS, TRAJECTORIES):
+        live = grade_live(make_grader(), packets)
+        batch = grade_trajectory(make_grader(), trajectory)
+        assert (live is None) == (batch is None)
+        if live is not None:
+            decided += 1
+            assert live[0] == batch.tick
+            assert type(live[1]) is type(batch.grade) and repr(live[1]) == repr(batch.grade)
+    # the random runs have to make every grader decide now and then, or the comparison says little
+    assert decided > 0
+
+
+def test_first_run_end_counts_consecutive_ticks():
+    condition = np.array([1, 1, 0, 1, 1, 1, 0, 1], dtype=bool)
+    assert first_run_end(condition, 1) == 0
+    assert first_run_end(condition, 2) == 1
+    assert first_run_end(condition, 3) == 5
+    assert first_run_end(condition, 4) is None
+    assert first_run_end(np.zeros(0, dtype=bool), 1) is None
+
+
+def test_graders_without_trajectory_support_are_rejected():
+    with pytest.raises(TypeError):
+        grade_trajectory(Grader(), TRAJECTORIES[0])
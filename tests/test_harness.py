@@ -0,0 +1,71 @@
+import traceback
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+import pytest
+import rlbottraining.exercise_runner as er
+from rlbot.matchcomms.common_uses.reply import ResponseDeadlineExceeded
+from rlbot.training.training import Pass, FailDueToExerciseException, Result
+
+from src.evaluation.harness import ModelEvaluation, PLAYLISTS
+from src.evaluation.results import PASS, ERROR, ResultsTable, outcome_of
+from src.scenarios.state_corpus import StateCorpus
+from src.scenarios.striker.striker_training import GoalStrikingExercise, \
+    make_default_playlist as make_striker_playlist
+
+MODELS = ['models/GoalKeeping01.onnx', 'models/GoalKeeping02.onnx']
+
+
+@dataclass
+class BriefedExercise(GoalStrikingExercise):
+    """Passes in the briefing, which needs matchcomms."""
+
+    def on_briefing(self):
+        self.get_matchcomms().outgoing_broadcast.put_nowait({'briefed': self.name})
+        return Pass()
+
+
+def make_briefed_playlist():
+    return [BriefedExercise('briefed')]
+
+
+@pytest.mark.parametrize('corpus', [None, StateCorpus.build(make_briefed_playlist(), range(2))])
+def test_wrapped_exercises_are_briefed(corpus):
+    # the briefing of the wrapped exercise needs the matchcomms factory of the runner
+    table = ModelEvaluation(MODELS, make_briefed_playlist, 2, corpus).run_headless()
+    assert [(r.model, r.episode, r.outcome, r.ticks) for r in table.rows] == \
+           [(model, episode, PASS, 0) for episode in range(2) for model in ('GoalKeeping01', 'GoalKeeping02')]
+
+
+def test_headless_evaluation_repeats():
+    def run():
+        table = ModelEvaluation(MODELS, lambda: make_striker_playlist()[:1], 2).run_headless(ResultsTable())
+        return [(r.model, r.exercise, r.seed, r.outcome, r.grade, r.ticks) for r in table.rows]
+
+    first = run()
+    assert len(first) == 4
+    assert run() == first
+
+
+def test_exceptions_of_the_exercise_in_the_game_are_errors(monkeypatch):
+    @contextmanager
+    def setup_manager_context():
+        yield None
+
+    def run_exercises(setup_manager, exercises, seed, reload_agent=True):
+        assert not reload_agent
+        for exercise in exercises:
+            try:
+                raise ResponseDeadlineExceeded('Did not get responses to these messages')
+            except ResponseDeadlineExceeded as e:
+                yield Result(exercise, seed, FailDueToExerciseException(e, traceback.format_exc()))
+
+    monkeypatch.setattr(er, 'setup_manager_context', setup_manager_context)
+    monkeypatch.setattr(er, 'apply_render_policy', lambda policy, setup_manager: None)
+    monkeypatch.setattr(er, 'rlbot_run_exercises', run_exercises)
+    make_playlist, match_config_path, bot_config_path = PLAYLISTS['striker']
+    table = ModelEvaluation(MODELS, make_playlist, 1).run_in_game(match_config_path, bot_config_path)
+    assert [r.outcome for r in table.rows] == [ERROR, ERROR]
+    assert table.rows[0].grade == 'rlbot.matchcomms.common_uses.reply.ResponseDeadlineExceeded: ' \
+                                  'Did not get responses to these messages'
+    assert outcome_of(Pass()) == PASS
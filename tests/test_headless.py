@@ -0,0 +1,109 @@
+from dataclasses import dataclass
+
+import pytest
+from rlbot.agents.base_agent import SimpleControllerState
+from rlbot.matchcomms.common_uses.reply import send_and_wait_for_replies, reply_to
+from rlbot.training.training import Pass
+from rlbot.utils.structures.game_data_struct import GameTickPacket
+from rlbottraining.grading.grader import Grader
+
+from src.bots.bot import MyBot
+from src.graders.trajectory import GradingTrajectory, grade_trajectory
+from src.scenarios.goalie.goalie_training import BallRollingToGoalie
+from src.scenarios.striker.striker_training import GoalStrikingExercise
+from src.simulation.headless import HeadlessSession, ConstantBot
+
+EXERCISES = [
+    lambda: GoalStrikingExercise('GoalStrikingExercise'),
+    lambda: BallRollingToGoalie('BallRollingToGoalie'),
+]
+
+
+class RecordingGrader(Grader):
+    """Copies every packet the wrapped grader sees."""
+
+    def __init__(self, grader: Grader):
+        self.grader = grader
+        self.packets = []
+
+    def on_tick(self, tick):
+        self.packets.append(GameTickPacket.from_buffer_copy(tick.game_tick_packet))
+        return self.grader.on_tick(tick)
+
+
+def summary(results):
+    return [(result.ticks, repr(result.grade)) for result in results]
+
+
+@pytest.mark.parametrize('make_exercise', EXERCISES)
+@pytest.mark.parametrize('bot_class', [MyBot, ConstantBot])
+def test_recorded_runs_are_graded_the_same(make_exercise, bot_class):
+    session = HeadlessSession(lambda: [bot_class('PGBot_0', 0, 0)])
+    for seed in range(8):
+        exercise = make_exercise()
+        recorder = RecordingGrader(exercise.grader)
+        exercise.grader = recorder
+        result = session.run(exercise, seed)
+        replayed = grade_trajectory(make_exercise().grader, GradingTrajectory.from_packets(recorder.packets))
+        assert (replayed is None) == (result.grade is None)
+        if replayed is not None:
+            assert replayed.tick == result.ticks
+            assert repr(replayed.grade) == repr(result.grade)
+
+
+@pytest.mark.parametrize('make_exercise', EXERCISES)
+def test_same_seeds_give_the_same_runs(make_exercise):
+    session = HeadlessSession(lambda: [MyBot('PGBot_0', 0, 0)])
+    first = [session.run(make_exercise(), seed) for seed in range(5)]
+    again = [session.run(make_exercise(), seed) for seed in range(5)]
+    assert summary(again) == summary(first)
+    assert len({result.ticks for result in first}) > 1
+
+
+class BriefedBot(ConstantBot):
+    """Answers every briefing on its next tick and drives with the throttle it was briefed with."""
+
+    def initialize_agent(self):
+        self.briefings = []
+
+    def get_output(self, packet) -> SimpleControllerState:
+        incoming = self.matchcomms.incoming_broadcast
+        while not incoming.empty():
+            message = incoming.get_nowait()
+            if message.get('index') == self.index:
+                self.briefings.append(message)
+                self.controls = SimpleControllerState(throttle=message['throttle'])
+                reply_to(self.matchcomms, message)
+        return self.controls
+
+
+@dataclass
+class BriefedExercise(GoalStrikingExercise):
+    throttle: float = -1.0
+    briefing_grade: object = None
+
+    def on_briefing(self):
+        self.replies = send_and_wait_for_replies(self.get_matchcomms(), [{'index': 0, 'throttle': self.throttle}],
+                                                 timeout_seconds=0.05, num_retries=0)
+        return self.briefing_grade
+
+
+def test_briefing_reaches_the_bots_before_the_run():
+    session = HeadlessSession(lambda: [BriefedBot('PGBot_0', 0, 0)], reload_bots=False)
+    exercise = BriefedExercise('briefed', throttle=-1.0)
+    result = session.run(exercise, 0)
+    bot = session.bots[0]
+    assert [message['throttle'] for message in bot.briefings] == [-1.0]
+    assert len(exercise.replies.replies) == 1
+    assert bot.controls.throttle == -1.0
+    assert result.ticks > 0
+    # only the bots stay connected after the run
+    assert len(session.matchcomms.clients) == 1
+
+
+def test_briefing_grade_ends_the_run():
+    session = HeadlessSession(lambda: [BriefedBot('PGBot_0', 0, 0)])
+    grade = Pass()
+    result = session.run(BriefedExercise('briefed', briefing_grade=grade), 0)
+    assert result.grade is grade
+    assert result.ticks == 0
@@ -0,0 +1,176 @@
+import threading
+from multiprocessing.connection import Listener
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.bots.model_bot import MyBot
+from src.models.inference_server import InferenceServer, InferenceClient, InferenceError, ModelBatcher, \
+    DEFAULT_AUTHKEY
+from src.models.onnx_model import ONNXModel
+from tests.models import make_deterministic_model
+from tests.packets import make_packet
+
+MODEL_PATH = Path(__file__).absolute().parent.parent / 'models' / 'GoalKeeping05.onnx'
+
+
+@pytest.fixture(scope='module')
+def model_path(tmp_path_factory) -> str:
+    path = str(tmp_path_factory.mktemp('models') / 'deterministic.onnx')
+    make_deterministic_model(str(MODEL_PATH), path)
+    return path
+
+
+@pytest.fixture(scope='module')
+def reference(model_path) -> ONNXModel:
+    return ONNXModel(model_path)
+
+
+@pytest.fixture
+def server(model_path):
+    server = InferenceServer(('localhost', 0)).start()
+    server.get_batcher(model_path)
+    yield server
+    server.close()
+
+
+def make_bot(index: int, model) -> MyBot:
+    bot = MyBot(f'PGBot_{index}', index % 2, index)
+    bot.model_path = model.model_path
+    bot.use_model(model)
+    return bot
+
+
+def test_deterministic_model(reference):
+    # the comparisons below are meaningless if the model still samples
+    data = np.random.default_rng(0).random((3, reference.input_shape[1]), dtype=np.float32)
+    assert np.array_equal(reference.run(data)[0], reference.run(data)[0])
+
+
+@pytest.mark.parametrize('num_bots', [1, 4, 8])
+def test_every_bot_gets_the_action_of_its_observation(num_bots, model_path, reference, server):
+    bots = [make_bot(index, InferenceClient(model_path, server.address)) for index in range(num_bots)]
+    packets = [make_packet(num_cars=num_bots, seed=tick) for tick in range(20)]
+    rows = [[None] * num_bots for _ in packets]
+    barrier = threading.Barrier(num_bots)
+
+    def run(bot):
+        for tick, packet in enumerate(packets):
+            barrier.wait()
+            bot.get_output(packet)
+            rows[tick][bot.index] = (bot.model.input_buffer.copy(), bot.model.output_buffer.copy())
+
+    threads = [threading.Thread(target=run, args=(bot,)) for bot in bots]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for bot in bots:
+        bot.model.close()
+
+    assert server.batchers[model_path].num_requests == num_bots * len(packets)
+    for tick_rows in rows:
+        for observation, output in tick_rows:
+            assert np.array_equal(output, reference.run(observation)[0])
+
+
+def test_client_runs_batches(model_path, reference, server):
+    client = InferenceClient(model_path, server.address)
+    data = np.random.default_rng(1).random((5, reference.input_shape[1]), dtype=np.float32)
+    assert np.array_equal(client.run(data)[0], reference.run(data)[0])
+
+    input_buffer = client.bind(3)
+    input_buffer[:] = data[:3]
+    assert np.array_equal(client.run_bound(), reference.run(data[:3])[0])
+    with pytest.raises(ValueError):
+        client.bind(0)
+    client.close()
+
+
+def _hang_up_after_handshake(listener: Listener, model: ONNXModel):
+    """Answers the handshake of one client like the InferenceServer and then closes the connection."""
+    with listener.accept() as connection:
+        connection.recv()
+        connection.send((model.is_continuous, model.is_multi_discrete, model.input_shape[1],
+                         model.output_shape[1], np.dtype(model.output_type).str))
+
+
+def _check_fallback(bot: MyBot, client: InferenceClient, reference: ONNXModel):
+    bot.get_output(make_packet(num_cars=1, seed=1))
+    assert isinstance(bot.model, ONNXModel)
+    assert client.connection.closed
+    assert np.array_equal(bot.model.output_buffer, reference.run(bot.model.input_buffer)[0])
+
+
+def test_fallback_when_the_server_hangs_up(model_path, reference):
+    # the next receive raises EOFError
+    listener = Listener(('localhost', 0), authkey=DEFAULT_AUTHKEY)
+    thread = threading.Thread(target=_hang_up_after_handshake, args=(listener, reference))
+    thread.start()
+    client = InferenceClient(model_path, listener.address)
+    bot = make_bot(0, client)
+    thread.join()
+    listener.close()
+    _check_fallback(bot, client, reference)
+
+
+def test_fallback_when_the_connection_is_closed(model_path, reference, server):
+    # the next send raises OSError
+    client = InferenceClient(model_path, server.address)
+    bot = make_bot(0, client)
+    client.close()
+    _check_fallback(bot, client, reference)
+
+
+class ModelFailure(Exception):
+    pass
+
+
+class FailingModel:
+    """Has the attributes of the wrapped model, but running it fails."""
+
+    def __init__(self, model: ONNXModel):
+        self.model = model
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
+
+    def run(self, data):
+        raise ModelFailure('the model failed')
+
+
+def test_every_request_of_a_failed_batch_gets_the_error(reference):
+    batcher = ModelBatcher(FailingModel(reference), batch_timeout=0.05)
+    for _ in range(3):
+        batcher.register()
+    errors = []
+
+    def run():
+        try:
+            batcher.run(np.zeros((1, reference.input_shape[1]), dtype=np.float32))
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=run) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert [type(error) for error in errors] == [ModelFailure, ModelFailure]
+
+
+def test_clients_get_the_error_of_the_model(model_path, reference, server):
+    batcher = server.get_batcher(model_path)
+    clients = [InferenceClient(model_path, server.address) for _ in range(2)]
+    data = np.random.default_rng(2).random((2, reference.input_shape[1]), dtype=np.float32)
+    batcher.model = FailingModel(reference)
+    with pytest.raises(InferenceError, match='ModelFailure: the model failed'):
+        clients[0].run(data)
+    with pytest.raises(InferenceError):
+        clients[1].run_bound()
+    # the connections stay open
+    batcher.model = reference
+    for client in clients:
+        assert np.array_equal(client.run(data)[0], reference.run(data)[0])
+        client.close()
@@ -0,0 +1,49 @@
+from src.utils.ball_prediction_analysis import BallPredictionArray
+from src.utils.intercept import InterceptPlanner
+from src.utils.packet_snapshot import PacketSnapshot
+from tests.legacy import intercept_per_slice
+from tests.packets import shift_prediction
+from tests.packets import make_packet, make_ball_prediction
+
+NUM_PREDICTIONS = 200
+
+
+def plan_all():
+    """Yields the planner, prediction, car and time of every synthetic prediction after the first plan."""
+    prediction_array = BallPredictionArray()
+    snapshot = PacketSnapshot()
+    for seed in range(NUM_PREDICTIONS):
+        ball_prediction = make_ball_prediction(seed=seed)
+        car = snapshot.update(make_packet(seed=seed)).car(0)
+        current_time = ball_prediction.slices[0].game_seconds
+        planner = InterceptPlanner()
+        intercept = planner.plan(prediction_array.update(ball_prediction), car, current_time)
+        yield seed, planner, prediction_array, ball_prediction, car, current_time, intercept
+
+
+def test_planner_matches_the_search_per_slice():
+    found = 0
+    for _, planner, _, ball_prediction, car, current_time, intercept in plan_all():
+        expected = intercept_per_slice(planner, ball_prediction, car, current_time)
+        assert (intercept is None) == (expected is None)
+        if intercept is not None:
+            found += 1
+            assert intercept.index == expected
+    assert found > NUM_PREDICTIONS / 4
+
+
+def test_intercept_is_reused_until_the_prediction_changes():
+    found = reused = 0
+    for seed, planner, prediction_array, ball_prediction, car, current_time, intercept in plan_all():
+        if intercept is None:
+            continue
+        found += 1
+        # one tick later the ball is where it was predicted and the car still makes it
+        planner.plan(prediction_array.update(shift_prediction(ball_prediction, 1)), car, current_time + 1 / 60)
+        reused += planner.num_searches == 1
+        # a touch changes the prediction, so the intercept has to be searched again
+        num_searches = planner.num_searches
+        touched = make_ball_prediction(seed=seed + NUM_PREDICTIONS, start_time=current_time + 1 / 60)
+        planner.plan(prediction_array.update(touched), car, current_time + 1 / 60)
+        assert planner.num_searches == num_searches + 1
+    assert reused > found / 2
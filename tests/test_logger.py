@@ -0,0 +1,65 @@
+import threading
+from unittest import mock
+
+import pytest
+
+from src.utils.logger import Logger, FrameRecorder
+from tests.packets import make_packet
+
+
+class FakeClock:
+    """Stands in for time.time, so both loggers see the same frame times."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        self.now += 1 / 120
+        return self.now
+
+
+@pytest.mark.parametrize('num_cars', [0, 1, 4])
+def test_frame_recorder_writes_the_json_of_the_logger(num_cars, tmp_path):
+    packets = [make_packet(num_cars=num_cars, seed=i) for i in range(300)]
+    with mock.patch('src.utils.logger.time.time', FakeClock()):
+        logger = Logger(str(tmp_path / 'logger.json'))
+        for packet in packets:
+            logger.log(packet)
+    with mock.patch('src.utils.logger.time.time', FakeClock()):
+        recorder = FrameRecorder(str(tmp_path / 'recorder.frames'), json_path=str(tmp_path / 'recorder.json'),
+                                 chunk_size=50)
+        for packet in packets:
+            recorder.log(packet)
+    logger.dump()
+    recorder.dump()
+    recorder.join()
+
+    assert recorder.num_frames == len(packets)
+    assert (tmp_path / 'logger.json').read_bytes() == (tmp_path / 'recorder.json').read_bytes()
+
+
+def test_failing_writer_raises_instead_of_blocking(tmp_path):
+    # the directory of the frame file does not exist, so the writer fails right away
+    recorder = FrameRecorder(str(tmp_path / 'missing' / 'recorder.frames'), chunk_size=1, max_pending_chunks=1)
+    packet = make_packet(num_cars=2)
+    errors = []
+
+    def log():
+        try:
+            for _ in range(100):
+                recorder.log(packet)
+        except OSError as error:
+            errors.append(error)
+
+    thread = threading.Thread(target=log, daemon=True)
+    thread.start()
+    thread.join(10)
+    assert not thread.is_alive(), 'log() blocks after the writer failed'
+    assert errors, 'log() did not raise the error of the writer'
+
+    # log() raised, so dump() is never called: the writer must end nonetheless
+    with pytest.raises(OSError):
+        recorder.join(10)
+    assert not recorder._writer.is_alive()
+    with pytest.raises(OSError):
+        recorder.dump()
@@ -0,0 +1,29 @@
+import numpy as np
+
+from src.utils.observation import ObservationBuilder, OBSERVATION_SIZE
+from src.utils.packet_snapshot import PacketSnapshot
+from tests.legacy import build_observation_with_vec
+from tests.packets import make_packet
+
+
+def test_builder_matches_the_vec_based_observation():
+    builder = ObservationBuilder()
+    for seed in range(100):
+        packet = make_packet(num_cars=2, seed=seed)
+        for index in range(2):
+            np.testing.assert_array_equal(builder.build(packet, index), build_observation_with_vec(packet, index))
+
+
+def test_builder_writes_into_the_given_buffer():
+    buffer = np.zeros((1, OBSERVATION_SIZE), dtype=np.float32)
+    builder = ObservationBuilder(buffer)
+    packet = make_packet(seed=3)
+    assert builder.build(packet, 0) is buffer
+    np.testing.assert_array_equal(buffer, build_observation_with_vec(packet, 0))
+
+
+def test_builder_uses_the_given_orientation():
+    packet = make_packet(num_cars=2, seed=5)
+    car = PacketSnapshot(packet).car(1)
+    np.testing.assert_array_equal(ObservationBuilder().build(packet, 1, car.orientation),
+                                  build_observation_with_vec(packet, 1))
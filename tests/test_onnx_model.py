@@ -0,0 +1,37 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.models.onnx_model import ONNXModel
+from tests.legacy import run_uncached
+from tests.models import make_deterministic_model
+
+MODELS_PATH = Path(__file__).absolute().parent.parent / 'models'
+
+
+@pytest.fixture(scope='module', params=sorted(path.name for path in MODELS_PATH.glob('GoalKeeping*.onnx')))
+def model(request, tmp_path_factory) -> ONNXModel:
+    path = str(tmp_path_factory.mktemp('models') / request.param)
+    make_deterministic_model(str(MODELS_PATH / request.param), path)
+    return ONNXModel(path)
+
+
+def test_cached_feed_matches_the_plain_session_call(model):
+    data = np.random.default_rng(0).random((1, model.input_shape[1]), dtype=np.float32)
+    for expected, actual in zip(run_uncached(model, data), model.run(data)):
+        np.testing.assert_array_equal(actual, expected)
+
+
+@pytest.mark.parametrize('batch_size', [1, 4])
+def test_io_binding_matches_run(model, batch_size):
+    input_buffer = model.bind(batch_size)
+    rng = np.random.default_rng(batch_size)
+    for _ in range(3):
+        data = rng.random(input_buffer.shape, dtype=np.float32)
+        input_buffer[:] = data
+        expected = model.run(data)[0]
+        result = model.run_bound()
+        assert result is model.output_buffer
+        assert result.dtype == expected.dtype
+        np.testing.assert_array_equal(result, expected)
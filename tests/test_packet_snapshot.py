@@ -0,0 +1,77 @@
+import ctypes
+
+import numpy as np
+import pytest
+from rlbot.utils.structures.game_data_struct import GameTickPacket
+
+from src.utils.boost_pad_tracker import BoostPadTracker
+from src.utils.packet_snapshot import PacketSnapshot
+from src.utils.spikes import SpikeWatcher
+from tests.legacy import packet_tick, snapshot_tick
+from tests.packets import make_packet, make_field_info, STANDARD_NUM_BOOSTS
+
+
+def copy_packet(source: GameTickPacket, target: GameTickPacket):
+    """RLBot writes every tick into the same packet object, this does the same."""
+    ctypes.memmove(ctypes.addressof(target), ctypes.addressof(source), ctypes.sizeof(GameTickPacket))
+
+
+def raw_locations(packet: GameTickPacket, field: str) -> np.ndarray:
+    vectors = [getattr(packet.game_cars[i].physics, field) for i in range(packet.num_cars)]
+    return np.array([(v.x, v.y, v.z) for v in vectors], dtype=np.float32).astype(np.float64).reshape(-1, 3)
+
+
+@pytest.mark.parametrize('num_cars', [1, 2, 6])
+def test_snapshot_keeps_the_helpers_unchanged(num_cars):
+    field_info = make_field_info()
+    trackers = [BoostPadTracker(), BoostPadTracker()]
+    for tracker in trackers:
+        tracker.initialize_boosts(field_info)
+    watchers = [SpikeWatcher(), SpikeWatcher()]
+    snapshot = PacketSnapshot()
+    packet = GameTickPacket()
+    for seed in range(50):
+        copy_packet(make_packet(num_cars=num_cars, seed=seed, num_boosts=STANDARD_NUM_BOOSTS), packet)
+        assert packet_tick(packet, 0, trackers[0], watchers[0]) == \
+               snapshot_tick(snapshot, packet, 0, trackers[1], watchers[1])
+        assert [(p.is_active, p.timer) for p in trackers[0].boost_pads] == \
+               [(p.is_active, p.timer) for p in trackers[1].boost_pads]
+        assert watchers[0].carrying_index == watchers[1].carrying_index
+
+
+def test_reused_buffers_follow_the_packet():
+    packet = GameTickPacket()
+    snapshot = PacketSnapshot()
+    for seed, num_cars in enumerate([2, 2, 6, 1, 0, 4, 4]):
+        copy_packet(make_packet(num_cars=num_cars, seed=seed), packet)
+        snapshot.update(packet)
+        np.testing.assert_array_equal(snapshot.car_locations, raw_locations(packet, 'location'))
+        np.testing.assert_array_equal(snapshot.car_velocities, raw_locations(packet, 'velocity'))
+        assert len(snapshot.car_array) == num_cars
+        ball = packet.game_ball.physics.location
+        expected = np.linalg.norm(raw_locations(packet, 'location') - (ball.x, ball.y, ball.z), axis=1)
+        np.testing.assert_allclose(snapshot.proximity.ball_distances, expected, rtol=1e-12)
+        for index in range(num_cars):
+            car = snapshot.car(index)
+            assert car.location.x == packet.game_cars[index].physics.location.x
+            assert car.info.boost == packet.game_cars[index].boost
+        assert snapshot.ball.location.z == ball.z
+
+
+def test_new_packet_object_replaces_the_views():
+    snapshot = PacketSnapshot(make_packet(num_cars=3, seed=1))
+    snapshot.car(0).location
+    packet = make_packet(num_cars=3, seed=2)
+    snapshot.update(packet)
+    assert snapshot.car(0).location.x == packet.game_cars[0].physics.location.x
+    assert snapshot.ball.location.x == packet.game_ball.physics.location.x
+    np.testing.assert_array_equal(snapshot.car_locations, raw_locations(packet, 'location'))
+
+
+def test_snapshots_do_not_share_orientations():
+    # the orientation is mutable state of one snapshot, the same rotation in another snapshot gets its own
+    packet = make_packet(num_cars=2, seed=4)
+    first, second = PacketSnapshot(packet), PacketSnapshot(packet)
+    assert first.car(0).orientation is first.car(0).orientation
+    assert first.car(0).orientation is not second.car(0).orientation
+    assert first.car(0).orientation.matrix() == second.car(0).orientation.matrix()
@@ -0,0 +1,69 @@
+import os
+import time
+
+from src.bots.bot import MyBot
+from src.evaluation.parallel import ParallelRunner, BotFactory
+from src.simulation.headless import HeadlessSession
+from tests.playlists import CrashOnceBotFactory, comparable, make_playlist
+
+SEEDS = range(3)
+
+
+class HangOnceBotFactory(BotFactory):
+    """Hangs the worker the first time it creates a bot, in any worker, until the runner gives up on it."""
+
+    def __init__(self, marker_path: str):
+        super().__init__(MyBot)
+        self.marker_path = marker_path
+
+    def __call__(self):
+        if not os.path.exists(self.marker_path):
+            open(self.marker_path, 'w').close()
+            time.sleep(600)
+        return super().__call__()
+
+
+class KillIdleWorkerRunner(ParallelRunner):
+    """Kills the first worker it starts before the worker gets its first episode."""
+
+    killed = False
+
+    def _start_worker(self, worker_id):
+        worker = super()._start_worker(worker_id)
+        if not self.killed:
+            self.killed = True
+            worker.process.kill()
+            worker.process.join()
+        return worker
+
+
+def run(bots, num_workers, runner_class=ParallelRunner, **options):
+    runner = runner_class(make_playlist, bots, num_workers, **options)
+    return runner, comparable(runner.run(SEEDS))
+
+
+def test_results_do_not_depend_on_the_workers():
+    session = HeadlessSession(BotFactory(MyBot))
+    sequential = [(r.ticks, repr(r.grade)) for seed in SEEDS for r in
+                  (session.run(exercise, seed) for exercise in make_playlist())]
+    _, one = run({'MyBot': BotFactory(MyBot)}, 1)
+    _, three = run({'MyBot': BotFactory(MyBot)}, 3)
+    assert [(ticks, grade) for *_, grade, ticks in one] == sequential
+    assert three == one
+
+
+def test_crashed_and_stuck_workers_are_replaced(tmp_path):
+    _, expected = run({'MyBot': BotFactory(MyBot)}, 2)
+    runner, crashed = run({'MyBot': CrashOnceBotFactory(str(tmp_path / 'crashed'))}, 2)
+    assert (runner.stats.retries, runner.stats.crashed_workers) == (1, 1)
+    assert crashed == expected
+    runner, stuck = run({'MyBot': HangOnceBotFactory(str(tmp_path / 'stuck'))}, 2, episode_timeout=5)
+    assert (runner.stats.retries, runner.stats.crashed_workers) == (1, 1)
+    assert stuck == expected
+
+
+def test_workers_dying_between_episodes_are_replaced_without_retries():
+    _, expected = run({'MyBot': BotFactory(MyBot)}, 2)
+    runner, results = run({'MyBot': BotFactory(MyBot)}, 2, KillIdleWorkerRunner)
+    assert (runner.stats.retries, runner.stats.crashed_workers) == (0, 1)
+    assert results == expected
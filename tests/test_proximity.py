@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from src.utils import proximity
+from src.utils.packet_snapshot import PacketSnapshot
+from src.utils.spikes import MAX_DISTANCE_WHEN_SPIKED
+from tests.legacy import spiked_car_per_car, car_distances_per_car
+from tests.packets import make_packet
+
+
+def spiked_packets(num_cars, num_packets=50):
+    for seed in range(num_packets):
+        packet = make_packet(num_cars=num_cars, seed=seed)
+        # move the ball onto a car now and then, so some ticks have a spiked ball
+        if seed % 2 == 0:
+            car = packet.game_cars[seed % num_cars].physics.location
+            ball = packet.game_ball.physics.location
+            ball.x, ball.y, ball.z = car.x + 50, car.y, car.z + 100
+        yield packet
+
+
+@pytest.mark.parametrize('num_cars', [1, 2, proximity.SCALAR_MAX_CARS, proximity.SCALAR_MAX_CARS + 1, 64])
+def test_proximity_matches_the_check_per_car(num_cars):
+    snapshot = PacketSnapshot()
+    for packet in spiked_packets(num_cars):
+        closest = snapshot.update(packet).proximity.closest_car_to_ball(MAX_DISTANCE_WHEN_SPIKED)
+        assert closest == spiked_car_per_car(packet)
+        assert np.allclose(snapshot.proximity.car_distances, car_distances_per_car(packet))
+
+
+@pytest.mark.parametrize('num_cars', [1, 3, proximity.SCALAR_MAX_CARS])
+def test_scalar_and_array_distances_are_identical(num_cars, monkeypatch):
+    scalar, vectorized = PacketSnapshot(), PacketSnapshot()
+    for packet in spiked_packets(num_cars):
+        expected = scalar.update(packet).proximity
+        monkeypatch.setattr(proximity, 'SCALAR_MAX_CARS', 0)
+        actual = vectorized.update(packet).proximity
+        monkeypatch.undo()
+        assert expected.closest_car_to_ball() == actual.closest_car_to_ball()
+        assert expected.ball_distances.tolist() == actual.ball_distances.tolist()
+
+
+def test_ball_distances_follow_the_ticks():
+    snapshot = PacketSnapshot()
+    for num_cars in (2, 2, 12, 3, 0, 1):
+        packet = make_packet(num_cars=num_cars, seed=num_cars)
+        distances = snapshot.update(packet).proximity.ball_distances
+        ball = packet.game_ball.physics.location
+        expected = [np.linalg.norm(snapshot.car_locations[i] - (ball.x, ball.y, ball.z)) for i in range(num_cars)]
+        np.testing.assert_allclose(distances, expected, rtol=1e-12)
+        assert snapshot.proximity.num_cars == num_cars
+
+
+def test_ordering_queries():
+    packet = make_packet(num_cars=6, seed=4)
+    prox = PacketSnapshot(packet).proximity
+    order = prox.closest_to_ball()
+    assert np.all(np.diff(prox.ball_distances[order]) >= 0)
+    assert prox.closest_to_ball(team=1).tolist() == [i for i in order.tolist() if packet.game_cars[i].team == 1]
+    assert [prox.ball_rank(i) for i in order.tolist()] == list(range(6))
+    distances = car_distances_per_car(packet)
+    for index in range(6):
+        others = [i for i in range(6) if i != index]
+        assert prox.nearest_car(index) == min(others, key=lambda i: distances[index][i])
+
+
+def test_supersonic_opponent_on_course_is_a_demolition_risk():
+    packet = make_packet(num_cars=3)
+    for i, (x, vx, team) in enumerate([(0, 2300, 0), (500, 0, 1), (500, 0, 0)]):
+        car = packet.game_cars[i]
+        car.team = team
+        car.is_super_sonic = vx > 2200
+        car.is_demolished = False
+        location, velocity = car.physics.location, car.physics.velocity
+        location.x, location.y, location.z = x, 1000 * i, 17
+        velocity.x, velocity.y, velocity.z = vx, 0, 0
+    # the victim is in the path of the attacker, the team mate is too far to the side
+    packet.game_cars[1].physics.location.y = 0
+    risks = PacketSnapshot(packet).proximity.demolition_risks()
+    assert risks.tolist() == [[False, True, False], [False] * 3, [False] * 3]
+    assert PacketSnapshot(packet).proximity.threatened_by(1).tolist() == [0]
@@ -0,0 +1,45 @@
+import pytest
+from rlbot.utils.structures.game_data_struct import GameTickPacket
+
+from src.utils.sequence import Sequence, CompiledSequence
+from tests.packets import make_steps, make_tick_times
+
+
+def tick_both(steps, times):
+    """Ticks a Sequence and a CompiledSequence of the steps and returns their controls and done flags per tick."""
+    packet = GameTickPacket()
+    sequence, compiled = Sequence(steps), CompiledSequence.from_steps(steps)
+    results = []
+    for seconds_elapsed in times:
+        packet.game_info.seconds_elapsed = seconds_elapsed
+        results.append(((sequence.tick(packet), sequence.done), (compiled.tick(packet), compiled.done)))
+    return results
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_compiled_sequence_matches_sequence(seed):
+    steps = make_steps(500, seed=seed)
+    times = make_tick_times(sum(step.duration for step in steps) * 1.5, seed=seed)
+    for expected, actual in tick_both(steps, times):
+        assert actual[0] is expected[0]
+        assert actual[1] == expected[1]
+
+
+def test_empty_sequence_is_done():
+    assert tick_both([], [0.0, 0.1]) == [((None, True), (None, True))] * 2
+
+
+def test_reset_starts_over():
+    steps = make_steps(20)
+    compiled = CompiledSequence.from_steps(steps)
+    packet = GameTickPacket()
+    first = []
+    for seconds_elapsed in make_tick_times(1.0):
+        packet.game_info.seconds_elapsed = seconds_elapsed
+        first.append(compiled.tick(packet))
+    compiled.reset()
+    again = []
+    for seconds_elapsed in make_tick_times(1.0):
+        packet.game_info.seconds_elapsed = seconds_elapsed
+        again.append(compiled.tick(packet))
+    assert again == first
@@ -0,0 +1,70 @@
+import copy
+import os
+from random import Random
+
+import numpy as np
+import pytest
+from rlbottraining.rng import SeededRandomNumberGenerator
+
+from src.scenarios.state_corpus import StateCorpus, make_replay_playlist
+from src.simulation.headless import HeadlessSession, ConstantBot
+from tests.playlists import make_playlist
+from tests.test_headless import BriefedBot, BriefedExercise
+
+
+def vector(v):
+    return v.x, v.y, v.z
+
+
+@pytest.fixture(scope='module')
+def corpus(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('corpus') / 'states.npz')
+    StateCorpus.build(make_playlist(), range(300)).save(path)
+    return StateCorpus.load(path)
+
+
+def test_stored_states_are_the_live_ones(corpus):
+    # up to the 32 bit floats of the game
+    for exercise in make_playlist():
+        for seed in range(0, len(corpus), 7):
+            rng = Random()
+            rng.seed(seed)
+            live = exercise.make_game_state(SeededRandomNumberGenerator(rng))
+            stored = corpus.game_state_for_seed(exercise.name, seed)
+            for get in (lambda s: s.ball.physics.location, lambda s: s.ball.physics.velocity,
+                        lambda s: s.cars[0].physics.location):
+                np.testing.assert_allclose(vector(get(stored)), vector(get(live)), rtol=1e-6, atol=1e-3)
+            assert abs(live.cars[0].physics.rotation.yaw - stored.cars[0].physics.rotation.yaw) < 1e-6
+            assert live.cars[0].boost_amount == stored.cars[0].boost_amount
+
+
+def test_replays_ignore_the_runner_seed(corpus):
+    session = HeadlessSession(lambda: [ConstantBot('ConstantBot', 0, 0)])
+    first = [session.run(exercise, seed=0) for exercise in make_replay_playlist(corpus, make_playlist, range(5))]
+    second = [session.run(exercise, seed=1) for exercise in make_replay_playlist(corpus, make_playlist, range(5))]
+    assert [(r.ticks, repr(r.grade)) for r in first] == [(r.ticks, repr(r.grade)) for r in second]
+
+
+def test_replays_delegate_to_the_replayed_exercise():
+    make_exercises = lambda: [BriefedExercise('briefed', throttle=0.5)]
+    corpus = StateCorpus.build(make_exercises(), range(2))
+    replay = make_replay_playlist(corpus, make_exercises, [1])[0]
+    assert replay.throttle == 0.5
+    assert copy.copy(replay).exercise is replay.exercise
+
+    session = HeadlessSession(lambda: [BriefedBot('PGBot_0', 0, 0)], reload_bots=False)
+    session.run(replay, 0)
+    assert [message['throttle'] for message in session.bots[0].briefings] == [0.5]
+    assert len(replay.replies.replies) == 1
+
+
+def test_failed_save_leaves_no_file(tmp_path, monkeypatch):
+    corpus = StateCorpus.build(make_playlist(), range(3))
+
+    def fail(*args, **kwargs):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(np, 'savez', fail)
+    with pytest.raises(OSError):
+        corpus.save(str(tmp_path / 'states.npz'))
+    assert os.listdir(tmp_path) == []
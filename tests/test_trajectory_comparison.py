@@ -0,0 +1,87 @@
+import bisect
+
+import numpy as np
+import pytest
+
+from src.utils.log_reader import ScenarioLog, PHYSICS_COLUMNS
+from src.utils.trajectory_comparison import common_time_base, compare_logs, DEFAULT_TIME_STEP, BALL_ID
+
+
+def make_log(time, car_ids, seed: int) -> ScenarioLog:
+    rng = np.random.default_rng(seed)
+    num_frames, num_cars = len(time), len(car_ids)
+    columns = dict(
+        car_ids=list(car_ids),
+        time=np.asarray(time, dtype=np.float64),
+        car_boost=rng.integers(0, 100, (num_frames, num_cars)),
+        car_has_wheel_contact=np.ones((num_frames, num_cars), dtype=bool),
+        car_jumped=np.zeros((num_frames, num_cars), dtype=bool),
+    )
+    for name in PHYSICS_COLUMNS:
+        columns['car_' + name] = np.cumsum(rng.normal(0, 0.1, (num_frames, num_cars, 3)), axis=0)
+        columns['ball_' + name] = np.cumsum(rng.normal(0, 0.1, (num_frames, 3)), axis=0)
+    return ScenarioLog(**columns)
+
+
+def interpolate(time, values, t):
+    """Per tick reference of the resampling."""
+    right = min(max(bisect.bisect_right(time, t), 1), len(time) - 1)
+    left = right - 1
+    weight = (t - time[left]) / (time[right] - time[left])
+    return values[left] * (1 - weight) + values[right] * weight
+
+
+def test_common_time_base_with_repeated_timestamps():
+    # a pause repeats the timestamps, the median tick duration is zero
+    time_a = np.array([0.0, 0.0, 0.0, 0.0, 0.5])
+    time_b = np.array([0.0, 0.25, 0.5])
+    time = common_time_base(time_a, time_b)
+    assert np.allclose(np.diff(time), DEFAULT_TIME_STEP)
+    assert time[0] == 0.0 and time[-1] <= 0.5
+    with pytest.raises(ValueError):
+        common_time_base(time_a, time_b, time_step=0)
+
+
+def test_compare_logs_matches_per_tick_reference():
+    time_a = np.arange(200) / 120
+    time_b = np.arange(130) / 80 + 0.003
+    log_a = make_log(time_a, ['0', '1', '2'], seed=1)
+    # the second run has the cars in another order and one car less
+    log_b = make_log(time_b, ['2', '0'], seed=2)
+    comparison = compare_logs(log_a, log_b)
+    assert comparison.object_ids == [BALL_ID, '0', '2']
+
+    for quantity in ('location', 'velocity', 'angular_velocity'):
+        for i, object_id in enumerate(comparison.object_ids):
+            if object_id == BALL_ID:
+                values_a, values_b = getattr(log_a, 'ball_' + quantity), getattr(log_b, 'ball_' + quantity)
+            else:
+                values_a = getattr(log_a, 'car_' + quantity)[:, log_a.car_index(object_id)]
+                values_b = getattr(log_b, 'car_' + quantity)[:, log_b.car_index(object_id)]
+            expected = [np.linalg.norm(interpolate(time_a, values_a, t) - interpolate(time_b, values_b, t))
+                        for t in comparison.time]
+            assert np.allclose(comparison.errors[quantity][:, i], expected)
+            metrics = comparison.metrics(object_id, quantity)
+            assert np.isclose(metrics.max_error, max(expected))
+            assert np.isclose(metrics.rmse, np.sqrt(np.mean(np.square(expected))))
+
+
+def test_rotation_error_wraps_around():
+    time = np.arange(10) / 120
+    log_a = make_log(time, ['0'], seed=3)
+    log_b = make_log(time, ['0'], seed=3)
+    log_a.ball_rotation = np.tile([179.0, 0.0, 0.0], (10, 1))
+    log_b.ball_rotation = np.tile([-179.0, 0.0, 0.0], (10, 1))
+    comparison = compare_logs(log_a, log_b)
+    assert np.allclose(comparison.errors['rotation'][:, 0], 2.0)
+    assert np.allclose(comparison.errors['rotation'][:, 1], 0.0)
+
+
+def test_divergence_time():
+    time = np.arange(100) / 100
+    log_a = make_log(time, [], seed=4)
+    log_b = make_log(time, [], seed=4)
+    log_b.ball_location = log_a.ball_location + (time > 0.5)[:, np.newaxis] * np.array([1.0, 0.0, 0.0])
+    comparison = compare_logs(log_a, log_b, time_step=0.01)
+    assert comparison.metrics(BALL_ID, 'location').divergence_time == pytest.approx(0.51)
+    assert np.isnan(comparison.metrics(BALL_ID, 'velocity').divergence_time)
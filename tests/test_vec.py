@@ -0,0 +1,55 @@
+import copy
+
+import pytest
+
+from src.utils.drive import steer_toward_target
+from src.utils.orientation import Orientation, relative_location
+from src.utils.vec import Vec3, Vec4, Location, Velocity, AngularVelocity, EulerAngles, Quaternion, UnitSystem
+from tests.legacy import legacy_relative_location, legacy_steer_toward_target, legacy_quaternion, \
+    legacy_game_state_vector
+from tests.packets import make_packet
+
+PACKETS = [make_packet(seed=seed) for seed in range(20)]
+
+
+def values(vector):
+    return list(vector), vector.unit_system, type(vector)
+
+
+@pytest.mark.parametrize('packet', PACKETS)
+def test_fast_paths_match_the_checked_constructors(packet):
+    car = packet.game_cars[0]
+    target = Vec3(packet.game_ball.physics.location)
+    center = Vec3(car.physics.location)
+    ori = Orientation(car.physics.rotation)
+    assert list(relative_location(center, ori, target)) == list(legacy_relative_location(center, ori, target))
+    assert steer_toward_target(car, target) == legacy_steer_toward_target(car, target)
+    assert values(Quaternion(car.physics.rotation)) == values(legacy_quaternion(car.physics.rotation))
+    assert values(Vec3.from_packet(car.physics.location)) == values(Vec3(car.physics.location))
+    assert values(Vec3._new(1.0, 2.0, 3.0)) == values(Vec3(1, 2, 3))
+    assert values(Vec4._new(1.0, 2.0, 3.0, 4.0)) == values(Vec4(1, 2, 3, 4))
+
+
+@pytest.mark.parametrize('unit_system', [UnitSystem.UNREAL, UnitSystem.UNITY])
+def test_game_state_vector_leaves_the_location_unchanged(unit_system):
+    location = Location(12.5, 0.17, -30.0, unit_system)
+    expected = legacy_game_state_vector(location)
+    assert location.to_game_state_vector().__dict__ == expected.__dict__
+    assert values(location) == ([12.5, 0.17, -30.0], unit_system, Location)
+
+
+def vectors(physics):
+    return [Location(physics.location), Velocity(physics.velocity), AngularVelocity(physics.angular_velocity),
+            EulerAngles(physics.rotation), Quaternion(physics.rotation)]
+
+
+@pytest.mark.parametrize('packet', PACKETS[:5])
+def test_as_units_return_the_converted_copy_of_to_units(packet):
+    for vector in vectors(packet.game_cars[0].physics):
+        before = values(vector)
+        unity = vector.as_unity_units()
+        assert values(vector) == before
+        assert values(unity) == values(copy.deepcopy(vector).to_unity_units())
+        assert values(unity.as_unity_units()) == values(unity)
+        assert values(unity.as_unreal_units()) == values(copy.deepcopy(unity).to_unreal_units())
+        assert values(vector.as_unreal_units()) == before
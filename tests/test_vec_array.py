@@ -0,0 +1,122 @@
+import math
+
+import numpy as np
+import pytest
+from rlbot.utils.game_state_util import Rotator
+
+from src.utils.vec import Vec3, Location, Velocity, AngularVelocity, Quaternion, UnitSystem, Vec3Array, \
+    LocationArray, VelocityArray, AngularVelocityArray, QuaternionArray
+
+N = 500
+
+
+def components(scalars) -> np.ndarray:
+    return np.array([[v.x, v.y, v.z] if isinstance(v, Vec3) else [v.x, v.y, v.z, v.w] for v in scalars])
+
+
+def assert_agrees(actual, scalars):
+    expected = np.array(scalars, dtype=np.float64) if isinstance(actual, np.ndarray) else components(scalars)
+    actual = actual if isinstance(actual, np.ndarray) else actual.data
+    assert np.allclose(actual, expected, rtol=1e-12, atol=1e-12)
+
+
+def assert_identical(array, scalars):
+    assert np.array_equal(array.data, components(scalars))
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    return rng.uniform(-5000, 5000, (N, 3)), rng.uniform(-5000, 5000, (N, 3)), rng.uniform(0.1, 10, N)
+
+
+def test_vec3_array_operations(data):
+    a_data, b_data, scales = data
+    a, b = Vec3Array(a_data), Vec3Array(b_data)
+    va = [Vec3(*v) for v in a_data]
+    vb = [Vec3(*v) for v in b_data]
+
+    assert_agrees(a + b, [x + y for x, y in zip(va, vb)])
+    assert_agrees(a - b, [x - y for x, y in zip(va, vb)])
+    assert_agrees(-a, [-x for x in va])
+    assert_agrees(a * 2.5, [x * 2.5 for x in va])
+    assert_agrees(a * scales, [x * s for x, s in zip(va, scales)])
+    assert_agrees(a / scales, [x / s for x, s in zip(va, scales)])
+    assert_agrees(a.flat(), [x.flat() for x in va])
+    assert_agrees(a.length(), [x.length() for x in va])
+    assert_agrees(a.dist(b), [x.dist(y) for x, y in zip(va, vb)])
+    assert_agrees(a.normalized(), [x.normalized() for x in va])
+    assert_agrees(a.rescale(3), [x.rescale(3) for x in va])
+    assert_agrees(a.dot(b), [x.dot(y) for x, y in zip(va, vb)])
+    assert_agrees(a.cross(b), [x.cross(y) for x, y in zip(va, vb)])
+    assert_agrees(a.ang_to(b), [x.ang_to(y) for x, y in zip(va, vb)])
+    assert_agrees(a.dist(vb[0]), [x.dist(vb[0]) for x in va])
+
+
+@pytest.mark.parametrize('array_type, scalar_type', [
+    (LocationArray, Location), (VelocityArray, Velocity), (AngularVelocityArray, AngularVelocity),
+])
+def test_unit_conversions_are_bit_identical(data, array_type, scalar_type):
+    a_data = data[0]
+    unity = array_type(a_data).to_unity_units()
+    scalars = [scalar_type(*v).to_unity_units() for v in a_data]
+    assert_identical(unity, scalars)
+    assert_identical(unity.obs_normalized(), [v.obs_normalized() for v in scalars])
+    assert_identical(array_type(a_data, UnitSystem.UNITY).to_unreal_units(),
+                     [scalar_type(*v, unit_system=UnitSystem.UNITY).to_unreal_units() for v in a_data])
+
+    round_trip = array_type.from_vecs(unity.to_vecs())
+    assert type(round_trip.to_vecs()[0]) is scalar_type
+    assert round_trip.unit_system == UnitSystem.UNITY
+    assert_identical(round_trip, scalars)
+
+
+def test_ball_velocity_obs_normalized_is_bit_identical(data):
+    a_data = data[0]
+    assert_identical(VelocityArray(a_data).obs_normalized(is_ball=True),
+                     [Velocity(*v).obs_normalized(is_ball=True) for v in a_data])
+
+
+@pytest.mark.parametrize('array_type', [Vec3Array, LocationArray, VelocityArray, AngularVelocityArray])
+def test_arithmetic_keeps_the_class_and_unit_system(data, array_type):
+    a = array_type(data[0], UnitSystem.UNITY)
+    b = array_type(data[1], UnitSystem.UNITY)
+    for result in (a + b, a - b, -a, a * 2, 2 * a, a / data[2], a.flat(), a.normalized(), a.rescale(2), a[:10]):
+        assert type(result) is array_type
+        assert result.unit_system == UnitSystem.UNITY
+    assert a.cross(b).unit_system == UnitSystem.UNITY
+
+
+@pytest.fixture
+def quaternions():
+    rng = np.random.default_rng(1)
+    pitch, yaw, roll = rng.uniform(-math.pi, math.pi, (3, N))
+    return (QuaternionArray.from_rotators(pitch, yaw, roll),
+            [Quaternion(Rotator(p, y, r)) for p, y, r in zip(pitch, yaw, roll)])
+
+
+def test_quaternion_array(quaternions):
+    array, scalars = quaternions
+    assert_agrees(array, scalars)
+    assert_agrees(QuaternionArray.from_quaternions(array.to_quaternions()), scalars)
+    assert_agrees(array.length(), [q.length() for q in scalars])
+    assert_identical(QuaternionArray(array.data).to_unity_units(), [Quaternion(q).to_unity_units() for q in scalars])
+    assert_identical(QuaternionArray(array.data, UnitSystem.UNITY).to_unreal_units(),
+                     [Quaternion(q.x, q.y, q.z, q.w, UnitSystem.UNITY).to_unreal_units() for q in scalars])
+
+
+def test_quaternion_array_dist_and_ang_to(quaternions):
+    array, scalars = quaternions
+    other = array[::-1]
+    other_scalars = scalars[::-1]
+    assert_agrees(array.dist(other), [q.dist(r) for q, r in zip(scalars, other_scalars)])
+    assert_agrees(array.ang_to(other), [q.ang_to(r) for q, r in zip(scalars, other_scalars)])
+    assert_agrees(array.dist(scalars[0]), [q.dist(scalars[0]) for q in scalars])
+    assert_agrees(array.ang_to(scalars[0])[1:], [q.ang_to(scalars[0]) for q in scalars[1:]])
+    assert array.ang_to(array)[0] == 0
+
+
+def test_quaternion_arithmetic_keeps_the_unit_system(quaternions):
+    array = QuaternionArray(quaternions[0].data, UnitSystem.UNITY)
+    for result in (array + array, array - array, -array, array * 2, array.normalized()):
+        assert result.unit_system == UnitSystem.UNITY